@@ -0,0 +1,57 @@
+"""Add room_nights inventory ledger
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from app.core.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'room_nights',
+        sa.Column('room_id', sa.Integer(), nullable=False),
+        sa.Column('night', sa.Date(), nullable=False),
+        sa.Column('booking_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['room_id'], ['rooms.id'], ),
+        sa.ForeignKeyConstraint(['booking_id'], ['bookings.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('room_id', 'night')
+    )
+    op.create_index(op.f('ix_room_nights_booking_id'), 'room_nights', ['booking_id'], unique=False)
+    op.create_index(
+        'ix_room_nights_night_room_id', 'room_nights', ['night', 'room_id'], unique=False
+    )
+    
+    # Backfill from active bookings; scripts/rebuild_room_nights.py --check reports any
+    # overlaps skipped here
+    op.execute(
+        sa.text("""
+            INSERT INTO room_nights (room_id, night, booking_id)
+            SELECT b.room_id, gs.night::date, b.id
+            FROM bookings b
+            CROSS JOIN LATERAL generate_series(
+                (b.check_in_date AT TIME ZONE :tz)::date,
+                (b.check_out_date AT TIME ZONE :tz)::date - 1,
+                interval '1 day'
+            ) AS gs(night)
+            WHERE b.status IN ('CONFIRMED', 'CHECKED_IN')
+            ORDER BY b.id
+            ON CONFLICT DO NOTHING
+        """).bindparams(tz=settings.HOTEL_TIMEZONE)
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_room_nights_night_room_id', table_name='room_nights')
+    op.drop_index(op.f('ix_room_nights_booking_id'), table_name='room_nights')
+    op.drop_table('room_nights')
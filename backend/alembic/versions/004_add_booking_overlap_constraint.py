@@ -0,0 +1,84 @@
+"""Enforce no overlapping active bookings per room
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from app.core.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+ACTIVE_STATUSES = "('PENDING', 'CONFIRMED', 'CHECKED_IN')"
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    
+    # Pending bookings now hold their room. Overlaps among active bookings must be
+    # resolved by hand (cancel or move one of each pair) before the constraint can be built.
+    conflicts = op.get_bind().execute(sa.text(f"""
+        SELECT b.id, o.id
+        FROM bookings b
+        JOIN bookings o ON o.room_id = b.room_id AND o.id > b.id
+        WHERE b.status IN {ACTIVE_STATUSES}
+          AND o.status IN {ACTIVE_STATUSES}
+          AND o.check_in_date < b.check_out_date
+          AND o.check_out_date > b.check_in_date
+        ORDER BY b.id, o.id
+    """)).all()
+    if conflicts:
+        pairs = ", ".join(f"{first}/{second}" for first, second in conflicts)
+        raise RuntimeError(
+            f"{len(conflicts)} pairs of active bookings overlap on the same room: {pairs}. "
+            "Cancel or move one booking of each pair, then run the migration again."
+        )
+    
+    op.add_column('bookings', sa.Column(
+        'stay',
+        postgresql.TSTZRANGE(),
+        sa.Computed("tstzrange(check_in_date, check_out_date, '[)')", persisted=True),
+        nullable=True
+    ))
+    op.create_exclude_constraint(
+        'bookings_no_overlap',
+        'bookings',
+        ('room_id', '='),
+        ('stay', '&&'),
+        using='gist',
+        where=sa.text(f"status IN {ACTIVE_STATUSES}")
+    )
+    
+    # Pending bookings now hold nights in the ledger as well
+    op.execute(
+        sa.text("""
+            INSERT INTO room_nights (room_id, night, booking_id)
+            SELECT b.room_id, gs.night::date, b.id
+            FROM bookings b
+            CROSS JOIN LATERAL generate_series(
+                (b.check_in_date AT TIME ZONE :tz)::date,
+                (b.check_out_date AT TIME ZONE :tz)::date - 1,
+                interval '1 day'
+            ) AS gs(night)
+            WHERE b.status = 'PENDING'
+            ORDER BY b.id
+            ON CONFLICT DO NOTHING
+        """).bindparams(tz=settings.HOTEL_TIMEZONE)
+    )
+
+
+def downgrade() -> None:
+    op.execute("""
+        DELETE FROM room_nights rn USING bookings b
+        WHERE rn.booking_id = b.id AND b.status = 'PENDING'
+    """)
+    op.drop_constraint('bookings_no_overlap', 'bookings')
+    op.drop_column('bookings', 'stay')
@@ -0,0 +1,40 @@
+"""Add composite indexes for keyset-paginated booking lists
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_bookings_created_at_id', ['created_at', 'id']),
+    ('ix_bookings_user_id_created_at_id', ['user_id', 'created_at', 'id']),
+    ('ix_bookings_status_created_at_id', ['status', 'created_at', 'id']),
+    ('ix_bookings_room_id_created_at_id', ['room_id', 'created_at', 'id']),
+]
+
+
+def upgrade() -> None:
+    # Booking lists are ordered by (created_at, id) and page with a row comparison on both.
+    # Built concurrently so bookings stay writable; that cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES:
+            op.create_index(
+                name, 'bookings', columns,
+                unique=False, postgresql_concurrently=True, if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(INDEXES):
+            op.drop_index(name, table_name='bookings', postgresql_concurrently=True, if_exists=True)
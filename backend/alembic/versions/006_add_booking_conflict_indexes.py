@@ -0,0 +1,45 @@
+"""Drop redundant booking indexes, online
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Conflict lookups (room_id + active status + stay overlap) are served by the partial
+    # GiST index behind bookings_no_overlap (migration 004) and by the room_nights ledger,
+    # so no btree index on room and dates is added here.
+    # DROP INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        # Duplicates the primary key index
+        op.drop_index(
+            'ix_bookings_id', table_name='bookings', postgresql_concurrently=True, if_exists=True
+        )
+        # Low-cardinality; superseded by ix_bookings_status_created_at_id
+        op.drop_index(
+            'ix_bookings_status', table_name='bookings',
+            postgresql_concurrently=True, if_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_bookings_status', 'bookings', ['status'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_bookings_id', 'bookings', ['id'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True
+        )
@@ -0,0 +1,42 @@
+"""Add GiST index on sold booking stays for range statistics, online
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+SOLD_STATUSES = "status IN ('CONFIRMED', 'CHECKED_IN', 'CHECKED_OUT')"
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        # Stays overlapping a reporting window: stay && tstzrange(start, end)
+        op.create_index(
+            'ix_bookings_sold_stay',
+            'bookings',
+            ['stay'],
+            unique=False,
+            postgresql_using='gist',
+            postgresql_where=sa.text(SOLD_STATUSES),
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_bookings_sold_stay', table_name='bookings',
+            postgresql_concurrently=True, if_exists=True
+        )
@@ -0,0 +1,93 @@
+"""Add daily_metrics rollup
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from app.core.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'daily_metrics',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('room_type_id', sa.Integer(), nullable=False),
+        sa.Column('rooms_available', sa.Integer(), nullable=False),
+        sa.Column('rooms_sold', sa.Integer(), nullable=False),
+        sa.Column('rooms_cancelled', sa.Integer(), nullable=False),
+        sa.Column('revenue_pending', sa.Float(), nullable=False),
+        sa.Column('revenue_paid', sa.Float(), nullable=False),
+        sa.Column('revenue_refunded', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['room_type_id'], ['room_types.id'], ),
+        sa.PrimaryKeyConstraint('day', 'room_type_id')
+    )
+
+    # Backfill every day from the first check-in to the last check-out, one row per room type
+    # and day; booking changes keep it current from here on. A copy of the rollup as it is
+    # defined at this revision, so later changes to app code cannot alter this migration
+    op.execute(
+        sa.text("""
+            INSERT INTO daily_metrics (day, room_type_id, rooms_available, rooms_sold,
+                                       rooms_cancelled, revenue_pending, revenue_paid,
+                                       revenue_refunded)
+            SELECT d.day::date, t.id, coalesce(a.rooms, 0), coalesce(n.sold, 0),
+                   coalesce(n.cancelled, 0), coalesce(n.revenue_pending, 0),
+                   coalesce(n.revenue_paid, 0), coalesce(n.revenue_refunded, 0)
+            FROM (
+                SELECT min((check_in_date AT TIME ZONE :tz)::date) AS first_day,
+                       max((check_out_date AT TIME ZONE :tz)::date) AS end_day
+                FROM bookings
+            ) AS w
+            CROSS JOIN LATERAL generate_series(
+                w.first_day, w.end_day - 1, interval '1 day'
+            ) AS d(day)
+            CROSS JOIN room_types t
+            LEFT JOIN (
+                SELECT room_type_id, count(*) AS rooms
+                FROM rooms WHERE is_active GROUP BY room_type_id
+            ) AS a ON a.room_type_id = t.id
+            LEFT JOIN (
+                SELECT gs.night::date AS day, r.room_type_id,
+                       count(*) FILTER (WHERE stay.sold) AS sold,
+                       count(*) FILTER (WHERE b.status = 'CANCELLED') AS cancelled,
+                       sum(s.per_night) FILTER (
+                           WHERE stay.sold AND b.payment_status = 'PENDING'
+                       ) AS revenue_pending,
+                       sum(s.per_night) FILTER (
+                           WHERE stay.sold AND b.payment_status = 'PAID'
+                       ) AS revenue_paid,
+                       sum(s.per_night) FILTER (
+                           WHERE stay.sold AND b.payment_status = 'REFUNDED'
+                       ) AS revenue_refunded
+                FROM bookings b
+                JOIN rooms r ON r.id = b.room_id
+                CROSS JOIN LATERAL (
+                    SELECT (b.check_in_date AT TIME ZONE :tz)::date AS check_in,
+                           (b.check_out_date AT TIME ZONE :tz)::date AS check_out,
+                           b.status IN ('CONFIRMED', 'CHECKED_IN', 'CHECKED_OUT') AS sold
+                ) AS stay
+                CROSS JOIN LATERAL (
+                    SELECT b.total_amount / greatest(stay.check_out - stay.check_in, 1) AS per_night
+                ) AS s
+                CROSS JOIN LATERAL generate_series(
+                    stay.check_in, stay.check_out - 1, interval '1 day'
+                ) AS gs(night)
+                WHERE stay.sold OR b.status = 'CANCELLED'
+                GROUP BY 1, 2
+            ) AS n ON n.day = d.day AND n.room_type_id = t.id
+        """).bindparams(tz=settings.HOTEL_TIMEZONE)
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('daily_metrics')
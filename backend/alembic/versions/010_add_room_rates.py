@@ -0,0 +1,32 @@
+"""Add room_rates calendar
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'room_rates',
+        sa.Column('room_type_id', sa.Integer(), nullable=False),
+        sa.Column('night', sa.Date(), nullable=False),
+        sa.Column('price', sa.Float(), nullable=False),
+        sa.Column('label', sa.String(), nullable=True),
+        sa.ForeignKeyConstraint(['room_type_id'], ['room_types.id'], ),
+        sa.PrimaryKeyConstraint('room_type_id', 'night')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('room_rates')
@@ -0,0 +1,34 @@
+"""Add pricing_curves for dynamic pricing
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '011'
+down_revision = '010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'pricing_curves',
+        sa.Column('room_type_id', sa.Integer(), nullable=False),
+        sa.Column('occupancy_points', sa.JSON(), nullable=False),
+        sa.Column('lead_time_points', sa.JSON(), nullable=False),
+        sa.Column(
+            'updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True
+        ),
+        sa.ForeignKeyConstraint(['room_type_id'], ['room_types.id'], ),
+        sa.PrimaryKeyConstraint('room_type_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('pricing_curves')
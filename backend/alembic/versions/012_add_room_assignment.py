@@ -0,0 +1,49 @@
+"""Add room_pinned and make bookings_no_overlap deferrable
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '012'
+down_revision = '011'
+branch_labels = None
+depends_on = None
+
+ACTIVE_STATUSES = "('PENDING', 'CONFIRMED', 'CHECKED_IN')"
+
+
+def upgrade() -> None:
+    # Every existing booking was made for a chosen room
+    op.add_column('bookings', sa.Column('room_pinned', sa.Boolean(), server_default=sa.true(), nullable=False))
+    
+    # Exclusion constraints cannot be altered in place; rebuild it as deferrable
+    op.drop_constraint('bookings_no_overlap', 'bookings')
+    op.create_exclude_constraint(
+        'bookings_no_overlap',
+        'bookings',
+        ('room_id', '='),
+        ('stay', '&&'),
+        using='gist',
+        where=sa.text(f"status IN {ACTIVE_STATUSES}"),
+        deferrable=True,
+        initially='IMMEDIATE'
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('bookings_no_overlap', 'bookings')
+    op.create_exclude_constraint(
+        'bookings_no_overlap',
+        'bookings',
+        ('room_id', '='),
+        ('stay', '&&'),
+        using='gist',
+        where=sa.text(f"status IN {ACTIVE_STATUSES}")
+    )
+    op.drop_column('bookings', 'room_pinned')
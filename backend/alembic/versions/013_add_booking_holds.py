@@ -0,0 +1,49 @@
+"""Add booking_holds for checkout holds
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '013'
+down_revision = '012'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'booking_holds',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('room_id', sa.Integer(), nullable=False),
+        sa.Column('room_pinned', sa.Boolean(), nullable=False),
+        sa.Column('check_in_date', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('check_out_date', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            'created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True
+        ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['room_id'], ['rooms.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_booking_holds_user_id', 'booking_holds', ['user_id'])
+    op.create_index('ix_booking_holds_expires_at', 'booking_holds', ['expires_at'])
+    op.create_index(
+        'ix_booking_holds_room_dates',
+        'booking_holds',
+        ['room_id', 'check_in_date', 'check_out_date'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_booking_holds_room_dates', table_name='booking_holds')
+    op.drop_index('ix_booking_holds_expires_at', table_name='booking_holds')
+    op.drop_index('ix_booking_holds_user_id', table_name='booking_holds')
+    op.drop_table('booking_holds')
@@ -1,14 +1,39 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
+from typing import List, Optional
+from datetime import date, datetime, timedelta
 from app.core.database import get_db
 from app.schemas.room import RoomCreate, RoomResponse, RoomTypeCreate, RoomTypeResponse
 from app.schemas.booking import BookingResponse, BookingUpdate
 from app.schemas.service import ServiceCreate, ServiceResponse
-from app.models.room import Room, RoomType, RoomAmenity
-from app.models.booking import Booking
+from app.schemas.rate import (
+    PricingCurveResponse, PricingCurveUpdate, RoomRateResponse, RoomRateUpdate,
+)
+from app.schemas.stats import DashboardStats, EmailOutboxStats
+from app.models.room import Room, RoomType, RoomAmenity, room_response_options
+from app.models.booking import Booking, BookingStatus, PaymentStatus
+from app.models.rate import PricingCurve, RoomRate
 from app.models.service import Service
 from app.api.v1.auth import get_current_admin_user
+from app.services.availability import HOTEL_TZ, is_overbooking
+from app.services.catalog import CatalogSnapshot, bump_catalog_version, get_catalog, refresh_catalog
+from app.services.bookings import (
+    booking_etag, booking_list_query, booking_page_response, check_if_match, fetch_booking_page,
+    filter_bookings,
+)
+from app.services.dynamic_pricing import (
+    booking_nights_changed, recompute_price_grid, validate_points,
+)
+from app.services.email_outbox import outbox_stats
+from app.services.exports import stream_bookings_csv, stream_bookings_ndjson
+from app.services.inventory import sync_room_nights
+from app.services.metrics import room_capacity_changed
+from app.services.rates import MAX_RATE_RANGE_NIGHTS, clear_room_rates, set_room_rates
+from app.services.stats import dashboard_stats
 from app.models.user import User
 
 router = APIRouter()
@@ -17,16 +42,18 @@ router = APIRouter()
 @router.post("/rooms", response_model=RoomResponse, status_code=status.HTTP_201_CREATED)
 async def create_room(
     room_data: RoomCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_admin_user)
 ):
     # Verify room type exists
-    room_type = db.query(RoomType).filter(RoomType.id == room_data.room_type_id).first()
+    room_type = await db.get(RoomType, room_data.room_type_id)
     if not room_type:
         raise HTTPException(status_code=404, detail="Room type not found")
     
     # Check if room number already exists
-    existing_room = db.query(Room).filter(Room.room_number == room_data.room_number).first()
+    existing_room = await db.scalar(
+        select(Room.id).where(Room.room_number == room_data.room_number)
+    )
     if existing_room:
         raise HTTPException(status_code=400, detail="Room number already exists")
     
@@ -38,34 +65,95 @@ async def create_room(
         image_urls=str(room_data.image_urls) if room_data.image_urls else None
     )
     
+    amenities = []
     if room_data.amenity_ids:
-        amenities = db.query(RoomAmenity).filter(RoomAmenity.id.in_(room_data.amenity_ids)).all()
-        db_room.amenities = amenities
+        amenities = (await db.scalars(
+            select(RoomAmenity).where(RoomAmenity.id.in_(room_data.amenity_ids))
+        )).all()
+    db_room.amenities = amenities
     
     db.add(db_room)
-    db.commit()
-    db.refresh(db_room)
-    return db_room
+    await bump_catalog_version(db)
+    await db.execute(room_capacity_changed(room_data.room_type_id, 1))
+    await db.commit()
+    await refresh_catalog()
+    
+    # Reload with relationships so the response never lazy-loads
+    return await db.scalar(
+        select(Room)
+        .options(*room_response_options())
+        .where(Room.id == db_room.id)
+        .execution_options(populate_existing=True)
+    )
+
+@router.get("/rooms", response_model=List[RoomResponse])
+async def get_all_rooms(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    # Includes inactive rooms, unlike the public /rooms listing
+    rooms = await db.scalars(
+        select(Room).options(*room_response_options()).order_by(Room.room_number)
+    )
+    return rooms.unique().all()
 
 @router.get("/bookings", response_model=List[BookingResponse])
 async def get_all_bookings(
-    db: Session = Depends(get_db),
+    booking_status: Optional[BookingStatus] = Query(None, alias="status"),
+    payment_status: Optional[PaymentStatus] = Query(None),
+    room_id: Optional[int] = Query(None),
+    check_in_from: Optional[date] = Query(None),
+    check_in_to: Optional[date] = Query(None),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_admin_user)
 ):
-    bookings = db.query(Booking).order_by(Booking.created_at.desc()).all()
-    return bookings
+    query = filter_bookings(
+        booking_list_query(), booking_status, payment_status, room_id, check_in_from, check_in_to
+    )
+    rows, next_cursor = await fetch_booking_page(db, query, cursor, limit)
+    return booking_page_response(rows, next_cursor)
+
+@router.get("/bookings/export")
+async def export_bookings(
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    booking_status: Optional[BookingStatus] = Query(None, alias="status"),
+    payment_status: Optional[PaymentStatus] = Query(None),
+    room_id: Optional[int] = Query(None),
+    check_in_from: Optional[date] = Query(None),
+    check_in_to: Optional[date] = Query(None),
+    current_user: User = Depends(get_current_admin_user)
+):
+    # Streamed from a server-side cursor, oldest first, so memory stays flat for any size
+    query = filter_bookings(
+        booking_list_query(), booking_status, payment_status, room_id, check_in_from, check_in_to
+    )
+    filename = f"bookings-{date.today():%Y%m%d}.{export_format}"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    if export_format == "csv":
+        return StreamingResponse(stream_bookings_csv(query), media_type="text/csv", headers=headers)
+    return StreamingResponse(
+        stream_bookings_ndjson(query), media_type="application/x-ndjson", headers=headers
+    )
 
 @router.patch("/bookings/{booking_id}", response_model=BookingResponse)
 async def update_booking_admin(
     booking_id: int,
     booking_update: BookingUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user),
+    if_match: Optional[str] = Header(None)
 ):
-    booking = db.query(Booking).filter(Booking.id == booking_id).first()
+    booking = await db.get(Booking, booking_id)
     if not booking:
         raise HTTPException(status_code=404, detail="Booking not found")
     
+    # Two front-desk staff editing one booking: the second gets 412 (stale If-Match)
+    # or 409 (lost the race)
+    check_if_match(if_match, booking)
+    
     if booking_update.status:
         booking.status = booking_update.status
     if booking_update.payment_status:
@@ -73,7 +161,165 @@ async def update_booking_admin(
     if booking_update.special_requests is not None:
         booking.special_requests = booking_update.special_requests
     
-    db.commit()
-    db.refresh(booking)
+    try:
+        await sync_room_nights(db, booking)
+        await db.commit()
+    except IntegrityError as exc:
+        await db.rollback()
+        if not is_overbooking(exc):
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Room is not available for the selected dates"
+        )
+    except StaleDataError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Booking was changed by another request; reload it and retry"
+        )
+    if booking_update.status:
+        await booking_nights_changed(
+            db, booking.room_id, booking.check_in_date, booking.check_out_date
+        )
+    await db.refresh(booking)
+    response.headers["ETag"] = booking_etag(booking)
     return booking
 
+# Rate Calendar
+@router.get("/rates", response_model=List[RoomRateResponse])
+async def get_room_rates(
+    room_type_id: Optional[int] = Query(None),
+    date_from: Optional[date] = Query(None),
+    date_to: Optional[date] = Query(None),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    query = select(RoomRate).order_by(RoomRate.night, RoomRate.room_type_id)
+    if room_type_id:
+        query = query.where(RoomRate.room_type_id == room_type_id)
+    if date_from:
+        query = query.where(RoomRate.night >= date_from)
+    if date_to:
+        query = query.where(RoomRate.night <= date_to)
+    return (await db.scalars(query)).all()
+
+@router.put("/rates", response_model=List[RoomRateResponse])
+async def set_rates(
+    rate_data: RoomRateUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    if rate_data.date_to < rate_data.date_from:
+        raise HTTPException(status_code=400, detail="date_to must not be before date_from")
+    if (rate_data.date_to - rate_data.date_from).days >= MAX_RATE_RANGE_NIGHTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"A rate update may cover at most {MAX_RATE_RANGE_NIGHTS} nights",
+        )
+    if rate_data.price <= 0:
+        raise HTTPException(status_code=400, detail="Rate must be positive")
+    if not await db.get(RoomType, rate_data.room_type_id):
+        raise HTTPException(status_code=404, detail="Room type not found")
+    
+    rates = await set_room_rates(
+        db,
+        rate_data.room_type_id,
+        rate_data.date_from,
+        rate_data.date_to,
+        rate_data.price,
+        rate_data.label,
+    )
+    await bump_catalog_version(db)
+    await db.commit()
+    await refresh_catalog()
+    return rates
+
+@router.delete("/rates", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_rates(
+    room_type_id: int = Query(...),
+    date_from: date = Query(...),
+    date_to: date = Query(...),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    # Nights go back to the room type's base_price
+    await db.execute(clear_room_rates(room_type_id, date_from, date_to))
+    await bump_catalog_version(db)
+    await db.commit()
+    await refresh_catalog()
+
+# Dynamic Pricing
+@router.get("/pricing-curves", response_model=List[PricingCurveResponse])
+async def get_pricing_curves(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    return (await db.scalars(select(PricingCurve).order_by(PricingCurve.room_type_id))).all()
+
+@router.put("/pricing-curves/{room_type_id}", response_model=PricingCurveResponse)
+async def set_pricing_curve(
+    room_type_id: int,
+    curve_data: PricingCurveUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    problem = (
+        validate_points(curve_data.occupancy_points)
+        or validate_points(curve_data.lead_time_points)
+    )
+    if problem:
+        raise HTTPException(status_code=400, detail=problem)
+    if not await db.get(RoomType, room_type_id):
+        raise HTTPException(status_code=404, detail="Room type not found")
+    
+    curve = await db.get(PricingCurve, room_type_id)
+    if not curve:
+        curve = PricingCurve(room_type_id=room_type_id)
+        db.add(curve)
+    curve.occupancy_points = curve_data.occupancy_points
+    curve.lead_time_points = curve_data.lead_time_points
+    await bump_catalog_version(db)
+    await db.commit()
+    await recompute_price_grid(await refresh_catalog())
+    await db.refresh(curve)
+    return curve
+
+@router.delete("/pricing-curves/{room_type_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_pricing_curve(
+    room_type_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    curve = await db.get(PricingCurve, room_type_id)
+    if not curve:
+        raise HTTPException(status_code=404, detail="Pricing curve not found")
+    
+    # The room type goes back to its calendar rates
+    await db.delete(curve)
+    await bump_catalog_version(db)
+    await db.commit()
+    await recompute_price_grid(await refresh_catalog())
+
+# Dashboard
+@router.get("/stats", response_model=DashboardStats)
+async def get_dashboard_stats(
+    date_from: Optional[date] = Query(None),
+    date_to: Optional[date] = Query(None),
+    catalog: CatalogSnapshot = Depends(get_catalog),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    # Defaults to the 30 days ending today in the hotel's calendar
+    date_to = date_to or datetime.now(HOTEL_TZ).date()
+    date_from = date_from or date_to - timedelta(days=29)
+    if date_to < date_from:
+        raise HTTPException(status_code=400, detail="date_to must not be before date_from")
+    return await dashboard_stats(db, catalog, date_from, date_to)
+
+@router.get("/email-outbox", response_model=EmailOutboxStats)
+async def get_email_outbox_stats(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    return await outbox_stats(db)
@@ -1,12 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from datetime import datetime
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from sqlalchemy.orm.exc import StaleDataError
+from typing import List, Optional
+from datetime import date, datetime, timezone
 from app.core.database import get_db
-from app.schemas.booking import BookingCreate, BookingResponse, BookingUpdate
+from app.schemas.booking import (
+    BookingCreate, BookingResponse, BookingUpdate, BulkBookingRequest, BulkBookingResponse,
+)
 from app.models.booking import Booking, BookingStatus, PaymentStatus
-from app.models.room import Room
+from app.models.inventory import BookingHold
+from app.models.room import Room, RoomType
 from app.api.v1.auth import get_current_user
+from app.services.assignment import ROOM_ASSIGNMENT_ATTEMPTS, assignment_lock, rank_rooms
+from app.services.availability import is_overbooking, night_range
+from app.services.bookings import (
+    booking_etag, booking_list_query, booking_page_response, check_if_match, fetch_booking_page,
+    filter_bookings,
+)
+from app.services.catalog import CatalogSnapshot, get_catalog
+from app.services.dynamic_pricing import PriceGrid, booking_nights_changed, get_price_grid
+from app.services.email_outbox import emails_queued, queue_confirmations
+from app.services.group_bookings import BULK_BOOKING_MAX_ITEMS, book_group, repricing_spans
+from app.services.holds import held_by_others, holds_released, release_own_holds
+from app.services.idempotency import (
+    IDEMPOTENCY_KEY_HEADER, idempotent_replay, response_committed, store_response,
+)
+from app.services.inventory import sync_room_nights
+from app.services.pricing import price_stay
 from app.models.user import User
 
 router = APIRouter()
@@ -14,9 +37,20 @@ router = APIRouter()
 @router.post("", response_model=BookingResponse, status_code=status.HTTP_201_CREATED)
 async def create_booking(
     booking_data: BookingCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    grid: PriceGrid = Depends(get_price_grid),
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_KEY_HEADER)
 ):
+    # A retry with the same key gets the first response back, whatever has changed since
+    claim = None
+    if idempotency_key is not None:
+        replayed, claim = await idempotent_replay(
+            db, current_user.id, idempotency_key, booking_data
+        )
+        if replayed is not None:
+            return replayed
+    
     # Validate dates
     if booking_data.check_out_date <= booking_data.check_in_date:
         raise HTTPException(
@@ -30,92 +64,220 @@ async def create_booking(
             detail="Check-in date cannot be in the past"
         )
     
-    # Check room exists and is active
-    room = db.query(Room).filter(Room.id == booking_data.room_id, Room.is_active == True).first()
-    if not room:
-        raise HTTPException(status_code=404, detail="Room not found")
-    
-    # Check availability
-    conflicting_booking = db.query(Booking).filter(
-        Booking.room_id == booking_data.room_id,
-        Booking.status.in_([BookingStatus.CONFIRMED, BookingStatus.CHECKED_IN]),
-        Booking.check_in_date < booking_data.check_out_date,
-        Booking.check_out_date > booking_data.check_in_date
-    ).first()
+    # Nights are hotel dates; a stay inside one date (e.g. day use) books none
+    first_night, end_night = night_range(booking_data.check_in_date, booking_data.check_out_date)
+    if end_night <= first_night:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Stay must include at least one night"
+        )
     
-    if conflicting_booking:
+    hold = None
+    room_id, room_type_id = booking_data.room_id, booking_data.room_type_id
+    if booking_data.hold_id is not None:
+        hold = await db.get(BookingHold, booking_data.hold_id)
+        if not hold or hold.user_id != current_user.id:
+            raise HTTPException(status_code=404, detail="Hold not found")
+        if hold.expires_at <= datetime.now(timezone.utc):
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Hold has expired")
+        held_nights = night_range(hold.check_in_date, hold.check_out_date)
+        if (
+            held_nights != night_range(booking_data.check_in_date, booking_data.check_out_date)
+            or room_id not in (None, hold.room_id)
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Booking does not match the hold"
+            )
+        room_id, room_type_id = hold.room_id, None
+    elif (room_id is None) == (room_type_id is None):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Room is not available for the selected dates"
+            detail="Give either room_id, room_type_id or hold_id"
         )
     
-    # Calculate total amount based on occupancy and pricing
-    nights = (booking_data.check_out_date - booking_data.check_in_date).days
-    base_amount = room.room_type.base_price * nights
+    if room_id is not None:
+        # Check room exists and is active
+        room = await db.scalar(
+            select(Room)
+            .options(joinedload(Room.room_type))
+            .where(Room.id == room_id, Room.is_active == True)
+        )
+        if not room:
+            raise HTTPException(status_code=404, detail="Room not found")
+        room_type = room.room_type
+        candidate_room_ids = [room.id]
+    else:
+        room_type = await db.get(RoomType, room_type_id)
+        if not room_type:
+            raise HTTPException(status_code=404, detail="Room type not found")
+        # Best-fitting free rooms first; the next ones cover a race with a booking for a specific room
+        await db.execute(assignment_lock(room_type.id))
+        candidate_room_ids = (await rank_rooms(
+            db, room_type.id, booking_data.check_in_date, booking_data.check_out_date
+        ))[:ROOM_ASSIGNMENT_ATTEMPTS]
     
-    # Calculate extra charges for adults and children
-    extra_amount = 0.0
     number_of_adults = booking_data.number_of_adults or booking_data.number_of_guests
     number_of_children = booking_data.number_of_children or 0
+    price = price_stay(
+        room_type,
+        grid,
+        booking_data.check_in_date,
+        booking_data.check_out_date,
+        number_of_adults,
+        number_of_children,
+    )
     
-    # Determine base occupancy based on room type
-    if "Family Room" in room.room_type.name:
-        base_occupancy = 4  # Quad occupancy
-    else:
-        base_occupancy = 2  # Double occupancy for Deluxe/Super Deluxe
-    
-    # Calculate extra adults (adults beyond base occupancy)
-    total_adults = number_of_adults
-    if total_adults > base_occupancy:
-        extra_adults = total_adults - base_occupancy
-        if room.room_type.extra_adult_price:
-            extra_amount += extra_adults * room.room_type.extra_adult_price * nights
-    
-    # Calculate children charges
-    if number_of_children > 0 and room.room_type.child_price:
-        extra_amount += number_of_children * room.room_type.child_price * nights
-    
-    total_amount = base_amount + extra_amount
-    
-    # Create booking
-    db_booking = Booking(
-        user_id=current_user.id,
-        room_id=booking_data.room_id,
-        check_in_date=booking_data.check_in_date,
-        check_out_date=booking_data.check_out_date,
-        number_of_guests=booking_data.number_of_guests,
-        number_of_adults=booking_data.number_of_adults or booking_data.number_of_guests,
-        number_of_children=booking_data.number_of_children or 0,
-        total_amount=total_amount,
-        status=BookingStatus.PENDING,
-        payment_status=PaymentStatus.PENDING,
-        guest_name=booking_data.guest_name,
-        guest_email=booking_data.guest_email,
-        guest_phone=booking_data.guest_phone,
-        special_requests=booking_data.special_requests
+    # Overlapping stays are rejected by the database constraints, not a pre-check;
+    # other guests' holds are checked under the room's lock
+    db_booking = None
+    for room_id in candidate_room_ids:
+        if await held_by_others(
+            db, current_user.id, room_id, booking_data.check_in_date, booking_data.check_out_date
+        ):
+            continue
+        candidate = Booking(
+            user_id=current_user.id,
+            room_id=room_id,
+            room_pinned=hold.room_pinned if hold else booking_data.room_id is not None,
+            check_in_date=booking_data.check_in_date,
+            check_out_date=booking_data.check_out_date,
+            number_of_guests=booking_data.number_of_guests,
+            number_of_adults=number_of_adults,
+            number_of_children=number_of_children,
+            total_amount=price.total_amount,
+            status=BookingStatus.PENDING,
+            payment_status=PaymentStatus.PENDING,
+            guest_name=booking_data.guest_name,
+            guest_email=booking_data.guest_email,
+            guest_phone=booking_data.guest_phone,
+            special_requests=booking_data.special_requests
+        )
+        try:
+            async with db.begin_nested():
+                db.add(candidate)
+                await db.flush()
+                await sync_room_nights(db, candidate, is_new=True)
+        except IntegrityError as exc:
+            if not is_overbooking(exc):
+                await db.rollback()
+                raise
+            continue
+        db_booking = candidate
+        break
+    
+    if db_booking is None:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Room is not available for the selected dates"
+        )
+    released = await release_own_holds(
+        db,
+        current_user.id,
+        [(db_booking.room_id, db_booking.check_in_date, db_booking.check_out_date)],
+    )
+    await db.refresh(db_booking)
+    # The confirmation commits with the booking and is sent in the background
+    queued = queue_confirmations(db, [db_booking])
+    response = None
+    if claim is not None:
+        response = await store_response(
+            db, claim, status.HTTP_201_CREATED, BookingResponse.model_validate(db_booking)
+        )
+    await db.commit()
+    if queued:
+        emails_queued()
+    holds_released(released)
+    if claim is not None:
+        response_committed(claim)
+    await booking_nights_changed(
+        db, db_booking.room_id, db_booking.check_in_date, db_booking.check_out_date
     )
     
-    db.add(db_booking)
-    db.commit()
-    db.refresh(db_booking)
+    return response if response is not None else db_booking
+
+@router.post("/bulk", response_model=BulkBookingResponse, status_code=status.HTTP_201_CREATED)
+async def create_bookings_bulk(
+    bulk_data: BulkBookingRequest,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    catalog: CatalogSnapshot = Depends(get_catalog),
+    grid: PriceGrid = Depends(get_price_grid),
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_KEY_HEADER)
+):
+    if not bulk_data.bookings or len(bulk_data.bookings) > BULK_BOOKING_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Give 1 to {BULK_BOOKING_MAX_ITEMS} bookings"
+        )
+    
+    claim = None
+    if idempotency_key is not None:
+        replayed, claim = await idempotent_replay(db, current_user.id, idempotency_key, bulk_data)
+        if replayed is not None:
+            return replayed
+    
+    results, released = await book_group(
+        db, current_user.id, bulk_data.bookings, catalog, grid, bulk_data.all_or_nothing
+    )
+    created = [result.booking for result in results if result.booking is not None]
+    body = BulkBookingResponse(created=len(created), results=results)
+    if not created:
+        await db.rollback()
+        response.status_code = status.HTTP_409_CONFLICT
+        return body
+    
+    # 207 Multi-Status when best effort left some stays unbooked
+    status_code = (
+        status.HTTP_201_CREATED if len(created) == len(results) else status.HTTP_207_MULTI_STATUS
+    )
+    queued = queue_confirmations(db, created)
+    stored = None
+    if claim is not None:
+        stored = await store_response(db, claim, status_code, body)
+    await db.commit()
+    if queued:
+        emails_queued()
+    holds_released(released)
+    if claim is not None:
+        response_committed(claim)
+    for room_id, check_in, check_out in repricing_spans(catalog, created):
+        await booking_nights_changed(db, room_id, check_in, check_out)
     
-    return db_booking
+    if stored is not None:
+        return stored
+    response.status_code = status_code
+    return body
 
 @router.get("", response_model=List[BookingResponse])
 async def get_my_bookings(
-    db: Session = Depends(get_db),
+    booking_status: Optional[BookingStatus] = Query(None, alias="status"),
+    payment_status: Optional[PaymentStatus] = Query(None),
+    room_id: Optional[int] = Query(None),
+    check_in_from: Optional[date] = Query(None),
+    check_in_to: Optional[date] = Query(None),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    bookings = db.query(Booking).filter(Booking.user_id == current_user.id).order_by(Booking.created_at.desc()).all()
-    return bookings
+    query = filter_bookings(
+        booking_list_query().where(Booking.user_id == current_user.id),
+        booking_status, payment_status, room_id, check_in_from, check_in_to
+    )
+    rows, next_cursor = await fetch_booking_page(db, query, cursor, limit)
+    return booking_page_response(rows, next_cursor)
 
 @router.get("/{booking_id}", response_model=BookingResponse)
 async def get_booking(
     booking_id: int,
-    db: Session = Depends(get_db),
+    response: Response,
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    booking = db.query(Booking).filter(Booking.id == booking_id).first()
+    booking = await db.get(Booking, booking_id)
     if not booking:
         raise HTTPException(status_code=404, detail="Booking not found")
     
@@ -123,23 +285,30 @@ async def get_booking(
     if booking.user_id != current_user.id and current_user.role.value != "admin":
         raise HTTPException(status_code=403, detail="Not authorized to view this booking")
     
+    response.headers["ETag"] = booking_etag(booking)
     return booking
 
 @router.patch("/{booking_id}", response_model=BookingResponse)
 async def update_booking(
     booking_id: int,
     booking_update: BookingUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    if_match: Optional[str] = Header(None)
 ):
-    booking = db.query(Booking).filter(Booking.id == booking_id).first()
+    booking = await db.get(Booking, booking_id)
     if not booking:
         raise HTTPException(status_code=404, detail="Booking not found")
     
     # Users can only cancel their own bookings
-    if booking.user_id != current_user.id and current_user.role.value != "admin":
-        if booking_update.status != BookingStatus.CANCELLED:
-            raise HTTPException(status_code=403, detail="Not authorized to update this booking")
+    full_access = booking.user_id == current_user.id or current_user.role.value == "admin"
+    if not full_access and booking_update.status != BookingStatus.CANCELLED:
+        raise HTTPException(status_code=403, detail="Not authorized to update this booking")
+    # After the permission check, so a refused caller learns nothing of the version
+    check_if_match(if_match, booking)
+    
+    if not full_access:
         booking.status = BookingStatus.CANCELLED
     else:
         if booking_update.status:
@@ -149,24 +318,55 @@ async def update_booking(
         if booking_update.special_requests is not None:
             booking.special_requests = booking_update.special_requests
     
-    db.commit()
-    db.refresh(booking)
+    try:
+        await sync_room_nights(db, booking)
+        await db.commit()
+    except IntegrityError as exc:
+        await db.rollback()
+        if not is_overbooking(exc):
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Room is not available for the selected dates"
+        )
+    except StaleDataError:
+        # Changed by another request between our read and our write
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Booking was changed by another request; reload it and retry"
+        )
+    if booking_update.status:
+        await booking_nights_changed(db, booking.room_id, booking.check_in_date, booking.check_out_date)
+    await db.refresh(booking)
+    response.headers["ETag"] = booking_etag(booking)
     return booking
 
 @router.delete("/{booking_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def cancel_booking(
     booking_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    if_match: Optional[str] = Header(None)
 ):
-    booking = db.query(Booking).filter(Booking.id == booking_id).first()
+    booking = await db.get(Booking, booking_id)
     if not booking:
         raise HTTPException(status_code=404, detail="Booking not found")
     
     if booking.user_id != current_user.id and current_user.role.value != "admin":
         raise HTTPException(status_code=403, detail="Not authorized to cancel this booking")
+    check_if_match(if_match, booking)
     
     booking.status = BookingStatus.CANCELLED
-    db.commit()
+    try:
+        await sync_room_nights(db, booking)
+        await db.commit()
+    except StaleDataError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Booking was changed by another request; reload it and retry"
+        )
+    await booking_nights_changed(db, booking.room_id, booking.check_in_date, booking.check_out_date)
     return None
 
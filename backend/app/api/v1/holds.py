@@ -0,0 +1,110 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from app.core.config import settings
+from app.core.database import get_db
+from app.schemas.hold import HoldCreate, HoldResponse
+from app.models.inventory import BookingHold
+from app.models.room import Room, RoomType
+from app.api.v1.auth import get_current_user
+from app.services.assignment import ROOM_ASSIGNMENT_ATTEMPTS, assignment_lock, rank_rooms
+from app.services.availability import night_range
+from app.services.holds import active_hold_count, hold_placed, holds_released, place_hold
+from app.models.user import User
+
+router = APIRouter()
+
+@router.post("", response_model=HoldResponse, status_code=status.HTTP_201_CREATED)
+async def create_hold(
+    hold_data: HoldCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    if hold_data.check_out_date <= hold_data.check_in_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Check-out date must be after check-in date"
+        )
+    
+    if hold_data.check_in_date < datetime.now(hold_data.check_in_date.tzinfo):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Check-in date cannot be in the past"
+        )
+    
+    # Nights are hotel dates; a stay inside one date (e.g. day use) books none
+    first_night, end_night = night_range(hold_data.check_in_date, hold_data.check_out_date)
+    if end_night <= first_night:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Stay must include at least one night"
+        )
+    
+    if (hold_data.room_id is None) == (hold_data.room_type_id is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Give either room_id or room_type_id"
+        )
+    
+    if await active_hold_count(db, current_user.id) >= settings.BOOKING_HOLDS_PER_USER:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Too many rooms on hold; book or release one first"
+        )
+    
+    # Holds take the room type's assignment lock too, so re-optimization never moves a stay onto one
+    if hold_data.room_id is not None:
+        room = await db.scalar(
+            select(Room).where(Room.id == hold_data.room_id, Room.is_active == True)
+        )
+        if not room:
+            raise HTTPException(status_code=404, detail="Room not found")
+        await db.execute(assignment_lock(room.room_type_id))
+        candidate_room_ids = [room.id]
+    else:
+        room_type = await db.get(RoomType, hold_data.room_type_id)
+        if not room_type:
+            raise HTTPException(status_code=404, detail="Room type not found")
+        await db.execute(assignment_lock(room_type.id))
+        candidate_room_ids = (await rank_rooms(
+            db, room_type.id, hold_data.check_in_date, hold_data.check_out_date
+        ))[:ROOM_ASSIGNMENT_ATTEMPTS]
+    
+    hold = None
+    for room_id in candidate_room_ids:
+        hold = await place_hold(
+            db,
+            current_user.id,
+            room_id,
+            hold_data.room_id is not None,
+            hold_data.check_in_date,
+            hold_data.check_out_date,
+        )
+        if hold:
+            break
+    
+    if hold is None:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Room is not available for the selected dates"
+        )
+    await db.commit()
+    hold_placed(hold)
+    
+    return hold
+
+@router.delete("/{hold_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def release_hold(
+    hold_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    hold = await db.get(BookingHold, hold_id)
+    if not hold or hold.user_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Hold not found")
+    
+    await db.delete(hold)
+    await db.commit()
+    holds_released([hold_id])
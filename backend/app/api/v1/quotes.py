@@ -0,0 +1,123 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from app.core.database import get_db
+from app.schemas.quote import (
+    FlexibleQuoteRequest, FlexibleQuoteResponse, QuoteRequest, QuoteResponse,
+)
+from app.services.catalog import CatalogSnapshot, get_catalog
+from app.services.dynamic_pricing import PriceGrid, get_price_grid
+from app.services.availability import HOTEL_TZ
+from app.services.pricing import (
+    FLEXIBLE_SEARCH_MAX_DAYS, FLEXIBLE_SEARCH_MAX_NIGHTS, quote_stay, quote_windows, stay_length,
+)
+
+router = APIRouter()
+
+@router.post("", response_model=QuoteResponse)
+async def create_quote(
+    quote_request: QuoteRequest,
+    db: AsyncSession = Depends(get_db),
+    catalog: CatalogSnapshot = Depends(get_catalog),
+    grid: PriceGrid = Depends(get_price_grid)
+):
+    if quote_request.check_out_date <= quote_request.check_in_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Check-out date must be after check-in date"
+        )
+    
+    if quote_request.check_in_date < datetime.now(quote_request.check_in_date.tzinfo):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Check-in date cannot be in the past"
+        )
+    
+    if stay_length(quote_request.check_in_date, quote_request.check_out_date) < 1:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Stay must include at least one night"
+        )
+    
+    if quote_request.number_of_adults < 1 or quote_request.number_of_children < 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A quote needs at least one adult and no negative guest counts"
+        )
+    
+    quotes = await quote_stay(
+        db,
+        catalog,
+        grid,
+        quote_request.check_in_date,
+        quote_request.check_out_date,
+        quote_request.number_of_adults,
+        quote_request.number_of_children,
+        room_type_ids=quote_request.room_type_ids,
+        room_ids=quote_request.room_ids,
+    )
+    return QuoteResponse(
+        check_in_date=quote_request.check_in_date,
+        check_out_date=quote_request.check_out_date,
+        nights=stay_length(quote_request.check_in_date, quote_request.check_out_date),
+        number_of_adults=quote_request.number_of_adults,
+        number_of_children=quote_request.number_of_children,
+        quotes=quotes,
+    )
+
+@router.post("/flexible", response_model=FlexibleQuoteResponse)
+async def create_flexible_quote(
+    quote_request: FlexibleQuoteRequest,
+    db: AsyncSession = Depends(get_db),
+    catalog: CatalogSnapshot = Depends(get_catalog),
+    grid: PriceGrid = Depends(get_price_grid)
+):
+    if quote_request.latest_check_in < quote_request.earliest_check_in:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="latest_check_in must not be before earliest_check_in"
+        )
+    
+    if quote_request.earliest_check_in < datetime.now(HOTEL_TZ).date():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Check-in date cannot be in the past"
+        )
+    
+    search_days = (quote_request.latest_check_in - quote_request.earliest_check_in).days
+    if search_days >= FLEXIBLE_SEARCH_MAX_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Check-in range may span at most {FLEXIBLE_SEARCH_MAX_DAYS} days"
+        )
+    
+    if not 1 <= quote_request.nights <= FLEXIBLE_SEARCH_MAX_NIGHTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Stays must be 1 to {FLEXIBLE_SEARCH_MAX_NIGHTS} nights"
+        )
+    
+    if quote_request.number_of_adults < 1 or quote_request.number_of_children < 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A quote needs at least one adult and no negative guest counts"
+        )
+    
+    windows = await quote_windows(
+        db,
+        catalog,
+        grid,
+        quote_request.earliest_check_in,
+        quote_request.latest_check_in,
+        quote_request.nights,
+        quote_request.number_of_adults,
+        quote_request.number_of_children,
+        room_type_ids=quote_request.room_type_ids,
+        limit=min(max(quote_request.limit, 1), 100),
+    )
+    return FlexibleQuoteResponse(
+        nights=quote_request.nights,
+        number_of_adults=quote_request.number_of_adults,
+        number_of_children=quote_request.number_of_children,
+        windows=windows,
+    )
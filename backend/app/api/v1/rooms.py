@@ -1,61 +1,54 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import exists, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from datetime import datetime
 from app.core.database import get_db
 from app.schemas.room import RoomResponse, RoomTypeResponse, RoomAvailability
-from app.models.room import Room, RoomType
-from app.models.booking import Booking, BookingStatus
+from app.models.inventory import BookingHold, RoomNight
+from app.services.availability import holds_overlapping, nights_overlapping, unavailable_room_ids
+from app.services.catalog import (
+    CatalogSnapshot, apply_catalog_caching, get_cacheable_catalog, get_catalog,
+)
 from app.api.v1.auth import get_current_user
 from app.models.user import User
 
 router = APIRouter()
 
 @router.get("/types", response_model=List[RoomTypeResponse])
-async def get_room_types(db: Session = Depends(get_db)):
-    room_types = db.query(RoomType).all()
-    return room_types
+async def get_room_types(catalog: CatalogSnapshot = Depends(get_cacheable_catalog)):
+    return catalog.room_types
 
 @router.get("", response_model=List[RoomResponse])
 async def get_rooms(
+    request: Request,
+    response: Response,
     room_type_id: Optional[int] = Query(None),
     available: Optional[bool] = Query(None),
     check_in: Optional[datetime] = Query(None),
     check_out: Optional[datetime] = Query(None),
-    db: Session = Depends(get_db)
+    catalog: CatalogSnapshot = Depends(get_catalog),
+    db: AsyncSession = Depends(get_db)
 ):
-    query = db.query(Room).filter(Room.is_active == True)
+    rooms = catalog.rooms
     
     if room_type_id:
-        query = query.filter(Room.room_type_id == room_type_id)
+        rooms = [room for room in rooms if room.room_type_id == room_type_id]
     
-    rooms = query.all()
-    
-    # Filter by availability if dates provided
+    # Filter by availability if dates provided; only the ledger and hold lookup touches the database
     if available is not None and check_in and check_out:
-        available_rooms = []
-        for room in rooms:
-            # Check for conflicting bookings
-            conflicting_booking = db.query(Booking).filter(
-                Booking.room_id == room.id,
-                Booking.status.in_([BookingStatus.CONFIRMED, BookingStatus.CHECKED_IN]),
-                Booking.check_in_date < check_out,
-                Booking.check_out_date > check_in
-            ).first()
-            
-            is_available = conflicting_booking is None
-            if available and is_available:
-                available_rooms.append(room)
-            elif not available and not is_available:
-                available_rooms.append(room)
-        
-        rooms = available_rooms
+        taken = set((await db.scalars(unavailable_room_ids(check_in, check_out))).all())
+        rooms = [room for room in rooms if (room.id in taken) != available]
+        # Availability changes with every booking, so it is never cached
+        response.headers["Cache-Control"] = "no-store"
+    else:
+        apply_catalog_caching(request, response, catalog)
     
     return rooms
 
 @router.get("/{room_id}", response_model=RoomResponse)
-async def get_room(room_id: int, db: Session = Depends(get_db)):
-    room = db.query(Room).filter(Room.id == room_id, Room.is_active == True).first()
+async def get_room(room_id: int, catalog: CatalogSnapshot = Depends(get_cacheable_catalog)):
+    room = catalog.rooms_by_id.get(room_id)
     if not room:
         raise HTTPException(status_code=404, detail="Room not found")
     return room
@@ -65,27 +58,25 @@ async def check_room_availability(
     room_id: int,
     check_in: datetime = Query(...),
     check_out: datetime = Query(...),
-    db: Session = Depends(get_db)
+    catalog: CatalogSnapshot = Depends(get_catalog),
+    db: AsyncSession = Depends(get_db)
 ):
     if check_out <= check_in:
         raise HTTPException(status_code=400, detail="Check-out date must be after check-in date")
     
-    room = db.query(Room).filter(Room.id == room_id, Room.is_active == True).first()
-    if not room:
+    if room_id not in catalog.rooms_by_id:
         raise HTTPException(status_code=404, detail="Room not found")
     
-    # Check for conflicting bookings
-    conflicting_booking = db.query(Booking).filter(
-        Booking.room_id == room_id,
-        Booking.status.in_([BookingStatus.CONFIRMED, BookingStatus.CHECKED_IN]),
-        Booking.check_in_date < check_out,
-        Booking.check_out_date > check_in
-    ).first()
+    # Check the nightly ledger for taken nights and the holds for rooms in someone's checkout
+    taken = await db.scalar(select(
+        exists().where(RoomNight.room_id == room_id, nights_overlapping(check_in, check_out))
+        | exists().where(BookingHold.room_id == room_id, holds_overlapping(check_in, check_out))
+    ))
     
     return RoomAvailability(
         room_id=room_id,
         check_in=check_in,
         check_out=check_out,
-        available=conflicting_booking is None
+        available=not taken
     )
 
@@ -1,20 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
 from typing import List
-from app.core.database import get_db
 from app.schemas.service import ServiceResponse
-from app.models.service import Service
+from app.services.catalog import CatalogSnapshot, get_cacheable_catalog
 
 router = APIRouter()
 
 @router.get("", response_model=List[ServiceResponse])
-async def get_services(db: Session = Depends(get_db)):
-    services = db.query(Service).filter(Service.is_active == True).all()
-    return services
+async def get_services(catalog: CatalogSnapshot = Depends(get_cacheable_catalog)):
+    return catalog.services
 
 @router.get("/{service_id}", response_model=ServiceResponse)
-async def get_service(service_id: int, db: Session = Depends(get_db)):
-    service = db.query(Service).filter(Service.id == service_id, Service.is_active == True).first()
+async def get_service(service_id: int, catalog: CatalogSnapshot = Depends(get_cacheable_catalog)):
+    service = catalog.services_by_id.get(service_id)
     if not service:
         raise HTTPException(status_code=404, detail="Service not found")
     return service
@@ -1,4 +1,5 @@
 from pydantic_settings import BaseSettings
+from sqlalchemy.engine import make_url
 from typing import List
 import os
 
@@ -8,19 +9,66 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    PRINCIPAL_CACHE_SIZE: int = 10000  # Users kept per worker after token lookup; 0 disables
+    PRINCIPAL_CACHE_TTL: float = 30.0  # Seconds before a cached user is re-read from the database
+    
+    # Password hashing (per worker process)
+    BCRYPT_ROUNDS: int = 12  # Existing hashes are upgraded on the next successful login
+    PASSWORD_HASH_WORKERS: int = 2  # Threads running bcrypt
+    PASSWORD_HASH_QUEUE_SIZE: int = 16  # Waiting hash calls allowed before answering 503
     CORS_ORIGINS: str = "http://localhost:3000"
     
+    # Database pool settings (per worker process)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30  # Seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # Seconds before a connection is replaced
+    DB_ECHO: bool = False
+    
     @property
     def cors_origins_list(self) -> List[str]:
         """Parse CORS_ORIGINS from comma-separated string to list"""
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
     
+    @property
+    def async_database_url(self) -> str:
+        """DATABASE_URL rewritten for the asyncpg driver"""
+        url = make_url(self.DATABASE_URL).set(drivername="postgresql+asyncpg")
+        if "sslmode" in url.query:
+            # asyncpg spells libpq's sslmode as ssl
+            ssl = url.query["sslmode"]
+            url = url.difference_update_query(["sslmode"]).update_query_dict({"ssl": ssl})
+        return url.render_as_string(hide_password=False)
+    
+    # Hotel settings
+    HOTEL_TIMEZONE: str = "Asia/Kolkata"  # Nights are counted in the hotel's local calendar
+    CATALOG_REFRESH_SECONDS: float = 5.0  # How often each worker checks for catalog changes
+    CATALOG_CACHE_MAX_AGE: int = 60  # Seconds clients may reuse a catalog response
+    CATALOG_STALE_WHILE_REVALIDATE: int = 600  # Seconds a stale copy may be served while refetching
+    PRICE_GRID_DAYS: int = 365  # Nights ahead priced by the pricing curves
+    PRICE_GRID_REFRESH_SECONDS: float = 300.0  # How often each worker rebuilds its price grid
+    BOOKING_HOLD_MINUTES: int = 10  # How long a room stays reserved for a guest in checkout
+    BOOKING_HOLDS_PER_USER: int = 3  # Rooms one guest may hold at a time
+    BOOKING_HOLD_SWEEP_SECONDS: float = 60.0  # Longest wait between deletions of expired holds
+    PENDING_BOOKING_EXPIRY_HOURS: int = 24  # Unpaid bookings left pending this long are cancelled
+    PENDING_BOOKING_SWEEP_SECONDS: float = 300.0  # How often stale pending bookings are looked for
+    IDEMPOTENCY_KEY_RETENTION_HOURS: int = 24  # How long a retry replays the first response
+    IDEMPOTENCY_CACHE_SIZE: int = 10000  # Stored responses kept in memory per worker; 0 disables
+    IDEMPOTENCY_PURGE_SECONDS: float = 3600.0  # How often expired idempotency keys are deleted
+    
     # Email settings
     SMTP_HOST: str = ""
     SMTP_PORT: int = 587
     SMTP_USER: str = ""
     SMTP_PASSWORD: str = ""
     FROM_EMAIL: str = ""
+    SMTP_TIMEOUT: float = 30.0  # Seconds to wait on the SMTP server before retrying later
+    SMTP_POOL_SIZE: int = 2  # SMTP connections each worker keeps open and sends over in parallel
+    EMAIL_BATCH_SIZE: int = 50  # Outbox emails claimed per delivery round
+    EMAIL_POLL_SECONDS: float = 5.0  # Longest wait before polling for other workers' emails
+    EMAIL_MAX_ATTEMPTS: int = 8  # Deliveries tried before an email is marked failed
+    EMAIL_RETRY_SECONDS: float = 30.0  # Wait after the first failed delivery, then doubled
+    EMAIL_RETRY_MAX_SECONDS: float = 3600.0
     
     class Config:
         env_file = ".env"
@@ -0,0 +1,29 @@
+from typing import Any, Iterable, List, Mapping, Type, TypeVar
+import orjson
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+def _model_fields(value: Any):
+    # orjson hands over anything it cannot encode natively; constructed models are plain field dicts
+    if isinstance(value, BaseModel):
+        return value.__dict__
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+class ModelListResponse(ORJSONResponse):
+    """ORJSONResponse that also encodes Pydantic models straight from their fields.
+
+    Meant for models built with model_construct from trusted database rows:
+    nothing is validated or converted on the way out.
+    """
+
+    def render(self, content: Any) -> bytes:
+        # OPT_UTC_Z writes UTC as "Z", matching Pydantic's own JSON output
+        return orjson.dumps(
+            content, default=_model_fields, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+        )
+
+def construct_models(model: Type[ModelT], rows: Iterable[Mapping[str, Any]]) -> List[ModelT]:
+    """Build response models from row mappings without re-validating them."""
+    return [model.model_construct(**row) for row in rows]
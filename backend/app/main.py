@@ -1,12 +1,53 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.api.v1 import api_router
+from app.services.bookings import NEXT_CURSOR_HEADER, sweep_pending_bookings
+from app.services.catalog import refresh_catalog, watch_catalog
+from app.services.dynamic_pricing import recompute_price_grid, watch_price_grid
+from app.services.email_outbox import deliver_emails, emails_enabled
+from app.services.holds import sweep_holds
+from app.services.idempotency import REPLAYED_HEADER, sweep_idempotency_keys
+from app.services.metrics import register_booking_listeners
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Catalog snapshot is loaded before the first request and kept current in the background
+    await refresh_catalog()
+    catalog_watcher = asyncio.create_task(watch_catalog(settings.CATALOG_REFRESH_SECONDS))
+    await recompute_price_grid()
+    grid_watcher = asyncio.create_task(watch_price_grid(settings.PRICE_GRID_REFRESH_SECONDS))
+    hold_sweeper = asyncio.create_task(sweep_holds(settings.BOOKING_HOLD_SWEEP_SECONDS))
+    # Pending bookings hold their room; abandoned ones are cancelled once stale
+    pending_sweeper = asyncio.create_task(
+        sweep_pending_bookings(settings.PENDING_BOOKING_SWEEP_SECONDS)
+    )
+    key_sweeper = asyncio.create_task(sweep_idempotency_keys(settings.IDEMPOTENCY_PURGE_SECONDS))
+    # Without SMTP settings no emails are queued, so there is nothing to deliver
+    email_sender = None
+    if emails_enabled():
+        email_sender = asyncio.create_task(deliver_emails(settings.EMAIL_POLL_SECONDS))
+    yield
+    if email_sender:
+        email_sender.cancel()
+    key_sweeper.cancel()
+    pending_sweeper.cancel()
+    hold_sweeper.cancel()
+    grid_watcher.cancel()
+    catalog_watcher.cancel()
+
+# Booking writes keep the daily_metrics rollup current in the same flush
+register_booking_listeners()
 
 app = FastAPI(
     title="Shivashray Hotel API",
     description="Hotel booking system API for Shivashray Hotel, Varanasi",
     version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS middleware
@@ -16,6 +57,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, REPLAYED_HEADER],
 )
 
 # Include API routes
@@ -2,6 +2,15 @@ from app.models.user import User
 from app.models.room import Room, RoomType, RoomAmenity
 from app.models.booking import Booking
 from app.models.service import Service
+from app.models.inventory import RoomNight, BookingHold
+from app.models.catalog import CatalogVersion
+from app.models.metrics import DailyMetric
+from app.models.rate import RoomRate, PricingCurve
+from app.models.idempotency import IdempotencyKey
+from app.models.outbox import EmailOutbox
 
-__all__ = ["User", "Room", "RoomType", "RoomAmenity", "Booking", "Service"]
+__all__ = [
+    "User", "Room", "RoomType", "RoomAmenity", "Booking", "Service", "RoomNight", "BookingHold",
+    "CatalogVersion", "DailyMetric", "RoomRate", "PricingCurve", "IdempotencyKey", "EmailOutbox",
+]
 
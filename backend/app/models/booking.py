@@ -1,5 +1,9 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum as SQLEnum, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import (
+    Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Enum as SQLEnum, Text,
+)
+from sqlalchemy import Computed, Index, text
+from sqlalchemy.dialects.postgresql import ExcludeConstraint, TSTZRANGE
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from app.core.database import Base
 import enum
@@ -19,16 +23,18 @@ class PaymentStatus(str, enum.Enum):
 class Booking(Base):
     __tablename__ = "bookings"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     room_id = Column(Integer, ForeignKey("rooms.id"), nullable=False)
+    # False: booked by room type, the hotel may move it
+    room_pinned = Column(Boolean, nullable=False, default=True)
     check_in_date = Column(DateTime(timezone=True), nullable=False, index=True)
     check_out_date = Column(DateTime(timezone=True), nullable=False, index=True)
     number_of_guests = Column(Integer, nullable=False, default=1)
     number_of_adults = Column(Integer, nullable=True, default=None)  # Number of adults
     number_of_children = Column(Integer, nullable=True, default=None)  # Number of children
     total_amount = Column(Float, nullable=False)
-    status = Column(SQLEnum(BookingStatus), default=BookingStatus.PENDING, index=True)
+    status = Column(SQLEnum(BookingStatus), default=BookingStatus.PENDING)
     payment_status = Column(SQLEnum(PaymentStatus), default=PaymentStatus.PENDING)
     guest_name = Column(String, nullable=False)
     guest_email = Column(String, nullable=False)
@@ -36,7 +42,43 @@ class Booking(Base):
     special_requests = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Bumped on every update; checked by the UPDATE itself
+    version = Column(Integer, nullable=False, server_default="1")
+    stay = deferred(Column(
+        TSTZRANGE,
+        Computed("tstzrange(check_in_date, check_out_date, '[)')", persisted=True),
+    ))
     
     user = relationship("User")
     room = relationship("Room", back_populates="bookings")
+    
+    # UPDATEs match on the version read, so a concurrent change raises StaleDataError
+    # instead of being overwritten
+    __mapper_args__ = {"version_id_col": version}
+    
+    __table_args__ = (
+        # No two active bookings may overlap on the same room (needs the btree_gist extension).
+        # Deferrable so room reassignment can swap stays between rooms in one transaction.
+        ExcludeConstraint(
+            ("room_id", "="),
+            ("stay", "&&"),
+            name="bookings_no_overlap",
+            using="gist",
+            where=text("status IN ('PENDING', 'CONFIRMED', 'CHECKED_IN')"),
+            deferrable=True,
+            initially="IMMEDIATE",
+        ),
+        # Sold stays overlapping a reporting window
+        Index(
+            "ix_bookings_sold_stay",
+            "stay",
+            postgresql_using="gist",
+            postgresql_where=text("status IN ('CONFIRMED', 'CHECKED_IN', 'CHECKED_OUT')"),
+        ),
+        # Keyset pagination on (created_at, id), optionally narrowed by user, status or room
+        Index("ix_bookings_created_at_id", "created_at", "id"),
+        Index("ix_bookings_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_bookings_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_bookings_room_id_created_at_id", "room_id", "created_at", "id"),
+    )
 
@@ -0,0 +1,9 @@
+from sqlalchemy import Column, Integer, BigInteger
+from app.core.database import Base
+
+# Single-row counter bumped by every catalog write, so each worker can tell its snapshot is stale
+class CatalogVersion(Base):
+    __tablename__ = "catalog_version"
+    
+    id = Column(Integer, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=1)
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, SmallInteger, String, LargeBinary, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+# Responses of requests sent with an Idempotency-Key, replayed to retries of the same
+# request until purged after IDEMPOTENCY_KEY_RETENTION_HOURS
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+    
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    key = Column(String(255), primary_key=True)
+    request_hash = Column(LargeBinary, nullable=False)  # SHA-256 of the request body
+    status_code = Column(SmallInteger, nullable=True)  # Set with the response before commit
+    response_body = Column(LargeBinary, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
@@ -0,0 +1,39 @@
+from sqlalchemy import Column, Integer, Boolean, Date, DateTime, ForeignKey, Index
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+# Nightly inventory ledger: one row per room per night held by an active booking
+class RoomNight(Base):
+    __tablename__ = "room_nights"
+    
+    room_id = Column(Integer, ForeignKey("rooms.id"), primary_key=True)
+    night = Column(Date, primary_key=True)
+    booking_id = Column(
+        Integer, ForeignKey("bookings.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    
+    __table_args__ = (
+        Index("ix_room_nights_night_room_id", "night", "room_id"),
+    )
+
+# Rooms reserved for a guest during checkout. A hold blocks the room until expires_at,
+# then counts for nothing even before the sweep deletes it.
+class BookingHold(Base):
+    __tablename__ = "booking_holds"
+    
+    id = Column(Integer, primary_key=True)
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    room_id = Column(Integer, ForeignKey("rooms.id"), nullable=False)
+    # False: held by room type, booked the same way
+    room_pinned = Column(Boolean, nullable=False, default=True)
+    check_in_date = Column(DateTime(timezone=True), nullable=False)
+    check_out_date = Column(DateTime(timezone=True), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    __table_args__ = (
+        # Holds overlapping a stay on a room
+        Index("ix_booking_holds_room_dates", "room_id", "check_in_date", "check_out_date"),
+    )
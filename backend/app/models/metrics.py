@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, Float, Date, ForeignKey
+from app.core.database import Base
+
+# Daily rollup per room type, kept in step with booking changes; reports read only this table.
+# rooms_* count room nights; revenue is each sold booking's amount spread evenly over its nights.
+class DailyMetric(Base):
+    __tablename__ = "daily_metrics"
+    
+    day = Column(Date, primary_key=True)
+    room_type_id = Column(Integer, ForeignKey("room_types.id"), primary_key=True)
+    rooms_available = Column(Integer, nullable=False, default=0)
+    rooms_sold = Column(Integer, nullable=False, default=0)
+    rooms_cancelled = Column(Integer, nullable=False, default=0)
+    revenue_pending = Column(Float, nullable=False, default=0)
+    revenue_paid = Column(Float, nullable=False, default=0)
+    revenue_refunded = Column(Float, nullable=False, default=0)
@@ -0,0 +1,40 @@
+from sqlalchemy import (
+    Column, Integer, SmallInteger, String, Text, DateTime, ForeignKey, Index, Enum as SQLEnum, text,
+)
+from sqlalchemy.sql import func
+from app.core.database import Base
+import enum
+
+class EmailStatus(str, enum.Enum):
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+
+# Emails written in the transaction of the change they announce and delivered
+# afterwards by the outbox worker, so SMTP latency never reaches a request
+class EmailOutbox(Base):
+    __tablename__ = "email_outbox"
+    
+    id = Column(Integer, primary_key=True)
+    booking_id = Column(
+        Integer, ForeignKey("bookings.id", ondelete="SET NULL"), nullable=True, index=True
+    )
+    to_email = Column(String, nullable=False)
+    subject = Column(String, nullable=False)
+    body = Column(Text, nullable=False)
+    status = Column(SQLEnum(EmailStatus), nullable=False, default=EmailStatus.PENDING)
+    attempts = Column(SmallInteger, nullable=False, default=0)
+    # Also the claim lease
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    last_error = Column(Text, nullable=True)
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    __table_args__ = (
+        # The worker's queue: pending emails due first
+        Index(
+            "ix_email_outbox_pending",
+            "next_attempt_at",
+            postgresql_where=text("status = 'PENDING'"),
+        ),
+    )
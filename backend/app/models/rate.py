@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, Float, String, Date, DateTime, ForeignKey, JSON
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+# Nightly rate overrides per room type (festivals, peak seasons); nights without a row
+# are charged RoomType.base_price. The rate replaces base_price only, not the extra-guest prices.
+class RoomRate(Base):
+    __tablename__ = "room_rates"
+    
+    room_type_id = Column(Integer, ForeignKey("room_types.id"), primary_key=True)
+    night = Column(Date, primary_key=True)
+    price = Column(Float, nullable=False)
+    label = Column(String, nullable=True)  # e.g., "Dev Deepawali", "Mahashivratri"
+
+# Yield-management curves per room type: each night's rate is multiplied by both curves,
+# interpolated linearly between points. Room types without a row keep their calendar rates.
+class PricingCurve(Base):
+    __tablename__ = "pricing_curves"
+    
+    room_type_id = Column(Integer, ForeignKey("room_types.id"), primary_key=True)
+    occupancy_points = Column(JSON, nullable=False)  # [[percent of the type's rooms taken, multiplier], ...]
+    lead_time_points = Column(JSON, nullable=False)  # [[days from today to the night, multiplier], ...]
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
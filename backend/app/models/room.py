@@ -1,5 +1,5 @@
 from sqlalchemy import Column, Integer, String, Float, Boolean, Text, ForeignKey, DateTime, Table
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, joinedload
 from sqlalchemy.sql import func
 from app.core.database import Base
 
@@ -51,3 +51,11 @@ class Room(Base):
     amenities = relationship("RoomAmenity", secondary=room_amenity_association, back_populates="rooms")
     bookings = relationship("Booking", back_populates="room")
 
+
+def room_response_options():
+    """Loader options for anything serialized as RoomResponse.
+    
+    Both relationships are joined so a room list is one statement; call .unique()
+    on the result.
+    """
+    return (joinedload(Room.room_type), joinedload(Room.amenities))
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from app.models.booking import BookingStatus, PaymentStatus
 
@@ -16,7 +16,9 @@ class BookingBase(BaseModel):
     special_requests: Optional[str] = None
 
 class BookingCreate(BookingBase):
-    pass
+    room_id: Optional[int] = None  # Either a room, or
+    room_type_id: Optional[int] = None  # a room type, for which the hotel picks the room, or
+    hold_id: Optional[int] = None  # a hold placed during checkout, which the booking takes over
 
 class BookingUpdate(BaseModel):
     status: Optional[BookingStatus] = None
@@ -26,12 +28,27 @@ class BookingUpdate(BaseModel):
 class BookingResponse(BookingBase):
     id: int
     user_id: Optional[int] = None
+    room_pinned: bool = True
     total_amount: float
     status: BookingStatus
     payment_status: PaymentStatus
     created_at: datetime
     updated_at: Optional[datetime] = None
+    version: int = 1  # Changes with every update; send it back as If-Match: "<id>-<version>"
     
     class Config:
         from_attributes = True
 
+class BulkBookingRequest(BaseModel):
+    bookings: List[BookingCreate]
+    all_or_nothing: bool = True  # False books every stay that fits and reports the rest
+
+class BulkBookingResult(BaseModel):
+    index: int  # Position in the request's bookings
+    status_code: int  # 201 booked, 4xx as POST /bookings would answer, 424 dropped with the group
+    detail: Optional[str] = None
+    booking: Optional[BookingResponse] = None
+
+class BulkBookingResponse(BaseModel):
+    created: int
+    results: List[BulkBookingResult]
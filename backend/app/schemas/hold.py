@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+class HoldCreate(BaseModel):
+    room_id: Optional[int] = None  # Either a room, or
+    room_type_id: Optional[int] = None  # a room type, for which the hotel picks the room
+    check_in_date: datetime
+    check_out_date: datetime
+
+class HoldResponse(BaseModel):
+    id: int
+    room_id: int
+    room_pinned: bool
+    check_in_date: datetime
+    check_out_date: datetime
+    expires_at: datetime
+    
+    class Config:
+        from_attributes = True
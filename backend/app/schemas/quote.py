@@ -0,0 +1,55 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import date, datetime
+
+class QuoteRequest(BaseModel):
+    check_in_date: datetime
+    check_out_date: datetime
+    number_of_adults: int = 1
+    number_of_children: int = 0
+    room_type_ids: Optional[List[int]] = None  # Only quote these room types
+    room_ids: Optional[List[int]] = None  # Only quote the types of these candidate rooms
+
+class RoomTypeQuote(BaseModel):
+    room_type_id: int
+    name: str
+    max_occupancy: int
+    base_amount: float
+    extra_amount: float  # Extra adults beyond base occupancy and children
+    total_amount: float
+    available_rooms: int
+    available_room_ids: List[int]
+
+class QuoteResponse(BaseModel):
+    check_in_date: datetime
+    check_out_date: datetime
+    nights: int
+    number_of_adults: int
+    number_of_children: int
+    quotes: List[RoomTypeQuote]
+
+class FlexibleQuoteRequest(BaseModel):
+    earliest_check_in: date
+    latest_check_in: date  # Inclusive
+    nights: int
+    number_of_adults: int = 1
+    number_of_children: int = 0
+    room_type_ids: Optional[List[int]] = None  # Only quote these room types
+    limit: int = 20  # Cheapest windows returned
+
+class StayWindowQuote(BaseModel):
+    check_in_date: date
+    check_out_date: date
+    room_type_id: int
+    name: str
+    base_amount: float
+    extra_amount: float
+    total_amount: float
+    available_rooms: int
+    available_room_ids: List[int]
+
+class FlexibleQuoteResponse(BaseModel):
+    nights: int
+    number_of_adults: int
+    number_of_children: int
+    windows: List[StayWindowQuote]  # Available windows, cheapest first
@@ -0,0 +1,32 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import date, datetime
+
+class RoomRateBase(BaseModel):
+    room_type_id: int
+    price: float  # Nightly rate replacing the room type's base_price
+    label: Optional[str] = None
+
+class RoomRateUpdate(RoomRateBase):
+    date_from: date
+    date_to: date  # Inclusive
+
+class RoomRateResponse(RoomRateBase):
+    night: date
+    
+    class Config:
+        from_attributes = True
+
+class PricingCurveBase(BaseModel):
+    occupancy_points: List[List[float]]  # [[percent of rooms taken, multiplier], ...]
+    lead_time_points: List[List[float]]  # [[days ahead, multiplier], ...]
+
+class PricingCurveUpdate(PricingCurveBase):
+    pass
+
+class PricingCurveResponse(PricingCurveBase):
+    room_type_id: int
+    updated_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
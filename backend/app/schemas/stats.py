@@ -0,0 +1,43 @@
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+from datetime import date
+from app.models.booking import BookingStatus, PaymentStatus
+
+class RoomTypeStats(BaseModel):
+    room_type_id: int
+    name: str
+    room_nights_available: int
+    room_nights_sold: int
+    room_nights_cancelled: int
+    room_revenue: float
+    occupancy_rate: float  # Percent of available room nights sold
+
+class DashboardStats(BaseModel):
+    date_from: date
+    date_to: date
+    room_nights_available: int
+    room_nights_sold: int
+    room_nights_cancelled: int  # Nights of bookings cancelled, at their original dates
+    occupancy_rate: float  # Percent of available room nights sold
+    adr: float  # Average daily rate: room revenue per room night sold
+    revpar: float  # Room revenue per available room night
+    room_revenue: float  # Revenue of the nights inside the range, pro rata per booking
+    revenue_by_payment_status: Dict[PaymentStatus, float]
+    bookings_by_status: Dict[BookingStatus, int]  # Bookings checking in during the range
+    arrivals_today: int
+    departures_today: int
+    by_room_type: List[RoomTypeStats]
+
+class EmailDeliveryStats(BaseModel):
+    sent: int
+    retried: int  # Deliveries that failed and were scheduled again
+    failed: int  # Emails given up on
+    batches: int
+    sent_per_second: float  # Over the last minute
+    sent_per_send_second: float  # While talking to the SMTP server
+
+class EmailOutboxStats(BaseModel):
+    pending: int  # Queued or waiting for a retry, across all workers
+    failed: int
+    oldest_pending_seconds: Optional[float] = None
+    worker: EmailDeliveryStats  # Deliveries made by the worker that answered
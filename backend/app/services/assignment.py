@@ -0,0 +1,272 @@
+import bisect
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+from sqlalchemy import delete, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.models.booking import Booking, BookingStatus
+from app.models.inventory import BookingHold, RoomNight
+from app.models.room import Room
+from app.services.availability import HOTEL_TZ, night_range, stay_nights
+from app.services.holds import room_locks
+
+# Free runs this short between two stays rarely sell, so assignment tries not to leave them
+SHORT_GAP_NIGHTS = 2
+
+# Nights of slack a short gap is scored as on top of its own length
+SHORT_GAP_PENALTY_NIGHTS = 7
+
+# Slack counted for a side of a stay with no later (or earlier) booking on the room
+OPEN_GAP_NIGHTS = 365
+
+# Rooms tried, best first, when concurrent bookings keep taking the chosen one
+ROOM_ASSIGNMENT_ATTEMPTS = 3
+
+# First key of the advisory locks serializing room assignment per room type
+ASSIGNMENT_LOCK_NAMESPACE = 20_001
+
+# Statuses of type bookings that may still be moved to another room
+MOVABLE_BOOKING_STATUSES = (BookingStatus.PENDING, BookingStatus.CONFIRMED)
+
+def gap_score(before: Optional[int], after: Optional[int]) -> int:
+    """Score of a stay leaving `before`/`after` free nights next to it on a room; None
+    is an open side. Lower is better.
+
+    The tightest fit wins (best fit), which keeps long free runs on other rooms for
+    long stays, but a short gap costs SHORT_GAP_PENALTY_NIGHTS extra. Ruling short
+    gaps out entirely would push stays onto empty rooms and sell fewer nights
+    overall (scripts/bench_room_assignment.py).
+    """
+    gaps = [OPEN_GAP_NIGHTS if gap is None else gap for gap in (before, after)]
+    short = sum(1 for gap in gaps if 0 < gap <= SHORT_GAP_NIGHTS)
+    return sum(gaps) + SHORT_GAP_PENALTY_NIGHTS * short
+
+class RoomCalendar:
+    """Half-open [first, end) stays of one room as sorted day ordinals."""
+
+    def __init__(self):
+        self.firsts: List[int] = []
+        self.ends: List[int] = []
+
+    def fit(self, first: int, end: int) -> Optional[Tuple[Optional[int], Optional[int]]]:
+        """Free nights before and after the stay if it fits, else None."""
+        i = bisect.bisect_left(self.firsts, first)
+        if i < len(self.firsts) and self.firsts[i] < end:
+            return None
+        if i > 0 and self.ends[i - 1] > first:
+            return None
+        before = first - self.ends[i - 1] if i > 0 else None
+        after = self.firsts[i] - end if i < len(self.firsts) else None
+        return before, after
+
+    def add(self, first: int, end: int):
+        i = bisect.bisect_left(self.firsts, first)
+        self.firsts.insert(i, first)
+        self.ends.insert(i, end)
+
+    def short_gaps(self) -> int:
+        return sum(
+            1
+            for end, first in zip(self.ends, self.firsts[1:])
+            if 0 < first - end <= SHORT_GAP_NIGHTS
+        )
+
+class Stay(NamedTuple):
+    booking_id: int
+    room_id: int
+    first: int  # Day ordinal of the first night
+    end: int  # Day ordinal of the check-out day
+    movable: bool
+
+@dataclass
+class AssignmentPlan:
+    moves: Dict[int, int]  # booking id -> new room id
+    short_gaps_before: int
+    short_gaps_after: int
+
+def _calendars(room_ids: Sequence[int], stays: Sequence[Stay]) -> Dict[int, RoomCalendar]:
+    calendars = {room_id: RoomCalendar() for room_id in room_ids}
+    for stay in stays:
+        calendars.setdefault(stay.room_id, RoomCalendar()).add(stay.first, stay.end)
+    return calendars
+
+def short_gaps(room_ids: Sequence[int], stays: Sequence[Stay]) -> int:
+    return sum(calendar.short_gaps() for calendar in _calendars(room_ids, stays).values())
+
+def best_room(calendars: Dict[int, RoomCalendar], first: int, end: int) -> Optional[int]:
+    best, best_score = None, None
+    for room_id, calendar in calendars.items():
+        gaps = calendar.fit(first, end)
+        if gaps is None:
+            continue
+        score = gap_score(*gaps)
+        if best_score is None or score < best_score:
+            best, best_score = room_id, score
+    return best
+
+def plan_assignments(room_ids: Sequence[int], stays: Sequence[Stay]) -> Optional[AssignmentPlan]:
+    """Reassign the movable stays of one room type across its rooms.
+
+    Fixed stays stay put. Movable ones are placed by check-in, longest first on
+    the same day, each in the room with the best gap_score. Returns None when
+    some movable stay no longer fits anywhere, and a plan without moves when
+    the result would not leave fewer short gaps than today's assignment.
+    """
+    calendars = _calendars(room_ids, [stay for stay in stays if not stay.movable])
+    moves = {}
+    movable = sorted(
+        (stay for stay in stays if stay.movable), key=lambda s: (s.first, s.first - s.end)
+    )
+    for stay in movable:
+        room_id = best_room(calendars, stay.first, stay.end)
+        if room_id is None:
+            return None
+        calendars[room_id].add(stay.first, stay.end)
+        if room_id != stay.room_id:
+            moves[stay.booking_id] = room_id
+
+    before = short_gaps(room_ids, stays)
+    after = sum(calendar.short_gaps() for calendar in calendars.values())
+    if after >= before:
+        return AssignmentPlan({}, before, before)
+    return AssignmentPlan(moves, before, after)
+
+def assignment_lock(room_type_id: int):
+    """Statement taking the room type's assignment lock until the transaction ends.
+
+    Type bookings and re-optimization of the same room type take turns, so each
+    ranks rooms against committed stays instead of racing for the same best room.
+    """
+    return text("SELECT pg_advisory_xact_lock(:namespace, :room_type_id)").bindparams(
+        namespace=ASSIGNMENT_LOCK_NAMESPACE, room_type_id=room_type_id
+    )
+
+# Free rooms of a type for [:first, :end) not on hold, with the ledger nights closest to
+# either side
+_ROOM_NEIGHBOURS = text("""
+    SELECT r.id,
+           (SELECT max(n.night) FROM room_nights n
+            WHERE n.room_id = r.id AND n.night < :first) AS previous_night,
+           (SELECT min(n.night) FROM room_nights n
+            WHERE n.room_id = r.id AND n.night >= :end) AS next_night
+    FROM rooms r
+    WHERE r.room_type_id = :room_type_id AND r.is_active
+      AND NOT EXISTS (
+          SELECT 1 FROM room_nights n
+          WHERE n.room_id = r.id AND n.night >= :first AND n.night < :end
+      )
+      AND NOT EXISTS (
+          SELECT 1 FROM booking_holds h
+          WHERE h.room_id = r.id AND h.check_in_date < :check_out AND h.check_out_date > :check_in
+            AND h.expires_at > :now
+      )
+    ORDER BY r.id
+""")
+
+async def rank_rooms(
+    db: AsyncSession, room_type_id: int, check_in: datetime, check_out: datetime
+) -> List[int]:
+    """Free rooms of the type for the stay, the one leaving the fewest unsellable gaps first.
+
+    Held rooms are left out, the guest's own holds included: a booking takes over
+    its hold through hold_id, and a second hold by type is for a second room.
+    """
+    first, end = night_range(check_in, check_out)
+    rows = await db.execute(_ROOM_NEIGHBOURS, {
+        "first": first, "end": end, "room_type_id": room_type_id,
+        "check_in": check_in, "check_out": check_out, "now": datetime.now(timezone.utc),
+    })
+    scored = []
+    for room_id, previous_night, next_night in rows:
+        before = (first - previous_night).days - 1 if previous_night else None
+        after = (next_night - end).days if next_night else None
+        scored.append((gap_score(before, after), room_id))
+    return [room_id for _, room_id in sorted(scored)]
+
+def type_room_ids(db: Session, room_type_id: int) -> List[int]:
+    """Active rooms of the type, in id order."""
+    return list(db.scalars(
+        select(Room.id)
+        .where(Room.room_type_id == room_type_id, Room.is_active == True)
+        .order_by(Room.id)
+    ))
+
+def load_stays(db: Session, room_ids: Sequence[int], today: date) -> List[Stay]:
+    """The active stays and holds on the rooms that are not over yet.
+
+    Type bookings whose first night is after today may move; everything else,
+    holds included, is fixed.
+    """
+    bookings = db.execute(
+        select(Booking.id, Booking.room_id, Booking.check_in_date, Booking.check_out_date,
+               Booking.status, Booking.room_pinned)
+        .where(
+            Booking.room_id.in_(room_ids),
+            Booking.status.in_(
+                (BookingStatus.PENDING, BookingStatus.CONFIRMED, BookingStatus.CHECKED_IN)
+            ),
+            Booking.check_out_date > datetime.combine(today, datetime.min.time(), HOTEL_TZ),
+        )
+    )
+    stays = []
+    for booking in bookings:
+        first, end = night_range(booking.check_in_date, booking.check_out_date)
+        movable = (
+            not booking.room_pinned
+            and booking.status in MOVABLE_BOOKING_STATUSES
+            and first > today
+        )
+        stays.append(Stay(booking.id, booking.room_id, first.toordinal(), end.toordinal(), movable))
+    holds = db.execute(
+        select(BookingHold.id, BookingHold.room_id, BookingHold.check_in_date,
+               BookingHold.check_out_date)
+        .where(
+            BookingHold.room_id.in_(room_ids),
+            BookingHold.expires_at > datetime.now(timezone.utc),
+        )
+    )
+    for hold in holds:
+        first, end = night_range(hold.check_in_date, hold.check_out_date)
+        # Negative ids keep holds apart from bookings; fixed stays never move
+        stays.append(Stay(-hold.id, hold.room_id, first.toordinal(), end.toordinal(), False))
+    return stays
+
+def apply_moves(db: Session, moves: Dict[int, int]):
+    """Move bookings to their new rooms, ledger included, in the caller's transaction."""
+    if not moves:
+        return
+    # Swaps pass through states where two stays share a room; check once at commit instead
+    db.execute(text("SET CONSTRAINTS bookings_no_overlap DEFERRED"))
+    db.execute(delete(RoomNight).where(RoomNight.booking_id.in_(list(moves))))
+    bookings = db.scalars(select(Booking).where(Booking.id.in_(list(moves)))).all()
+    ledger = []
+    for booking in bookings:
+        booking.room_id = moves[booking.id]
+        ledger.extend(
+            {"room_id": booking.room_id, "night": night, "booking_id": booking.id}
+            for night in stay_nights(booking.check_in_date, booking.check_out_date)
+        )
+    db.flush()
+    # An empty executemany would insert one row of defaults
+    if ledger:
+        db.execute(insert(RoomNight), ledger)
+
+def reoptimize_room_type(
+    db: Session, room_type_id: int, today: date, apply: bool = True
+) -> Optional[AssignmentPlan]:
+    """Plan (and unless apply=False, apply) a reassignment of one room type's movable stays.
+
+    Takes the type's assignment lock, then the locks of all its rooms, as type
+    bookings do: bookings and holds for a specific room take only the room's lock,
+    and must not land on a room while its stays are being moved.
+    """
+    db.execute(assignment_lock(room_type_id))
+    room_ids = type_room_ids(db, room_type_id)
+    if room_ids:
+        db.execute(room_locks(room_ids))
+    stays = load_stays(db, room_ids, today)
+    plan = plan_assignments(room_ids, stays)
+    if plan and apply:
+        apply_moves(db, plan.moves)
+    return plan
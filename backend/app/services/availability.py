@@ -0,0 +1,71 @@
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Optional, Sequence, Tuple
+from zoneinfo import ZoneInfo
+from sqlalchemy import and_, select, union
+from sqlalchemy.exc import IntegrityError
+from app.core.config import settings
+from app.models.booking import BookingStatus
+from app.models.inventory import BookingHold, RoomNight
+
+# Booking statuses that hold a room for their dates; keep in sync with the
+# bookings_no_overlap exclusion constraint
+ACTIVE_BOOKING_STATUSES = (BookingStatus.PENDING, BookingStatus.CONFIRMED, BookingStatus.CHECKED_IN)
+
+# Constraints whose violation means the room is already taken for the stay
+OVERBOOKING_CONSTRAINTS = ("bookings_no_overlap", "room_nights_pkey")
+
+HOTEL_TZ = ZoneInfo(settings.HOTEL_TIMEZONE)
+
+def hotel_date(value: datetime) -> date:
+    """Calendar date of a timestamp in the hotel's timezone (naive values are hotel-local)."""
+    if value.tzinfo is not None:
+        value = value.astimezone(HOTEL_TZ)
+    return value.date()
+
+def night_range(check_in: datetime, check_out: datetime) -> Tuple[date, date]:
+    """Half-open [first night, check-out day) range of nights covered by a stay."""
+    return hotel_date(check_in), hotel_date(check_out)
+
+def stay_nights(check_in: datetime, check_out: datetime) -> List[date]:
+    first, end = night_range(check_in, check_out)
+    return [first + timedelta(days=offset) for offset in range((end - first).days)]
+
+def nights_overlapping(check_in: datetime, check_out: datetime):
+    """Filter for ledger rows falling inside the [check_in, check_out) stay."""
+    first, end = night_range(check_in, check_out)
+    return and_(RoomNight.night >= first, RoomNight.night < end)
+
+def booked_room_ids(check_in: datetime, check_out: datetime):
+    """Select of the room ids with at least one night taken during the stay."""
+    return select(RoomNight.room_id).where(nights_overlapping(check_in, check_out)).distinct()
+
+def holds_overlapping(
+    check_in: datetime, check_out: datetime, except_user_id: Optional[int] = None
+):
+    """Filter for holds still in force that overlap the [check_in, check_out) stay,
+    optionally leaving out one user's own holds."""
+    condition = and_(
+        BookingHold.check_in_date < check_out,
+        BookingHold.check_out_date > check_in,
+        BookingHold.expires_at > datetime.now(timezone.utc),
+    )
+    if except_user_id is not None:
+        condition = and_(condition, BookingHold.user_id != except_user_id)
+    return condition
+
+def unavailable_room_ids(
+    check_in: datetime, check_out: datetime, room_ids: Optional[Sequence[int]] = None
+):
+    """Select of the room ids (among room_ids, if given) booked or held for at least one night
+    of the stay."""
+    booked = select(RoomNight.room_id).where(nights_overlapping(check_in, check_out))
+    held = select(BookingHold.room_id).where(holds_overlapping(check_in, check_out))
+    if room_ids is not None:
+        booked = booked.where(RoomNight.room_id.in_(room_ids))
+        held = held.where(BookingHold.room_id.in_(room_ids))
+    return union(booked, held)
+
+def is_overbooking(exc: IntegrityError) -> bool:
+    """True when an IntegrityError was raised by one of the no-overbooking constraints."""
+    message = str(exc.orig)
+    return any(name in message for name in OVERBOOKING_CONSTRAINTS)
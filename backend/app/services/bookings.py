@@ -0,0 +1,144 @@
+import asyncio
+import base64
+import binascii
+import logging
+from datetime import date, datetime, time, timedelta, timezone
+from typing import List, Optional, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import Row, Select, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.responses import ModelListResponse, construct_models
+from app.models.booking import Booking, BookingStatus, PaymentStatus
+from app.schemas.booking import BookingResponse
+from app.services.availability import HOTEL_TZ
+from app.services.dynamic_pricing import booking_nights_changed
+from app.services.inventory import sync_room_nights
+
+logger = logging.getLogger(__name__)
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Exactly the BookingResponse fields, so list rows can become responses without validation
+BOOKING_RESPONSE_COLUMNS = tuple(getattr(Booking, name) for name in BookingResponse.model_fields)
+
+def encode_cursor(row: Row) -> str:
+    raw = f"{row.created_at.isoformat()}|{row.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        created_at, booking_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(booking_id)
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def filter_bookings(
+    query: Select,
+    status: Optional[BookingStatus] = None,
+    payment_status: Optional[PaymentStatus] = None,
+    room_id: Optional[int] = None,
+    check_in_from: Optional[date] = None,
+    check_in_to: Optional[date] = None,
+) -> Select:
+    """Apply the booking list filters; check-in dates are inclusive hotel-local days."""
+    if status:
+        query = query.where(Booking.status == status)
+    if payment_status:
+        query = query.where(Booking.payment_status == payment_status)
+    if room_id:
+        query = query.where(Booking.room_id == room_id)
+    if check_in_from:
+        start = datetime.combine(check_in_from, time(), HOTEL_TZ)
+        query = query.where(Booking.check_in_date >= start)
+    if check_in_to:
+        end = datetime.combine(check_in_to + timedelta(days=1), time(), HOTEL_TZ)
+        query = query.where(Booking.check_in_date < end)
+    return query
+
+def booking_list_query() -> Select:
+    return select(*BOOKING_RESPONSE_COLUMNS)
+
+async def fetch_booking_page(
+    db: AsyncSession,
+    query: Select,
+    cursor: Optional[str],
+    limit: int,
+) -> Tuple[List[Row], Optional[str]]:
+    """Keyset page of booking rows from booking_list_query(), newest first, ordered by (created_at, id).
+
+    Returns the page and the cursor for the next one (None on the last page).
+    """
+    if cursor:
+        query = query.where(tuple_(Booking.created_at, Booking.id) < tuple_(*decode_cursor(cursor)))
+    query = query.order_by(Booking.created_at.desc(), Booking.id.desc()).limit(limit + 1)
+
+    rows = (await db.execute(query)).all()
+    next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return rows[:limit], next_cursor
+
+def booking_page_response(rows: List[Row], next_cursor: Optional[str]) -> ModelListResponse:
+    """Serialize a page of booking rows straight to JSON, skipping response_model validation."""
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return ModelListResponse(
+        construct_models(BookingResponse, (row._mapping for row in rows)), headers=headers
+    )
+
+def booking_etag(booking) -> str:
+    """Strong ETag naming the booking's current version."""
+    return f'"{booking.id}-{booking.version}"'
+
+def check_if_match(if_match: Optional[str], booking: Booking):
+    """Raise 412 unless If-Match is absent, * or names the booking's current version."""
+    if if_match is None:
+        return
+    tags = [tag.strip() for tag in if_match.split(",")]
+    # If-Match uses strong comparison, so weak tags never match
+    if "*" in tags or booking_etag(booking) in tags:
+        return
+    raise HTTPException(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        detail="Booking has changed since it was read; reload it and retry"
+    )
+
+async def expire_pending_bookings(db: AsyncSession, limit: int = 100) -> List[Booking]:
+    """Cancel unpaid bookings still pending PENDING_BOOKING_EXPIRY_HOURS after they
+    were made, freeing their nights. Returns the bookings cancelled; the caller commits.
+
+    Bookings another request is changing right now are skipped until the next run.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=settings.PENDING_BOOKING_EXPIRY_HOURS)
+    bookings = (await db.scalars(
+        select(Booking)
+        .where(
+            Booking.status == BookingStatus.PENDING,
+            Booking.payment_status == PaymentStatus.PENDING,
+            Booking.created_at < cutoff,
+        )
+        .order_by(Booking.created_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )).all()
+    for booking in bookings:
+        booking.status = BookingStatus.CANCELLED
+        await sync_room_nights(db, booking)
+    return bookings
+
+async def sweep_pending_bookings(interval: float):
+    """Expire stale pending bookings every `interval` seconds, so an abandoned
+    booking does not block its room for good."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with AsyncSessionLocal() as db:
+                expired = await expire_pending_bookings(db)
+                await db.commit()
+                for booking in expired:
+                    await booking_nights_changed(
+                        db, booking.room_id, booking.check_in_date, booking.check_out_date
+                    )
+            if expired:
+                logger.info("Cancelled %d expired pending bookings", len(expired))
+        except Exception:
+            logger.exception("Pending booking sweep failed; retrying on the next run")
@@ -0,0 +1,160 @@
+import asyncio
+import hashlib
+import json
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.catalog import CatalogVersion
+from app.models.room import Room, RoomType, room_response_options
+from app.models.service import Service
+from app.schemas.room import RoomResponse, RoomTypeResponse
+from app.schemas.service import ServiceResponse
+from app.services.rates import RateCalendar, load_rate_calendar
+
+logger = logging.getLogger(__name__)
+
+CATALOG_VERSION_ID = 1
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """Room types, active rooms and active services as served by the public read endpoints.
+
+    Also carries the nightly rate calendar that pricing reads.
+    """
+    version: int
+    etag: str
+    room_types: List[RoomTypeResponse]
+    rooms: List[RoomResponse]
+    services: List[ServiceResponse]
+    rooms_by_id: Dict[int, RoomResponse]
+    services_by_id: Dict[int, ServiceResponse]
+    rates: RateCalendar
+
+_snapshot: Optional[CatalogSnapshot] = None
+_reload_lock = asyncio.Lock()
+
+# Browsers and CDNs may reuse a catalog response briefly, then revalidate it in the background
+CATALOG_CACHE_CONTROL = (
+    f"public, max-age={settings.CATALOG_CACHE_MAX_AGE}, "
+    f"stale-while-revalidate={settings.CATALOG_STALE_WHILE_REVALIDATE}"
+)
+
+def catalog_version_bump():
+    """Statement that bumps the catalog version; run it in the transaction of every catalog write."""
+    statement = insert(CatalogVersion).values(id=CATALOG_VERSION_ID, version=1)
+    return statement.on_conflict_do_update(
+        index_elements=[CatalogVersion.id],
+        set_={"version": CatalogVersion.version + 1},
+    ).returning(CatalogVersion.version)
+
+async def bump_catalog_version(db: AsyncSession) -> int:
+    return (await db.execute(catalog_version_bump())).scalar_one()
+
+async def read_catalog_version(db: AsyncSession) -> int:
+    version = await db.scalar(
+        select(CatalogVersion.version).where(CatalogVersion.id == CATALOG_VERSION_ID)
+    )
+    return version or 0
+
+def catalog_etag(version: int, *groups) -> str:
+    """Strong ETag for the snapshot: the version plus a hash of its content.
+
+    The content hash keeps tags unique even if the counter is ever reset.
+    """
+    content = json.dumps(
+        [[item.model_dump(mode="json") for item in group] for group in groups], sort_keys=True
+    )
+    return f'"{version}-{hashlib.sha256(content.encode()).hexdigest()[:16]}"'
+
+async def load_catalog(db: AsyncSession) -> CatalogSnapshot:
+    # Version first: a write landing mid-load leaves the snapshot tagged older, never newer
+    version = await read_catalog_version(db)
+    room_types = (await db.scalars(select(RoomType).order_by(RoomType.id))).all()
+    rooms = (await db.scalars(
+        select(Room)
+        .options(*room_response_options())
+        .where(Room.is_active == True)
+        .order_by(Room.room_number)
+    )).unique().all()
+    services = (await db.scalars(
+        select(Service).where(Service.is_active == True).order_by(Service.id)
+    )).all()
+    rates = await load_rate_calendar(db, room_types)
+
+    room_type_responses = [RoomTypeResponse.model_validate(room_type) for room_type in room_types]
+    room_responses = [RoomResponse.model_validate(room) for room in rooms]
+    service_responses = [ServiceResponse.model_validate(service) for service in services]
+    return CatalogSnapshot(
+        version=version,
+        etag=catalog_etag(version, room_type_responses, room_responses, service_responses),
+        room_types=room_type_responses,
+        rooms=room_responses,
+        services=service_responses,
+        rooms_by_id={room.id: room for room in room_responses},
+        services_by_id={service.id: service for service in service_responses},
+        rates=rates,
+    )
+
+async def refresh_catalog(version: Optional[int] = None) -> CatalogSnapshot:
+    """Reload the snapshot from the database and swap it in.
+
+    With a version, skip the reload when another caller already installed it
+    while we waited for the lock.
+    """
+    global _snapshot
+    async with _reload_lock:
+        if _snapshot is not None and version is not None and _snapshot.version == version:
+            return _snapshot
+        async with AsyncSessionLocal() as db:
+            _snapshot = await load_catalog(db)
+        return _snapshot
+
+async def get_catalog() -> CatalogSnapshot:
+    """Dependency returning the current snapshot, loading it on first use."""
+    if _snapshot is None:
+        return await refresh_catalog()
+    return _snapshot
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    # If-None-Match uses weak comparison, so a W/ prefix added by a proxy still matches
+    return "*" in tags or any(tag.removeprefix("W/") == etag for tag in tags)
+
+def apply_catalog_caching(request: Request, response: Response, catalog: CatalogSnapshot):
+    """Set ETag and Cache-Control on a response built only from the catalog.
+
+    Raises a 304 when the client already holds the current representation.
+    """
+    headers = {"ETag": catalog.etag, "Cache-Control": CATALOG_CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), catalog.etag):
+        raise HTTPException(status_code=304, headers=headers)
+    response.headers.update(headers)
+
+async def get_cacheable_catalog(
+    request: Request,
+    response: Response,
+    catalog: CatalogSnapshot = Depends(get_catalog),
+) -> CatalogSnapshot:
+    """get_catalog for endpoints whose response depends on nothing but the catalog."""
+    apply_catalog_caching(request, response, catalog)
+    return catalog
+
+async def watch_catalog(interval: float):
+    """Poll the version counter and reload when another worker has changed the catalog."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with AsyncSessionLocal() as db:
+                version = await read_catalog_version(db)
+            if _snapshot is None or version != _snapshot.version:
+                await refresh_catalog(version)
+        except Exception:
+            logger.exception("Catalog refresh failed; serving version %s", _snapshot and _snapshot.version)
@@ -0,0 +1,222 @@
+import asyncio
+import bisect
+import logging
+from array import array
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional, Sequence, Tuple
+from fastapi import Depends
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.rate import PricingCurve
+from app.services.availability import HOTEL_TZ, night_range
+from app.services.catalog import CatalogSnapshot, get_catalog
+from app.services.rates import RateCalendar
+
+logger = logging.getLogger(__name__)
+
+Points = Sequence[Sequence[float]]
+
+# Room nights held per night and room type; the ledger only holds active bookings
+_TAKEN_NIGHTS = text("""
+    SELECT rn.night, r.room_type_id, count(*) AS taken
+    FROM room_nights rn
+    JOIN rooms r ON r.id = rn.room_id
+    WHERE rn.night >= :first AND rn.night < :end AND r.is_active
+    GROUP BY rn.night, r.room_type_id
+""")
+
+_TAKEN_NIGHTS_FOR_TYPE = text("""
+    SELECT rn.night, count(*) AS taken
+    FROM room_nights rn
+    JOIN rooms r ON r.id = rn.room_id
+    WHERE rn.night >= :first AND rn.night < :end AND r.is_active AND r.room_type_id = :room_type_id
+    GROUP BY rn.night
+""")
+
+def interpolate(points: Points, x: float) -> float:
+    """Piecewise-linear value of `points` ([[x, y], ...] sorted by x) at x, flat past either end."""
+    xs = [point[0] for point in points]
+    i = bisect.bisect_right(xs, x)
+    if i == 0:
+        return points[0][1]
+    if i == len(points):
+        return points[-1][1]
+    (x0, y0), (x1, y1) = points[i - 1], points[i]
+    return y0 + (y1 - y0) * (x - x0) / (x1 - x0)
+
+def validate_points(points: Points) -> Optional[str]:
+    """Why a curve is unusable, or None when it is fine."""
+    if not points:
+        return "A curve needs at least one point"
+    if any(len(point) != 2 for point in points):
+        return "Curve points are [x, multiplier] pairs"
+    if any(later[0] <= earlier[0] for earlier, later in zip(points, points[1:])):
+        return "Curve points must be sorted by strictly increasing x"
+    if any(point[1] <= 0 for point in points):
+        return "Curve multipliers must be positive"
+    return None
+
+class PriceGrid:
+    """Nightly rates for the next PRICE_GRID_DAYS nights of each room type with a pricing curve.
+
+    A night's rate is its calendar rate times the occupancy and lead-time multipliers,
+    computed when the grid is built or a booking changes the night's occupancy. Rates
+    and running totals are arrays indexed by night, so a stay's base amount is a
+    difference of two entries. Other room types, and nights outside the grid, are
+    priced from the rate calendar.
+    """
+
+    def __init__(
+        self,
+        start: date,
+        days: int,
+        catalog: CatalogSnapshot,
+        curves: Dict[int, Tuple[Points, Points]],
+        taken: Dict[int, Dict[date, int]],
+    ):
+        self.start = start
+        self.days = days
+        self.catalog_version = catalog.version
+        self.rates: RateCalendar = catalog.rates
+        self._curves = curves
+        self._room_types = {room_type.id: room_type for room_type in catalog.room_types}
+        self._room_types_of_rooms = {room.id: room.room_type_id for room in catalog.rooms}
+        self._rooms = defaultdict(int)
+        for room in catalog.rooms:
+            self._rooms[room.room_type_id] += 1
+        self._nightly: Dict[int, array] = {}
+        self._totals: Dict[int, array] = {}
+        for room_type_id in curves:
+            if room_type_id in self._room_types:
+                self._nightly[room_type_id] = array("d", [0.0]) * days
+                self._totals[room_type_id] = array("d", [0.0]) * (days + 1)
+                self._reprice(room_type_id, taken.get(room_type_id, {}), 0, days)
+
+    def _reprice(self, room_type_id: int, taken: Dict[date, int], lo: int, hi: int):
+        # Rates for offsets [lo, hi), then running totals from lo to the end of the grid
+        room_type = self._room_types[room_type_id]
+        occupancy_points, lead_time_points = self._curves[room_type_id]
+        rooms = self._rooms[room_type_id]
+        nightly, totals = self._nightly[room_type_id], self._totals[room_type_id]
+        for offset in range(lo, hi):
+            night = self.start + timedelta(days=offset)
+            occupancy = 100.0 * taken.get(night, 0) / rooms if rooms else 0.0
+            multiplier = (
+                interpolate(occupancy_points, occupancy) * interpolate(lead_time_points, offset)
+            )
+            nightly[offset] = round(self.rates.base_amount(room_type, night, 1) * multiplier, 2)
+        for offset in range(lo, self.days):
+            totals[offset + 1] = totals[offset] + nightly[offset]
+
+    def room_type_of_room(self, room_id: int) -> Optional[int]:
+        return self._room_types_of_rooms.get(room_id)
+
+    def covers(self, room_type_id: int) -> bool:
+        return room_type_id in self._nightly
+
+    def base_amount(self, room_type, first_night: date, nights: int) -> float:
+        """Sum of the nightly rates of `room_type` for `nights` nights from first_night."""
+        totals = self._totals.get(room_type.id)
+        if totals is None:
+            return self.rates.base_amount(room_type, first_night, nights)
+        first = (first_night - self.start).days
+        end = first + nights
+        lo, hi = min(max(first, 0), self.days), min(max(end, 0), self.days)
+        amount = totals[hi] - totals[lo]
+        if first < lo:
+            amount += self.rates.base_amount(room_type, first_night, min(end, 0) - first)
+        if end > hi:
+            outside = max(first, self.days)
+            amount += self.rates.base_amount(
+                room_type, self.start + timedelta(days=outside), end - outside
+            )
+        # Differences of large running totals carry float noise; amounts are in paise at most
+        return round(amount, 2)
+
+    def update_occupancy(self, room_type_id: int, first: date, end: date, taken: Dict[date, int]):
+        """Reprice the nights [first, end) of one room type from their current taken counts."""
+        if not self.covers(room_type_id):
+            return
+        lo = min(max((first - self.start).days, 0), self.days)
+        hi = min(max((end - self.start).days, 0), self.days)
+        if lo < hi:
+            self._reprice(room_type_id, taken, lo, hi)
+
+_grid: Optional[PriceGrid] = None
+_grid_lock = asyncio.Lock()
+
+async def load_price_grid(db: AsyncSession, catalog: CatalogSnapshot) -> PriceGrid:
+    start = datetime.now(HOTEL_TZ).date()
+    days = settings.PRICE_GRID_DAYS
+    curves = {
+        curve.room_type_id: (curve.occupancy_points, curve.lead_time_points)
+        for curve in await db.scalars(select(PricingCurve))
+    }
+    taken: Dict[int, Dict[date, int]] = defaultdict(dict)
+    if curves:
+        rows = await db.execute(
+            _TAKEN_NIGHTS, {"first": start, "end": start + timedelta(days=days)}
+        )
+        for night, room_type_id, count in rows:
+            taken[room_type_id][night] = count
+    return PriceGrid(start, days, catalog, curves, taken)
+
+def _is_current(grid: Optional[PriceGrid], catalog: CatalogSnapshot) -> bool:
+    return (
+        grid is not None
+        and grid.catalog_version == catalog.version
+        and grid.start == datetime.now(HOTEL_TZ).date()
+    )
+
+async def recompute_price_grid(
+    catalog: Optional[CatalogSnapshot] = None, force: bool = True
+) -> PriceGrid:
+    """Rebuild the grid from the curves and the ledger and swap it in.
+
+    Without force, skip the rebuild when another caller already built a current
+    grid while we waited for the lock.
+    """
+    global _grid
+    catalog = catalog or await get_catalog()
+    async with _grid_lock:
+        if not force and _is_current(_grid, catalog):
+            return _grid
+        async with AsyncSessionLocal() as db:
+            _grid = await load_price_grid(db, catalog)
+        return _grid
+
+async def get_price_grid(catalog: CatalogSnapshot = Depends(get_catalog)) -> PriceGrid:
+    """Dependency returning the grid, rebuilt first when the catalog or the hotel's date has
+    moved on."""
+    if _is_current(_grid, catalog):
+        return _grid
+    return await recompute_price_grid(catalog, force=False)
+
+async def booking_nights_changed(
+    db: AsyncSession, room_id: int, check_in: datetime, check_out: datetime
+):
+    """Reprice the nights of a committed booking change in this worker's grid.
+
+    Other workers pick the change up on their next scheduled recompute.
+    """
+    grid = _grid
+    room_type_id = grid and grid.room_type_of_room(room_id)
+    if not room_type_id or not grid.covers(room_type_id):
+        return
+    first, end = night_range(check_in, check_out)
+    rows = await db.execute(
+        _TAKEN_NIGHTS_FOR_TYPE, {"first": first, "end": end, "room_type_id": room_type_id}
+    )
+    grid.update_occupancy(room_type_id, first, end, {night: count for night, count in rows})
+
+async def watch_price_grid(interval: float):
+    """Recompute the grid on a schedule, picking up other workers' bookings and lead-time drift."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await recompute_price_grid()
+        except Exception:
+            logger.exception("Price grid recompute failed; serving the previous grid")
@@ -0,0 +1,340 @@
+import asyncio
+import logging
+import random
+import smtplib
+import time
+from collections import defaultdict, deque
+from datetime import datetime, timedelta, timezone
+from email.message import EmailMessage
+from typing import Deque, List, Optional, Sequence, Tuple
+from sqlalchemy import Row, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.outbox import EmailOutbox, EmailStatus
+from app.schemas.stats import EmailDeliveryStats, EmailOutboxStats
+from app.services.availability import night_range
+
+logger = logging.getLogger(__name__)
+
+# Seconds a claimed email stays reserved for the worker sending it; if that worker
+# dies mid-batch, the email is sent again once the lease runs out
+CLAIM_LEASE_SECONDS = 300
+
+# Window of the sent-per-second figure
+THROUGHPUT_WINDOW_SECONDS = 60.0
+
+def emails_enabled() -> bool:
+    return bool(settings.SMTP_HOST and settings.FROM_EMAIL)
+
+def confirmation_emails(bookings) -> List[EmailOutbox]:
+    """One confirmation per guest email address, listing that guest's bookings
+    (Booking rows or BookingResponses)."""
+    by_email = defaultdict(list)
+    for booking in bookings:
+        by_email[booking.guest_email].append(booking)
+    emails = []
+    for to_email, guest_bookings in by_email.items():
+        lines = [
+            f"Dear {guest_bookings[0].guest_name},",
+            "",
+            "Thank you for booking with Shivashray Hotel, Varanasi.",
+            "",
+        ]
+        for booking in guest_bookings:
+            first, end = night_range(booking.check_in_date, booking.check_out_date)
+            nights = (end - first).days
+            lines.append(
+                f"Booking #{booking.id}: {first:%d %b %Y} to {end:%d %b %Y}, "
+                f"{nights} night{'s' * (nights != 1)}, "
+                f"{booking.number_of_guests} guest{'s' * (booking.number_of_guests != 1)}, "
+                f"INR {booking.total_amount:,.2f} ({booking.status.value})"
+            )
+        lines += ["", "You can view or cancel your bookings from your account."]
+        if len(guest_bookings) == 1:
+            reference = f"#{guest_bookings[0].id}"
+        else:
+            reference = f"{len(guest_bookings)} rooms"
+        emails.append(EmailOutbox(
+            booking_id=guest_bookings[0].id,
+            to_email=to_email,
+            subject=f"Your Shivashray Hotel booking {reference}",
+            body="\n".join(lines),
+            status=EmailStatus.PENDING,
+            attempts=0,
+        ))
+    return emails
+
+def queue_confirmations(db: AsyncSession, bookings) -> int:
+    """Add confirmations of the bookings to the outbox in the caller's transaction.
+
+    Nothing is queued while SMTP is not configured. Returns the number queued; call
+    emails_queued after commit when it is not zero.
+    """
+    if not emails_enabled():
+        return 0
+    emails = confirmation_emails(bookings)
+    db.add_all(emails)
+    return len(emails)
+
+_queued = asyncio.Event()
+
+def emails_queued():
+    """Wake this worker's delivery loop for emails just committed."""
+    _queued.set()
+
+def build_message(email: Row) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = settings.FROM_EMAIL
+    message["To"] = email.to_email
+    message["Subject"] = email.subject
+    # Stable across retries, so a receiver can drop the copy of a resent email
+    message["Message-ID"] = f"<email-outbox-{email.id}@{settings.FROM_EMAIL.rpartition('@')[2]}>"
+    message.set_content(email.body)
+    return message
+
+class SmtpConnection:
+    """One SMTP session kept open across batches. Blocking; call it from a thread."""
+
+    def __init__(self):
+        self._smtp: Optional[smtplib.SMTP] = None
+
+    def _open(self) -> smtplib.SMTP:
+        smtp = smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT, timeout=settings.SMTP_TIMEOUT)
+        try:
+            smtp.ehlo()
+            if smtp.has_extn("starttls"):
+                smtp.starttls()
+                smtp.ehlo()
+            if settings.SMTP_USER:
+                smtp.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
+        except Exception:
+            smtp.close()
+            raise
+        return smtp
+
+    def _send_one(self, message: EmailMessage):
+        if self._smtp is not None:
+            try:
+                self._smtp.send_message(message)
+                return
+            except smtplib.SMTPServerDisconnected:
+                # The server closed the idle session; open a new one
+                self.close()
+        self._smtp = self._open()
+        self._smtp.send_message(message)
+
+    def send(self, messages: Sequence[EmailMessage]) -> List[Optional[Exception]]:
+        """Send in order. Returns None for each message sent, else the error it got."""
+        outcomes: List[Optional[Exception]] = []
+        for index, message in enumerate(messages):
+            try:
+                self._send_one(message)
+                outcomes.append(None)
+            except (smtplib.SMTPRecipientsRefused, smtplib.SMTPDataError) as exc:
+                # The server refused this message only; the session goes on
+                outcomes.append(exc)
+            except (OSError, smtplib.SMTPException) as exc:
+                # The session is unusable: the rest of the messages wait for their next attempt
+                self.close()
+                outcomes.extend([exc] * (len(messages) - index))
+                break
+        return outcomes
+
+    def close(self):
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except (OSError, smtplib.SMTPException):
+            self._smtp.close()
+        self._smtp = None
+
+class SmtpPool:
+    """SMTP sessions sending the messages of a batch in parallel, one thread each."""
+
+    def __init__(self, size: int):
+        self._connections = [SmtpConnection() for _ in range(max(size, 1))]
+
+    async def send(self, messages: Sequence[EmailMessage]) -> List[Optional[Exception]]:
+        size = len(self._connections)
+        chunks = [messages[offset::size] for offset in range(size)]
+        results = await asyncio.gather(*(
+            asyncio.to_thread(connection.send, chunk)
+            for connection, chunk in zip(self._connections, chunks)
+        ))
+        outcomes: List[Optional[Exception]] = [None] * len(messages)
+        for offset, chunk_outcomes in enumerate(results):
+            outcomes[offset::size] = chunk_outcomes
+        return outcomes
+
+    def close(self):
+        for connection in self._connections:
+            connection.close()
+
+def is_permanent(exc: Exception) -> bool:
+    """Whether the server rejected the message itself (5xx), so resending cannot help."""
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in exc.recipients.values())
+    return isinstance(exc, smtplib.SMTPDataError) and exc.smtp_code >= 500
+
+def retry_delay(attempts: int) -> timedelta:
+    """Exponential backoff after the given number of failed attempts, with jitter so
+    emails failed together do not all come back at once."""
+    seconds = min(
+        settings.EMAIL_RETRY_SECONDS * 2 ** (attempts - 1), settings.EMAIL_RETRY_MAX_SECONDS
+    )
+    return timedelta(seconds=seconds * random.uniform(0.8, 1.2))
+
+class DeliveryStats:
+    """This worker's delivery counters since it started."""
+
+    def __init__(self):
+        self.sent = self.retried = self.failed = self.batches = 0
+        self.send_seconds = 0.0
+        self._started = time.monotonic()
+        self._recent: Deque[Tuple[float, int]] = deque()
+
+    def record(self, sent: int, retried: int, failed: int, seconds: float):
+        self.sent += sent
+        self.retried += retried
+        self.failed += failed
+        self.batches += 1
+        self.send_seconds += seconds
+        self._recent.append((time.monotonic(), sent))
+
+    def sent_per_second(self) -> float:
+        now = time.monotonic()
+        while self._recent and self._recent[0][0] < now - THROUGHPUT_WINDOW_SECONDS:
+            self._recent.popleft()
+        window = min(THROUGHPUT_WINDOW_SECONDS, now - self._started)
+        return sum(sent for _, sent in self._recent) / window if window > 0 else 0.0
+
+    def snapshot(self) -> EmailDeliveryStats:
+        return EmailDeliveryStats(
+            sent=self.sent,
+            retried=self.retried,
+            failed=self.failed,
+            batches=self.batches,
+            sent_per_second=self.sent_per_second(),
+            sent_per_send_second=self.sent / self.send_seconds if self.send_seconds else 0.0,
+        )
+
+delivery_stats = DeliveryStats()
+
+async def claim_emails(db: AsyncSession, limit: int) -> List[Row]:
+    """Lease up to `limit` due emails to this worker, counting the attempt.
+
+    SKIP LOCKED lets workers claim disjoint batches at the same time.
+    """
+    now = datetime.now(timezone.utc)
+    due = (
+        select(EmailOutbox.id)
+        .where(EmailOutbox.status == EmailStatus.PENDING, EmailOutbox.next_attempt_at <= now)
+        .order_by(EmailOutbox.next_attempt_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    result = await db.execute(
+        update(EmailOutbox)
+        .where(EmailOutbox.id.in_(due))
+        .values(
+            attempts=EmailOutbox.attempts + 1,
+            next_attempt_at=now + timedelta(seconds=CLAIM_LEASE_SECONDS),
+        )
+        .returning(
+            EmailOutbox.id,
+            EmailOutbox.to_email,
+            EmailOutbox.subject,
+            EmailOutbox.body,
+            EmailOutbox.attempts,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return result.all()
+
+async def deliver_batch(pool: SmtpPool, batch_size: int) -> int:
+    """Claim, send and record one batch. Returns the number of emails claimed.
+
+    Claims commit before sending and outcomes are written after, so no transaction
+    stays open while SMTP is slow.
+    """
+    async with AsyncSessionLocal() as db:
+        claimed = await claim_emails(db, batch_size)
+        await db.commit()
+    if not claimed:
+        return 0
+
+    started = time.perf_counter()
+    outcomes = await pool.send([build_message(email) for email in claimed])
+    elapsed = time.perf_counter() - started
+
+    now = datetime.now(timezone.utc)
+    changes, sent, retried, failed = [], 0, 0, 0
+    for email, error in zip(claimed, outcomes):
+        change = {
+            "id": email.id,
+            "status": EmailStatus.PENDING,
+            "sent_at": None,
+            "next_attempt_at": now,
+            "last_error": None,
+        }
+        if error is None:
+            change.update(status=EmailStatus.SENT, sent_at=now)
+            sent += 1
+        elif is_permanent(error) or email.attempts >= settings.EMAIL_MAX_ATTEMPTS:
+            change.update(status=EmailStatus.FAILED, last_error=str(error))
+            failed += 1
+        else:
+            change.update(next_attempt_at=now + retry_delay(email.attempts), last_error=str(error))
+            retried += 1
+        changes.append(change)
+    async with AsyncSessionLocal() as db:
+        await db.execute(update(EmailOutbox), changes)
+        await db.commit()
+
+    delivery_stats.record(sent, retried, failed, elapsed)
+    if retried or failed:
+        logger.warning("Email batch: %d sent, %d to retry, %d failed", sent, retried, failed)
+    return len(claimed)
+
+async def deliver_emails(interval: float):
+    """Send outbox emails in batches over pooled SMTP sessions.
+
+    Runs as soon as this worker queues an email, straight away again while full
+    batches keep coming, and at least every `interval` seconds for emails queued by
+    other workers or due for a retry.
+    """
+    pool = SmtpPool(settings.SMTP_POOL_SIZE)
+    try:
+        while True:
+            _queued.clear()
+            try:
+                claimed = await deliver_batch(pool, settings.EMAIL_BATCH_SIZE)
+            except Exception:
+                logger.exception("Email delivery failed; retrying on the next run")
+                claimed = 0
+            if claimed >= settings.EMAIL_BATCH_SIZE:
+                continue
+            try:
+                await asyncio.wait_for(_queued.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        await asyncio.to_thread(pool.close)
+
+async def outbox_stats(db: AsyncSession) -> EmailOutboxStats:
+    pending, failed, oldest = (await db.execute(
+        select(
+            func.count().filter(EmailOutbox.status == EmailStatus.PENDING),
+            func.count().filter(EmailOutbox.status == EmailStatus.FAILED),
+            func.min(EmailOutbox.created_at).filter(EmailOutbox.status == EmailStatus.PENDING),
+        )
+    )).one()
+    oldest_pending = (datetime.now(timezone.utc) - oldest).total_seconds() if oldest else None
+    return EmailOutboxStats(
+        pending=pending,
+        failed=failed,
+        oldest_pending_seconds=oldest_pending,
+        worker=delivery_stats.snapshot(),
+    )
@@ -0,0 +1,59 @@
+import csv
+import enum
+import io
+from typing import AsyncIterator
+import orjson
+from sqlalchemy import Select
+from app.core.database import AsyncSessionLocal
+from app.models.booking import Booking
+from app.services.bookings import BOOKING_RESPONSE_COLUMNS
+
+# Rows fetched per round trip from the server-side cursor; memory use is bounded by this
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_FIELDS = [column.key for column in BOOKING_RESPONSE_COLUMNS]
+
+# Spreadsheets read text starting with these as a formula
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+def _csv_value(value):
+    if isinstance(value, enum.Enum):
+        value = value.value
+    if value is None:
+        return ""
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        # Guest-entered text is shown as typed instead of being evaluated
+        return "'" + value
+    return value
+
+async def _stream_partitions(query: Select):
+    # The request's own session is closed before the body streams, so the export uses its own
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(
+            query.order_by(Booking.created_at, Booking.id)
+            .execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        async for rows in result.partitions():
+            yield rows
+
+async def stream_bookings_csv(query: Select) -> AsyncIterator[bytes]:
+    """CSV body for a booking_list_query(), one chunk per fetched batch."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    async for rows in _stream_partitions(query):
+        writer.writerows([_csv_value(value) for value in row] for row in rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+async def stream_bookings_ndjson(query: Select) -> AsyncIterator[bytes]:
+    """Newline-delimited JSON body for a booking_list_query(), one chunk per fetched batch."""
+    async for rows in _stream_partitions(query):
+        yield b"".join(
+            orjson.dumps(dict(row._mapping), option=orjson.OPT_UTC_Z) + b"\n" for row in rows
+        )
@@ -0,0 +1,276 @@
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import bindparam, insert, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.models.booking import Booking, BookingStatus, PaymentStatus
+from app.models.inventory import RoomNight
+from app.schemas.booking import BookingCreate, BookingResponse, BulkBookingResult
+from app.services.assignment import SHORT_GAP_NIGHTS, RoomCalendar, assignment_lock, best_room
+from app.services.availability import is_overbooking, night_range, stay_nights
+from app.services.bookings import BOOKING_RESPONSE_COLUMNS
+from app.services.catalog import CatalogSnapshot
+from app.services.holds import release_own_holds, room_locks
+from app.services.metrics import bookings_inserted
+from app.services.pricing import NightlyRates, price_stay
+
+# Most stays one bulk request may book
+BULK_BOOKING_MAX_ITEMS = 50
+
+# Nights loaded either side of the group's stays, so best fit sees short gaps at the edges
+CALENDAR_MARGIN_NIGHTS = SHORT_GAP_NIGHTS + 1
+
+# Nights taken on the candidate rooms between :first and :end, as [first, end) runs
+# of hotel dates: ledger nights, and other guests' holds still in force
+_TAKEN_STAYS = text("""
+    SELECT room_id, night AS first, night + 1 AS end_night
+    FROM room_nights
+    WHERE room_id IN :room_ids AND night >= :first AND night < :end
+    UNION ALL
+    SELECT room_id, first, end_night FROM (
+        SELECT room_id,
+               (check_in_date AT TIME ZONE :tz)::date AS first,
+               (check_out_date AT TIME ZONE :tz)::date AS end_night
+        FROM booking_holds
+        WHERE room_id IN :room_ids AND expires_at > :now AND user_id <> :user_id
+    ) AS holds
+    WHERE first < :end AND end_night > :first
+""").bindparams(bindparam("room_ids", expanding=True))
+
+@dataclass
+class GroupStay:
+    index: int
+    request: BookingCreate
+    room_type: object  # RoomTypeResponse from the catalog
+    first: int  # Day ordinal of the first night
+    end: int  # Day ordinal of the check-out day
+    room_id: Optional[int] = None  # The requested room, then the one booked
+
+def _stay_error(catalog: CatalogSnapshot, request: BookingCreate) -> Optional[Tuple[int, str]]:
+    """(status code, detail) POST /bookings would answer for a stay it cannot book, else None."""
+    if request.hold_id is not None:
+        return 400, "Book held rooms through POST /bookings"
+    if (request.room_id is None) == (request.room_type_id is None):
+        return 400, "Give either room_id or room_type_id"
+    if request.check_out_date <= request.check_in_date:
+        return 400, "Check-out date must be after check-in date"
+    first, end = night_range(request.check_in_date, request.check_out_date)
+    if end <= first:
+        return 400, "Stay must include at least one night"
+    if request.check_in_date < datetime.now(request.check_in_date.tzinfo):
+        return 400, "Check-in date cannot be in the past"
+    if request.room_id is not None and request.room_id not in catalog.rooms_by_id:
+        return 404, "Room not found"
+    room_type_ids = {room_type.id for room_type in catalog.room_types}
+    if request.room_type_id is not None and request.room_type_id not in room_type_ids:
+        return 404, "Room type not found"
+    return None
+
+def _calendars(
+    room_ids: Sequence[int], taken: Sequence[Tuple[int, date, date]]
+) -> Dict[int, RoomCalendar]:
+    """Calendars of the rooms from taken [first, end) runs, merging runs that touch."""
+    runs = defaultdict(list)
+    for room_id, first, end in taken:
+        runs[room_id].append((first.toordinal(), end.toordinal()))
+    calendars = {}
+    for room_id in room_ids:
+        calendar = calendars[room_id] = RoomCalendar()
+        merged: List[List[int]] = []
+        for first, end in sorted(runs[room_id]):
+            if merged and first <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([first, end])
+        for first, end in merged:
+            calendar.add(first, end)
+    return calendars
+
+async def book_group(
+    db: AsyncSession,
+    user_id: int,
+    requests: Sequence[BookingCreate],
+    catalog: CatalogSnapshot,
+    rates: NightlyRates,
+    all_or_nothing: bool,
+) -> Tuple[List[BulkBookingResult], List[int]]:
+    """Book many stays in the caller's transaction. Returns per-stay results in request
+    order and the ids of the user's holds the bookings took over.
+
+    Rooms of the stays (and every room of the types asked for) are locked, their
+    taken nights and holds are read in one query, and the stays are placed in memory:
+    given rooms first, then stays by room type, best fit, earliest and longest first,
+    so stays of the group cannot collide with each other either. Accepted stays are
+    inserted with one executemany each for bookings and ledger nights. With
+    all_or_nothing, one failed stay leaves everything unbooked.
+    """
+    room_types = {room_type.id: room_type for room_type in catalog.room_types}
+    results: Dict[int, BulkBookingResult] = {}
+    stays: List[GroupStay] = []
+    for index, request in enumerate(requests):
+        error = _stay_error(catalog, request)
+        if error:
+            results[index] = BulkBookingResult(index=index, status_code=error[0], detail=error[1])
+            continue
+        room_type_id = request.room_type_id or catalog.rooms_by_id[request.room_id].room_type_id
+        first, end = night_range(request.check_in_date, request.check_out_date)
+        stays.append(GroupStay(
+            index,
+            request,
+            room_types[room_type_id],
+            first.toordinal(),
+            end.toordinal(),
+            request.room_id,
+        ))
+    if not stays or (results and all_or_nothing):
+        return _drop_group(requests, results), []
+
+    # Same lock order as single bookings: room types, then rooms
+    type_ids = sorted({stay.room_type.id for stay in stays if stay.room_id is None})
+    for room_type_id in type_ids:
+        await db.execute(assignment_lock(room_type_id))
+    rooms_of_type = defaultdict(list)
+    for room in catalog.rooms:
+        if room.room_type_id in type_ids:
+            rooms_of_type[room.room_type_id].append(room.id)
+    room_ids = sorted(
+        {stay.room_id for stay in stays if stay.room_id is not None}
+        | {room_id for ids in rooms_of_type.values() for room_id in ids}
+    )
+    await db.execute(room_locks(room_ids))
+
+    first = date.fromordinal(min(stay.first for stay in stays) - CALENDAR_MARGIN_NIGHTS)
+    end = date.fromordinal(max(stay.end for stay in stays) + CALENDAR_MARGIN_NIGHTS)
+    taken = await db.execute(_TAKEN_STAYS, {
+        "room_ids": room_ids,
+        "first": first,
+        "end": end,
+        "tz": settings.HOTEL_TIMEZONE,
+        "now": datetime.now(timezone.utc),
+        "user_id": user_id,
+    })
+    calendars = _calendars(room_ids, taken.all())
+
+    pinned = [stay for stay in stays if stay.room_id is not None]
+    by_type = sorted(
+        (stay for stay in stays if stay.room_id is None), key=lambda s: (s.first, s.first - s.end)
+    )
+    placed = []
+    for stay in pinned + by_type:
+        if stay.room_id is None:
+            stay.room_id = best_room(
+                {room_id: calendars[room_id] for room_id in rooms_of_type[stay.room_type.id]},
+                stay.first,
+                stay.end,
+            )
+        elif calendars[stay.room_id].fit(stay.first, stay.end) is None:
+            stay.room_id = None
+        if stay.room_id is None:
+            results[stay.index] = BulkBookingResult(
+                index=stay.index,
+                status_code=409,
+                detail="Room is not available for the selected dates",
+            )
+            continue
+        calendars[stay.room_id].add(stay.first, stay.end)
+        placed.append(stay)
+    if not placed or (results and all_or_nothing):
+        return _drop_group(requests, results), []
+
+    placed.sort(key=lambda stay: stay.index)
+    rows = []
+    for stay in placed:
+        request = stay.request
+        adults = request.number_of_adults or request.number_of_guests
+        children = request.number_of_children or 0
+        price = price_stay(
+            stay.room_type, rates, request.check_in_date, request.check_out_date, adults, children
+        )
+        rows.append({
+            "user_id": user_id,
+            "room_id": stay.room_id,
+            "room_pinned": request.room_id is not None,
+            "check_in_date": request.check_in_date,
+            "check_out_date": request.check_out_date,
+            "number_of_guests": request.number_of_guests,
+            "number_of_adults": adults,
+            "number_of_children": children,
+            "total_amount": price.total_amount,
+            "status": BookingStatus.PENDING,
+            "payment_status": PaymentStatus.PENDING,
+            "guest_name": request.guest_name,
+            "guest_email": request.guest_email,
+            "guest_phone": request.guest_phone,
+            "special_requests": request.special_requests,
+        })
+    try:
+        async with db.begin_nested():
+            inserted = (await db.execute(
+                insert(Booking).returning(*BOOKING_RESPONSE_COLUMNS, sort_by_parameter_order=True),
+                rows,
+            )).all()
+            ledger = [
+                {"room_id": booking.room_id, "night": night, "booking_id": booking.id}
+                for booking in inserted
+                for night in stay_nights(booking.check_in_date, booking.check_out_date)
+            ]
+            # An empty executemany would insert one row of defaults
+            if ledger:
+                await db.execute(insert(RoomNight), ledger)
+    except IntegrityError as exc:
+        # Only writers that skip the room locks (e.g. an admin reactivating a booking) get here
+        if not is_overbooking(exc):
+            raise
+        for stay in placed:
+            results[stay.index] = BulkBookingResult(
+                index=stay.index,
+                status_code=409,
+                detail="A room was taken while booking the group; retry",
+            )
+        return _drop_group(requests, results), []
+
+    # Bulk inserts bypass the mapper events that keep daily_metrics current
+    bookings = [dict(booking._mapping) for booking in inserted]
+    await db.run_sync(lambda session: bookings_inserted(session.connection(), bookings))
+    released = await release_own_holds(
+        db,
+        user_id,
+        [(booking.room_id, booking.check_in_date, booking.check_out_date) for booking in inserted],
+    )
+    for stay, booking in zip(placed, bookings):
+        results[stay.index] = BulkBookingResult(
+            index=stay.index, status_code=201, booking=BookingResponse.model_validate(booking)
+        )
+    return [results[index] for index in range(len(requests))], released
+
+def _drop_group(
+    requests: Sequence[BookingCreate], results: Dict[int, BulkBookingResult]
+) -> List[BulkBookingResult]:
+    """Results for a group booking nothing: failed stays keep their error, the rest get 424."""
+    return [
+        results.get(index) or BulkBookingResult(
+            index=index,
+            status_code=424,
+            detail="Not booked because another stay in the group failed",
+        )
+        for index in range(len(requests))
+    ]
+
+def repricing_spans(
+    catalog: CatalogSnapshot, bookings: Sequence[BookingResponse]
+) -> List[Tuple[int, datetime, datetime]]:
+    """One (room id, earliest check-in, latest check-out) per room type booked, for
+    booking_nights_changed."""
+    spans: Dict[int, Tuple[int, datetime, datetime]] = {}
+    for booking in bookings:
+        room_type_id = catalog.rooms_by_id[booking.room_id].room_type_id
+        room_id, check_in, check_out = spans.get(
+            room_type_id, (booking.room_id, booking.check_in_date, booking.check_out_date)
+        )
+        spans[room_type_id] = (
+            room_id, min(check_in, booking.check_in_date), max(check_out, booking.check_out_date)
+        )
+    return list(spans.values())
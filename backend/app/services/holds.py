@@ -0,0 +1,198 @@
+import asyncio
+import heapq
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import and_, delete, exists, func, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.inventory import BookingHold, RoomNight
+from app.services.availability import holds_overlapping, nights_overlapping
+
+logger = logging.getLogger(__name__)
+
+# First key of the advisory locks taken on a room before holding or booking it
+ROOM_LOCK_NAMESPACE = 20_002
+
+def room_lock(room_id: int):
+    """Statement taking the room's lock until the transaction ends.
+
+    Holds and bookings check each other's tables before writing their own, so
+    without a common lock both could pass their check and commit.
+    """
+    return text("SELECT pg_advisory_xact_lock(:namespace, :room_id)").bindparams(
+        namespace=ROOM_LOCK_NAMESPACE, room_id=room_id
+    )
+
+def room_locks(room_ids: Sequence[int]):
+    """Statement taking the locks of many rooms in id order, as room_lock would one by one."""
+    return text(
+        "SELECT pg_advisory_xact_lock(:namespace, room_id) "
+        "FROM (SELECT unnest(CAST(:room_ids AS integer[])) AS room_id ORDER BY 1) AS rooms"
+    ).bindparams(namespace=ROOM_LOCK_NAMESPACE, room_ids=sorted(room_ids))
+
+class HoldTimers:
+    """Expiry times of the holds this worker placed, earliest first.
+
+    A heap with lazy deletion: released or consumed holds leave `_expiry`, and
+    their heap entries are skipped when they reach the top. `changed` is set
+    when a hold expiring before all others is scheduled, so the sweep can re-arm.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[datetime, int]] = []
+        self._expiry: Dict[int, datetime] = {}
+        self.changed = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._expiry)
+
+    def schedule(self, hold_id: int, expires_at: datetime):
+        self._expiry[hold_id] = expires_at
+        heapq.heappush(self._heap, (expires_at, hold_id))
+        if self._heap[0] == (expires_at, hold_id):
+            self.changed.set()
+
+    def cancel(self, hold_id: int):
+        self._expiry.pop(hold_id, None)
+
+    def next_expiry(self) -> Optional[datetime]:
+        while self._heap and self._expiry.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: datetime) -> List[int]:
+        """Ids of the holds expired by `now`, which stop being tracked."""
+        due = []
+        while (expires_at := self.next_expiry()) is not None and expires_at <= now:
+            _, hold_id = heapq.heappop(self._heap)
+            del self._expiry[hold_id]
+            due.append(hold_id)
+        return due
+
+_timers = HoldTimers()
+
+def hold_expiry() -> datetime:
+    return datetime.now(timezone.utc) + timedelta(minutes=settings.BOOKING_HOLD_MINUTES)
+
+async def active_hold_count(db: AsyncSession, user_id: int) -> int:
+    return await db.scalar(
+        select(func.count()).select_from(BookingHold).where(
+            BookingHold.user_id == user_id, BookingHold.expires_at > datetime.now(timezone.utc)
+        )
+    )
+
+async def place_hold(
+    db: AsyncSession,
+    user_id: int,
+    room_id: int,
+    room_pinned: bool,
+    check_in: datetime,
+    check_out: datetime,
+) -> Optional[BookingHold]:
+    """Hold the room for the stay unless it is booked, or held by another guest, for any of
+    its nights.
+
+    The guest's own overlapping holds on the room are replaced, so holding again
+    extends the hold. Returns None when the room is taken. The caller commits,
+    then calls hold_placed.
+    """
+    await db.execute(room_lock(room_id))
+    taken = await db.scalar(select(
+        exists().where(RoomNight.room_id == room_id, nights_overlapping(check_in, check_out))
+        | exists().where(
+            BookingHold.room_id == room_id, holds_overlapping(check_in, check_out, user_id)
+        )
+    ))
+    if taken:
+        return None
+    await release_own_holds(db, user_id, [(room_id, check_in, check_out)])
+    hold = BookingHold(
+        user_id=user_id,
+        room_id=room_id,
+        room_pinned=room_pinned,
+        check_in_date=check_in,
+        check_out_date=check_out,
+        expires_at=hold_expiry(),
+    )
+    db.add(hold)
+    await db.flush()
+    return hold
+
+async def held_by_others(
+    db: AsyncSession, user_id: int, room_id: int, check_in: datetime, check_out: datetime
+) -> bool:
+    """Whether another guest holds the room for any night of the stay; takes the room's lock
+    first."""
+    await db.execute(room_lock(room_id))
+    return await db.scalar(select(
+        exists().where(
+            BookingHold.room_id == room_id, holds_overlapping(check_in, check_out, user_id)
+        )
+    ))
+
+async def release_own_holds(
+    db: AsyncSession, user_id: int, stays: Sequence[Tuple[int, datetime, datetime]]
+) -> List[int]:
+    """Delete the guest's holds overlapping any of the (room id, check-in, check-out)
+    stays, e.g. once they are booked. Returns their ids."""
+    result = await db.execute(
+        delete(BookingHold)
+        .where(
+            BookingHold.user_id == user_id,
+            or_(*(
+                and_(
+                    BookingHold.room_id == room_id,
+                    BookingHold.check_in_date < check_out,
+                    BookingHold.check_out_date > check_in,
+                )
+                for room_id, check_in, check_out in stays
+            )),
+        )
+        .returning(BookingHold.id)
+    )
+    return list(result.scalars())
+
+def hold_placed(hold: BookingHold):
+    """Track a committed hold so this worker's sweep runs when it expires."""
+    _timers.schedule(hold.id, hold.expires_at)
+
+def holds_released(hold_ids: List[int]):
+    for hold_id in hold_ids:
+        _timers.cancel(hold_id)
+
+async def expire_holds(db: AsyncSession) -> int:
+    """Delete every expired hold, whichever worker placed it. Returns the number deleted."""
+    result = await db.execute(
+        delete(BookingHold).where(BookingHold.expires_at <= datetime.now(timezone.utc))
+    )
+    return result.rowcount
+
+async def sweep_holds(interval: float):
+    """Delete expired holds as soon as one of this worker's holds expires, and at least
+    every `interval` seconds for holds placed by other (or stopped) workers.
+
+    Availability ignores expired holds either way; the sweep only keeps the table small.
+    """
+    while True:
+        _timers.changed.clear()
+        timeout = interval
+        next_expiry = _timers.next_expiry()
+        if next_expiry is not None:
+            remaining = (next_expiry - datetime.now(timezone.utc)).total_seconds()
+            timeout = min(interval, max(remaining, 0.0))
+        try:
+            await asyncio.wait_for(_timers.changed.wait(), timeout)
+            continue
+        except asyncio.TimeoutError:
+            pass
+        _timers.pop_due(datetime.now(timezone.utc))
+        try:
+            async with AsyncSessionLocal() as db:
+                expired = await expire_holds(db)
+                await db.commit()
+            if expired:
+                logger.info("Released %d expired booking holds", expired)
+        except Exception:
+            logger.exception("Booking hold sweep failed; retrying on the next run")
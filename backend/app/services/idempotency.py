@@ -0,0 +1,191 @@
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import NamedTuple, Optional, Tuple
+import orjson
+from fastapi import HTTPException, Response, status
+from pydantic import BaseModel
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.idempotency import IdempotencyKey
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+# Longest key accepted; clients normally send a UUID
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
+
+class StoredResponse(NamedTuple):
+    request_hash: bytes
+    status_code: int
+    body: bytes
+
+class ResponseCache:
+    """Bounded LRU of stored responses keyed by (user id, key); entries expire after `ttl` seconds.
+
+    Stored responses never change, so a hit is always safe to replay; the table
+    stays the source of truth for other workers and after a restart.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple[int, str], Tuple[float, StoredResponse]]" = OrderedDict()
+
+    def get(self, user_id: int, key: str) -> Optional[StoredResponse]:
+        entry = self._entries.get((user_id, key))
+        if entry is None:
+            return None
+        expires_at, stored = entry
+        if expires_at <= time.monotonic():
+            del self._entries[(user_id, key)]
+            return None
+        self._entries.move_to_end((user_id, key))
+        return stored
+
+    def put(self, user_id: int, key: str, stored: StoredResponse):
+        if self.maxsize <= 0:
+            return
+        self._entries[(user_id, key)] = (time.monotonic() + self.ttl, stored)
+        self._entries.move_to_end((user_id, key))
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+response_cache = ResponseCache(
+    settings.IDEMPOTENCY_CACHE_SIZE, settings.IDEMPOTENCY_KEY_RETENTION_HOURS * 3600
+)
+
+def request_hash(request: BaseModel) -> bytes:
+    """Fingerprint of a request body, so a key reused for a different request is caught."""
+    return hashlib.sha256(
+        orjson.dumps(request.model_dump(mode="json"), option=orjson.OPT_SORT_KEYS)
+    ).digest()
+
+def check_idempotency_key(key: str):
+    if not key or len(key) > MAX_IDEMPOTENCY_KEY_LENGTH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{IDEMPOTENCY_KEY_HEADER} must be 1 to {MAX_IDEMPOTENCY_KEY_LENGTH} characters"
+        )
+
+async def find_response(db: AsyncSession, user_id: int, key: str) -> Optional[StoredResponse]:
+    """The stored response for the key, from this worker's cache or the table."""
+    stored = response_cache.get(user_id, key)
+    if stored is not None:
+        return stored
+    row = (await db.execute(
+        select(
+            IdempotencyKey.request_hash, IdempotencyKey.status_code, IdempotencyKey.response_body
+        )
+        .where(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+    )).first()
+    if row is None:
+        return None
+    stored = StoredResponse(*row)
+    response_cache.put(user_id, key, stored)
+    return stored
+
+def replay(stored: StoredResponse, fingerprint: bytes) -> Response:
+    if stored.request_hash != fingerprint:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"{IDEMPOTENCY_KEY_HEADER} was already used for a different request"
+        )
+    return Response(
+        content=stored.body,
+        status_code=stored.status_code,
+        media_type="application/json",
+        headers={REPLAYED_HEADER: "true"},
+    )
+
+async def claim_key(
+    db: AsyncSession, user_id: int, key: str, fingerprint: bytes
+) -> Optional[IdempotencyKey]:
+    """Insert the key's row in the caller's transaction, before any other work.
+
+    A retry racing the first request waits on the row until that request commits
+    (its response is then stored) or rolls back (the key is free again). Returns
+    None when the key turned out to be taken; look the response up again.
+    """
+    claim = IdempotencyKey(user_id=user_id, key=key, request_hash=fingerprint)
+    try:
+        async with db.begin_nested():
+            db.add(claim)
+            await db.flush()
+    except IntegrityError:
+        return None
+    return claim
+
+async def idempotent_replay(
+    db: AsyncSession, user_id: int, key: str, request: BaseModel
+) -> Tuple[Optional[Response], Optional[IdempotencyKey]]:
+    """(replayed response, None) for a key seen before, else (None, claimed row)."""
+    check_idempotency_key(key)
+    fingerprint = request_hash(request)
+    stored = await find_response(db, user_id, key)
+    if stored is None:
+        claim = await claim_key(db, user_id, key, fingerprint)
+        if claim is not None:
+            return None, claim
+        stored = await find_response(db, user_id, key)
+        if stored is None:
+            # Taken and purged in between; only possible for keys at the end of retention
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"{IDEMPOTENCY_KEY_HEADER} is being purged; retry with a new key"
+            )
+    return replay(stored, fingerprint), None
+
+async def store_response(
+    db: AsyncSession, claim: IdempotencyKey, status_code: int, body: BaseModel
+) -> Response:
+    """Record the response with the claimed key, to commit with the work it describes.
+
+    Returns the response to send, byte for byte what a replay will send.
+    """
+    claim.status_code = status_code
+    claim.response_body = body.model_dump_json().encode()
+    await db.flush()
+    return Response(
+        content=claim.response_body, status_code=status_code, media_type="application/json"
+    )
+
+def response_committed(claim: IdempotencyKey):
+    response_cache.put(
+        claim.user_id,
+        claim.key,
+        StoredResponse(claim.request_hash, claim.status_code, claim.response_body),
+    )
+
+async def purge_idempotency_keys(db: AsyncSession) -> int:
+    """Delete keys older than the retention window. Returns the number deleted."""
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=settings.IDEMPOTENCY_KEY_RETENTION_HOURS)
+    result = await db.execute(delete(IdempotencyKey).where(IdempotencyKey.created_at < cutoff))
+    return result.rowcount
+
+async def sweep_idempotency_keys(interval: float):
+    """Purge expired keys every `interval` seconds."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with AsyncSessionLocal() as db:
+                purged = await purge_idempotency_keys(db)
+                await db.commit()
+            if purged:
+                logger.info("Purged %d expired idempotency keys", purged)
+        except Exception:
+            logger.exception("Idempotency key purge failed; retrying on the next run")
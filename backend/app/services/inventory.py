@@ -0,0 +1,124 @@
+from datetime import date
+from typing import List, Optional
+from sqlalchemy import bindparam, delete, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.booking import Booking
+from app.models.inventory import RoomNight
+from app.services.availability import ACTIVE_BOOKING_STATUSES, stay_nights
+
+async def sync_room_nights(db: AsyncSession, booking: Booking, is_new: bool = False) -> None:
+    """Bring the ledger rows of one booking in line with its current status and dates.
+
+    Must run in the same transaction as the booking change. A night already held by
+    another booking raises IntegrityError on flush. Pass is_new for a booking that
+    was just inserted to skip looking up the nights it holds.
+    """
+    wanted = set()
+    if booking.status in ACTIVE_BOOKING_STATUSES:
+        nights = stay_nights(booking.check_in_date, booking.check_out_date)
+        wanted = {(booking.room_id, night) for night in nights}
+
+    held = set()
+    if not is_new:
+        rows = await db.execute(
+            select(RoomNight.room_id, RoomNight.night).where(RoomNight.booking_id == booking.id)
+        )
+        held = {tuple(row) for row in rows}
+
+    stale = held - wanted
+    if stale:
+        await db.execute(
+            delete(RoomNight).where(
+                RoomNight.booking_id == booking.id,
+                RoomNight.night.in_([night for _, night in stale]),
+            )
+        )
+
+    missing = wanted - held
+    if missing:
+        db.add_all([
+            RoomNight(room_id=room_id, night=night, booking_id=booking.id)
+            for room_id, night in sorted(missing)
+        ])
+
+    if stale or missing:
+        await db.flush()
+
+# Nights every active booking should hold, derived from the bookings table
+_EXPECTED_NIGHTS = """
+    SELECT b.room_id, gs.night::date AS night, b.id AS booking_id
+    FROM bookings b
+    CROSS JOIN LATERAL generate_series(
+        (b.check_in_date AT TIME ZONE :tz)::date,
+        (b.check_out_date AT TIME ZONE :tz)::date - 1,
+        interval '1 day'
+    ) AS gs(night)
+    WHERE b.status IN :statuses
+"""
+
+def _window_filter(column: str, start: Optional[date], end: Optional[date]) -> str:
+    clauses = []
+    if start:
+        clauses.append(f"{column} >= :start")
+    if end:
+        clauses.append(f"{column} < :end")
+    return " AND ".join(clauses) or "TRUE"
+
+def _params(start: Optional[date], end: Optional[date]) -> dict:
+    return {
+        "tz": settings.HOTEL_TIMEZONE,
+        "statuses": [status.name for status in ACTIVE_BOOKING_STATUSES],
+        "start": start,
+        "end": end,
+    }
+
+def rebuild_room_nights(
+    db: Session, start: Optional[date] = None, end: Optional[date] = None
+) -> int:
+    """Recompute the ledger from bookings for nights in [start, end). Returns rows written.
+
+    Overlapping active bookings keep the first row written; run
+    check_room_nights afterwards to list the bookings that lost nights.
+    """
+    db.execute(
+        text(f"DELETE FROM room_nights WHERE {_window_filter('night', start, end)}"),
+        _params(start, end),
+    )
+    result = db.execute(
+        text(f"""
+            INSERT INTO room_nights (room_id, night, booking_id)
+            SELECT room_id, night, booking_id FROM ({_EXPECTED_NIGHTS}) AS expected
+            WHERE {_window_filter('night', start, end)}
+            ORDER BY booking_id
+            ON CONFLICT DO NOTHING
+        """).bindparams(bindparam("statuses", expanding=True)),
+        _params(start, end),
+    )
+    return result.rowcount
+
+def check_room_nights(
+    db: Session, start: Optional[date] = None, end: Optional[date] = None
+) -> List[dict]:
+    """Compare the ledger with Booking rows. Returns one dict per mismatching room-night.
+
+    `problem` is "missing" when an active booking's night has no ledger row (or is
+    held by another booking) and "stale" when a ledger row has no matching booking.
+    """
+    rows = db.execute(
+        text(f"""
+            WITH expected AS ({_EXPECTED_NIGHTS}),
+            actual AS (SELECT room_id, night, booking_id FROM room_nights)
+            SELECT 'missing' AS problem, * FROM (
+                SELECT * FROM expected EXCEPT SELECT * FROM actual
+            ) AS missing WHERE {_window_filter('night', start, end)}
+            UNION ALL
+            SELECT 'stale' AS problem, * FROM (
+                SELECT * FROM actual EXCEPT SELECT * FROM expected
+            ) AS stale WHERE {_window_filter('night', start, end)}
+            ORDER BY night, room_id
+        """).bindparams(bindparam("statuses", expanding=True)),
+        _params(start, end),
+    )
+    return [dict(row._mapping) for row in rows]
@@ -0,0 +1,283 @@
+from collections import defaultdict
+from datetime import date, datetime, time
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from sqlalchemy import String, bindparam, event, inspect, select, text, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+from app.core.config import settings
+from app.models.booking import Booking, BookingStatus, PaymentStatus
+from app.models.metrics import DailyMetric
+from app.models.room import Room
+from app.services.availability import HOTEL_TZ, stay_nights
+
+# Statuses whose nights count as sold
+SOLD_BOOKING_STATUSES = (
+    BookingStatus.CONFIRMED, BookingStatus.CHECKED_IN, BookingStatus.CHECKED_OUT
+)
+
+REVENUE_COLUMNS = {
+    PaymentStatus.PENDING: "revenue_pending",
+    PaymentStatus.PAID: "revenue_paid",
+    PaymentStatus.REFUNDED: "revenue_refunded",
+}
+
+DELTA_COLUMNS = ("rooms_sold", "rooms_cancelled") + tuple(REVENUE_COLUMNS.values())
+
+# Booking attributes the rollup depends on
+_TRACKED = (
+    "room_id", "check_in_date", "check_out_date", "status", "payment_status", "total_amount"
+)
+
+def _contribution(state: dict, sign: int, deltas: Dict[Tuple[int, date], Dict[str, float]]):
+    """Add (or with sign=-1 remove) one booking state's share of the rollup to `deltas`."""
+    nights = stay_nights(state["check_in_date"], state["check_out_date"])
+    if state["status"] in SOLD_BOOKING_STATUSES:
+        per_night = state["total_amount"] / len(nights) if nights else 0
+        revenue_column = REVENUE_COLUMNS[state["payment_status"]]
+        for night in nights:
+            row = deltas[(state["room_id"], night)]
+            row["rooms_sold"] += sign
+            row[revenue_column] += sign * per_night
+    elif state["status"] == BookingStatus.CANCELLED:
+        for night in nights:
+            deltas[(state["room_id"], night)]["rooms_cancelled"] += sign
+
+def _states(target: Booking, is_new: bool, is_deleted: bool):
+    """(old, new) booking states from the flush's attribute history; None where there is none."""
+    attrs = inspect(target).attrs
+    current = {name: getattr(target, name) for name in _TRACKED}
+    if is_new:
+        return None, current
+    if is_deleted:
+        return current, None
+    if not any(attrs[name].history.has_changes() for name in _TRACKED):
+        return current, current
+    old = {}
+    for name in _TRACKED:
+        history = attrs[name].history
+        old[name] = history.deleted[0] if history.deleted else current[name]
+    return old, current
+
+def apply_booking_deltas(connection: Connection, deltas: Dict[Tuple[int, date], Dict[str, float]]):
+    """Upsert per-room-night deltas into daily_metrics, aggregated per room type."""
+    deltas = {key: row for key, row in deltas.items() if any(row.values())}
+    if not deltas:
+        return
+    room_ids = {room_id for room_id, _ in deltas}
+    rooms = connection.execute(
+        select(Room.id, Room.room_type_id).where(Room.id.in_(room_ids))
+    ).all()
+    room_types = {room.id: room.room_type_id for room in rooms}
+    available = dict(connection.execute(
+        select(Room.room_type_id, func.count())
+        .where(Room.room_type_id.in_(set(room_types.values())), Room.is_active == True)
+        .group_by(Room.room_type_id)
+    ).all())
+
+    by_type = defaultdict(lambda: dict.fromkeys(DELTA_COLUMNS, 0))
+    for (room_id, night), row in deltas.items():
+        totals = by_type[(night, room_types[room_id])]
+        for column, value in row.items():
+            totals[column] += value
+
+    # Sorted so concurrent bookings lock rollup rows in the same order; a move between
+    # rooms of one type cancels out here
+    values = [
+        {"day": night, "room_type_id": room_type_id,
+         "rooms_available": available.get(room_type_id, 0), **totals}
+        for (night, room_type_id), totals in sorted(by_type.items())
+        if any(totals.values())
+    ]
+    if not values:
+        return
+    statement = insert(DailyMetric).values(values)
+    connection.execute(statement.on_conflict_do_update(
+        index_elements=[DailyMetric.day, DailyMetric.room_type_id],
+        set_={
+            column: getattr(DailyMetric, column) + getattr(statement.excluded, column)
+            for column in DELTA_COLUMNS
+        },
+    ))
+
+def _booking_inserted(mapper, connection, target: Booking):
+    _record_change(connection, target, is_new=True)
+
+def _booking_updated(mapper, connection, target: Booking):
+    _record_change(connection, target)
+
+def _booking_deleted(mapper, connection, target: Booking):
+    _record_change(connection, target, is_deleted=True)
+
+_LISTENERS = (
+    ("after_insert", _booking_inserted),
+    ("after_update", _booking_updated),
+    ("after_delete", _booking_deleted),
+)
+
+def register_booking_listeners():
+    """Keep daily_metrics current on every Booking flush. Call once at startup, before
+    the first booking write; repeat calls are no-ops."""
+    for identifier, listener in _LISTENERS:
+        if not event.contains(Booking, identifier, listener):
+            event.listen(Booking, identifier, listener)
+
+def _record_change(connection: Connection, target: Booking, is_new=False, is_deleted=False):
+    # Runs inside the flush, so the rollup commits or rolls back with the booking itself
+    old, new = _states(target, is_new, is_deleted)
+    if old == new:
+        return
+    deltas = defaultdict(lambda: dict.fromkeys(DELTA_COLUMNS, 0))
+    if old:
+        _contribution(old, -1, deltas)
+    if new:
+        _contribution(new, 1, deltas)
+    apply_booking_deltas(connection, deltas)
+
+def bookings_inserted(connection: Connection, bookings: Iterable[dict]):
+    """Add bookings inserted in bulk, which no mapper event sees, to the rollup.
+
+    `bookings` are column dicts holding at least the tracked attributes; call in the
+    inserting transaction.
+    """
+    deltas = defaultdict(lambda: dict.fromkeys(DELTA_COLUMNS, 0))
+    for booking in bookings:
+        _contribution({name: booking[name] for name in _TRACKED}, 1, deltas)
+    apply_booking_deltas(connection, deltas)
+
+def room_capacity_changed(room_type_id: int, change: int):
+    """Update statement moving rooms_available for today and later by `change` rooms."""
+    return (
+        update(DailyMetric)
+        .where(
+            DailyMetric.room_type_id == room_type_id,
+            DailyMetric.day >= datetime.now(HOTEL_TZ).date(),
+        )
+        .values(rooms_available=DailyMetric.rooms_available + change)
+    )
+
+_REBUILD = text("""
+    INSERT INTO daily_metrics (day, room_type_id, rooms_available, rooms_sold, rooms_cancelled,
+                               revenue_pending, revenue_paid, revenue_refunded)
+    SELECT d.day::date, t.id, coalesce(a.rooms, 0), coalesce(n.sold, 0), coalesce(n.cancelled, 0),
+           coalesce(n.revenue_pending, 0), coalesce(n.revenue_paid, 0),
+           coalesce(n.revenue_refunded, 0)
+    FROM generate_series(CAST(:start AS date), CAST(:end AS date) - 1, interval '1 day') AS d(day)
+    CROSS JOIN room_types t
+    LEFT JOIN (
+        SELECT room_type_id, count(*) AS rooms FROM rooms WHERE is_active GROUP BY room_type_id
+    ) AS a ON a.room_type_id = t.id
+    LEFT JOIN (
+        SELECT gs.night::date AS day, r.room_type_id,
+               count(*) FILTER (WHERE b.status IN :sold) AS sold,
+               count(*) FILTER (WHERE b.status = 'CANCELLED') AS cancelled,
+               sum(s.per_night) FILTER (
+                   WHERE b.status IN :sold AND b.payment_status = 'PENDING'
+               ) AS revenue_pending,
+               sum(s.per_night) FILTER (
+                   WHERE b.status IN :sold AND b.payment_status = 'PAID'
+               ) AS revenue_paid,
+               sum(s.per_night) FILTER (
+                   WHERE b.status IN :sold AND b.payment_status = 'REFUNDED'
+               ) AS revenue_refunded
+        FROM bookings b
+        JOIN rooms r ON r.id = b.room_id
+        CROSS JOIN LATERAL (
+            SELECT (b.check_in_date AT TIME ZONE :tz)::date AS check_in,
+                   (b.check_out_date AT TIME ZONE :tz)::date AS check_out
+        ) AS stay
+        CROSS JOIN LATERAL (
+            SELECT b.total_amount / greatest(stay.check_out - stay.check_in, 1) AS per_night
+        ) AS s
+        CROSS JOIN LATERAL generate_series(
+            greatest(stay.check_in, CAST(:start AS date)),
+            least(stay.check_out, CAST(:end AS date)) - 1,
+            interval '1 day'
+        ) AS gs(night)
+        WHERE (b.status IN :sold AND b.stay && tstzrange(:start_at, :end_at, '[)'))
+           OR (b.status = 'CANCELLED'
+               AND b.check_in_date < :end_at AND b.check_out_date > :start_at)
+        GROUP BY 1, 2
+    ) AS n ON n.day = d.day AND n.room_type_id = t.id
+""").bindparams(bindparam("sold", type_=String, expanding=True, literal_execute=True))
+
+def _booking_window(db: Union[Session, Connection]) -> Tuple[Optional[date], Optional[date]]:
+    window = db.execute(text("""
+        SELECT min((check_in_date AT TIME ZONE :tz)::date),
+               max((check_out_date AT TIME ZONE :tz)::date)
+        FROM bookings
+    """), {"tz": settings.HOTEL_TIMEZONE}).one()
+    return window[0], window[1]
+
+def rebuild_daily_metrics(
+    db: Union[Session, Connection], start: Optional[date] = None, end: Optional[date] = None
+) -> int:
+    """Recompute daily_metrics for days in [start, end) from bookings. Returns rows written.
+
+    Without a window, covers every day from the first check-in to the last check-out.
+    Every room type gets a row for every day, so reports never fall back to bookings.
+    """
+    first, last = _booking_window(db)
+    start = start or first
+    end = end or last
+    if not start or not end or end <= start:
+        return 0
+    db.execute(
+        text("DELETE FROM daily_metrics WHERE day >= :start AND day < :end"),
+        {"start": start, "end": end},
+    )
+    result = db.execute(_REBUILD, {
+        "tz": settings.HOTEL_TIMEZONE,
+        "start": start,
+        "end": end,
+        "start_at": datetime.combine(start, time(), HOTEL_TZ),
+        "end_at": datetime.combine(end, time(), HOTEL_TZ),
+        "sold": [status.name for status in SOLD_BOOKING_STATUSES],
+    })
+    return result.rowcount
+
+def _metric_rows(
+    db: Union[Session, Connection], start: date, end: date
+) -> Dict[Tuple[date, int], tuple]:
+    rows = db.execute(
+        select(DailyMetric.day, DailyMetric.room_type_id,
+               *(getattr(DailyMetric, column) for column in DELTA_COLUMNS))
+        .where(DailyMetric.day >= start, DailyMetric.day < end)
+    )
+    return {(row[0], row[1]): tuple(row[2:]) for row in rows}
+
+def check_daily_metrics(
+    db: Session, start: Optional[date] = None, end: Optional[date] = None
+) -> List[dict]:
+    """Compare the rollup with a fresh rebuild of the same window. Returns one dict per
+    mismatching row.
+
+    The rebuild runs in a savepoint that is rolled back, so the rollup is left untouched.
+    Days without a rollup row count as zero.
+    """
+    first, last = _booking_window(db)
+    start = start or first
+    end = end or last
+    if not start or not end or end <= start:
+        return []
+    actual = _metric_rows(db, start, end)
+    savepoint = db.begin_nested()
+    try:
+        rebuild_daily_metrics(db, start, end)
+        expected = _metric_rows(db, start, end)
+    finally:
+        savepoint.rollback()
+
+    zero = (0,) * len(DELTA_COLUMNS)
+    problems = []
+    for key in sorted(actual.keys() | expected.keys()):
+        have, want = actual.get(key, zero), expected.get(key, zero)
+        if any(abs(a - b) > 0.01 for a, b in zip(have, want)):
+            problems.append({
+                "day": key[0],
+                "room_type_id": key[1],
+                "actual": dict(zip(DELTA_COLUMNS, have)),
+                "expected": dict(zip(DELTA_COLUMNS, want)),
+            })
+    return problems
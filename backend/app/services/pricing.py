@@ -0,0 +1,242 @@
+import heapq
+from array import array
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.inventory import BookingHold, RoomNight
+from app.schemas.quote import RoomTypeQuote, StayWindowQuote
+from app.services.availability import (
+    HOTEL_TZ, holds_overlapping, hotel_date, night_range, unavailable_room_ids,
+)
+from app.services.catalog import CatalogSnapshot
+from app.services.dynamic_pricing import PriceGrid
+from app.services.rates import RateCalendar
+
+# Either source of nightly base rates; the grid falls back to the calendar where it has no curve
+NightlyRates = Union[PriceGrid, RateCalendar]
+
+# Widest check-in range and longest stay a flexible-dates search accepts
+FLEXIBLE_SEARCH_MAX_DAYS = 366
+FLEXIBLE_SEARCH_MAX_NIGHTS = 30
+
+# Guests covered by the base price: quad occupancy for family rooms, double for the rest
+FAMILY_ROOM_OCCUPANCY = 4
+STANDARD_OCCUPANCY = 2
+
+@dataclass(frozen=True)
+class StayPrice:
+    nights: int
+    base_amount: float
+    extra_amount: float
+
+    @property
+    def total_amount(self) -> float:
+        return self.base_amount + self.extra_amount
+
+def base_occupancy(room_type) -> int:
+    return FAMILY_ROOM_OCCUPANCY if "Family Room" in room_type.name else STANDARD_OCCUPANCY
+
+def stay_length(check_in: datetime, check_out: datetime) -> int:
+    """Nights charged for a stay: the hotel dates it covers, as the ledger books them."""
+    first, end = night_range(check_in, check_out)
+    return (end - first).days
+
+def price_stay(
+    room_type,
+    rates: NightlyRates,
+    check_in: datetime,
+    check_out: datetime,
+    adults: int,
+    children: int,
+) -> StayPrice:
+    """Price of one room of `room_type` (a RoomType row or RoomTypeResponse) for the party.
+
+    Each night is charged its grid or calendar rate, falling back to base_price. Adults
+    beyond the base occupancy pay extra_adult_price and every child pays
+    child_price, per night, where the room type sets those prices.
+    """
+    nights = stay_length(check_in, check_out)
+    extra_amount = 0.0
+    extra_adults = adults - base_occupancy(room_type)
+    if extra_adults > 0 and room_type.extra_adult_price:
+        extra_amount += extra_adults * room_type.extra_adult_price * nights
+    if children > 0 and room_type.child_price:
+        extra_amount += children * room_type.child_price * nights
+    base_amount = rates.base_amount(room_type, hotel_date(check_in), nights)
+    return StayPrice(nights, base_amount, extra_amount)
+
+def price_room_types(
+    room_types: Iterable,
+    rates: NightlyRates,
+    check_in: datetime,
+    check_out: datetime,
+    adults: int,
+    children: int,
+) -> Dict[int, StayPrice]:
+    """price_stay for every room type in one pass, keyed by room type id."""
+    return {
+        room_type.id: price_stay(room_type, rates, check_in, check_out, adults, children)
+        for room_type in room_types
+    }
+
+async def quote_stay(
+    db: AsyncSession,
+    catalog: CatalogSnapshot,
+    rates: NightlyRates,
+    check_in: datetime,
+    check_out: datetime,
+    adults: int,
+    children: int,
+    room_type_ids: Optional[Sequence[int]] = None,
+    room_ids: Optional[Sequence[int]] = None,
+) -> List[RoomTypeQuote]:
+    """Price every room type (or those of the candidate rooms) with its free rooms for the stay.
+
+    Rooms and prices come from memory (the catalog snapshot and `rates`); the only
+    query is the set of rooms already booked or held during the stay.
+    """
+    rooms = catalog.rooms
+    if room_ids is not None:
+        rooms = [
+            catalog.rooms_by_id[room_id] for room_id in room_ids if room_id in catalog.rooms_by_id
+        ]
+    if room_type_ids is not None:
+        wanted_types = set(room_type_ids)
+        rooms = [room for room in rooms if room.room_type_id in wanted_types]
+
+    unavailable = unavailable_room_ids(
+        check_in, check_out, [room.id for room in rooms] if room_ids is not None else None
+    )
+    taken = set(await db.scalars(unavailable)) if rooms else set()
+
+    free_rooms = defaultdict(list)
+    for room in rooms:
+        if room.id not in taken:
+            free_rooms[room.room_type_id].append(room.id)
+
+    room_types = catalog.room_types
+    if room_ids is not None or room_type_ids is not None:
+        quoted_types = {room.room_type_id for room in rooms}
+        room_types = [room_type for room_type in room_types if room_type.id in quoted_types]
+
+    prices = price_room_types(room_types, rates, check_in, check_out, adults, children)
+    return [
+        RoomTypeQuote(
+            room_type_id=room_type.id,
+            name=room_type.name,
+            max_occupancy=room_type.max_occupancy,
+            base_amount=prices[room_type.id].base_amount,
+            extra_amount=prices[room_type.id].extra_amount,
+            total_amount=prices[room_type.id].total_amount,
+            available_rooms=len(free_rooms[room_type.id]),
+            available_room_ids=free_rooms[room_type.id],
+        )
+        for room_type in room_types
+    ]
+
+async def quote_windows(
+    db: AsyncSession,
+    catalog: CatalogSnapshot,
+    rates: NightlyRates,
+    earliest_check_in: date,
+    latest_check_in: date,
+    nights: int,
+    adults: int,
+    children: int,
+    room_type_ids: Optional[Sequence[int]] = None,
+    limit: int = 20,
+) -> List[StayWindowQuote]:
+    """The cheapest available stays of `nights` nights checking in on any day of the range.
+
+    One ledger query and one holds query cover every window. Each room's taken nights
+    (booked, or held by anyone) become running counts, so whether a room is free for a
+    window is a difference of two entries; prices are O(1) reads from `rates`. Work
+    grows with days x rooms, not windows.
+    """
+    rooms = catalog.rooms
+    if room_type_ids is not None:
+        wanted_types = set(room_type_ids)
+        rooms = [room for room in rooms if room.room_type_id in wanted_types]
+    windows = (latest_check_in - earliest_check_in).days + 1
+    span = windows - 1 + nights
+
+    taken_nights = defaultdict(list)
+    if rooms:
+        query = select(RoomNight.room_id, RoomNight.night).where(
+            RoomNight.night >= earliest_check_in,
+            RoomNight.night < earliest_check_in + timedelta(days=span),
+        )
+        if room_type_ids is not None:
+            query = query.where(RoomNight.room_id.in_([room.id for room in rooms]))
+        rows = await db.execute(query)
+        for room_id, night in rows:
+            taken_nights[room_id].append((night - earliest_check_in).days)
+
+        # Held rooms are off the market too, as in quote_stay
+        held = select(
+            BookingHold.room_id, BookingHold.check_in_date, BookingHold.check_out_date
+        ).where(holds_overlapping(
+            datetime.combine(earliest_check_in, time(), HOTEL_TZ),
+            datetime.combine(earliest_check_in + timedelta(days=span), time(), HOTEL_TZ),
+        ))
+        if room_type_ids is not None:
+            held = held.where(BookingHold.room_id.in_([room.id for room in rooms]))
+        for room_id, check_in, check_out in await db.execute(held):
+            first, end = night_range(check_in, check_out)
+            start = max((first - earliest_check_in).days, 0)
+            taken_nights[room_id].extend(range(start, min((end - earliest_check_in).days, span)))
+
+    free_rooms = defaultdict(lambda: [[] for _ in range(windows)])
+    for room in rooms:
+        free = free_rooms[room.room_type_id]
+        if room.id not in taken_nights:
+            for window in free:
+                window.append(room.id)
+            continue
+        taken = array("i", [0]) * (span + 1)
+        for offset in taken_nights[room.id]:
+            taken[offset + 1] = 1
+        for offset in range(span):
+            taken[offset + 1] += taken[offset]
+        for day in range(windows):
+            if taken[day + nights] == taken[day]:
+                free[day].append(room.id)
+
+    candidates = [
+        (room_type, day, free)
+        for room_type in catalog.room_types
+        if room_type.id in free_rooms
+        for day, free in enumerate(free_rooms[room_type.id])
+        if free
+    ]
+    priced = []
+    for room_type, day, free in candidates:
+        check_in = earliest_check_in + timedelta(days=day)
+        price = price_stay(
+            room_type,
+            rates,
+            datetime.combine(check_in, time(), HOTEL_TZ),
+            datetime.combine(check_in + timedelta(days=nights), time(), HOTEL_TZ),
+            adults,
+            children,
+        )
+        priced.append((price.total_amount, check_in, room_type.id, room_type, price, free))
+
+    cheapest = heapq.nsmallest(limit, priced, key=lambda item: item[:3])
+    return [
+        StayWindowQuote(
+            check_in_date=check_in,
+            check_out_date=check_in + timedelta(days=nights),
+            room_type_id=room_type.id,
+            name=room_type.name,
+            base_amount=price.base_amount,
+            extra_amount=price.extra_amount,
+            total_amount=price.total_amount,
+            available_rooms=len(free),
+            available_room_ids=free,
+        )
+        for _, check_in, _, room_type, price, free in cheapest
+    ]
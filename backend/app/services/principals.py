@@ -0,0 +1,65 @@
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import make_transient_to_detached
+from app.core.config import settings
+from app.models.user import User
+
+class PrincipalCache:
+    """Bounded LRU of resolved users keyed by token subject; entries expire after `ttl` seconds.
+
+    Only column values are stored, so every hit hands out its own detached User
+    and requests never share an instance across sessions.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0 and self.ttl > 0
+
+    def get(self, subject: str) -> Optional[User]:
+        entry = self._entries.get(subject)
+        if entry is None:
+            return None
+        expires_at, columns = entry
+        if expires_at <= time.monotonic():
+            del self._entries[subject]
+            return None
+        self._entries.move_to_end(subject)
+        user = User(**columns)
+        make_transient_to_detached(user)
+        return user
+
+    def put(self, subject: str, user: User):
+        if not self.enabled:
+            return
+        columns = {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+        self._entries[subject] = (time.monotonic() + self.ttl, columns)
+        self._entries.move_to_end(subject)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, subject: str):
+        self._entries.pop(subject, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+principal_cache = PrincipalCache(settings.PRINCIPAL_CACHE_SIZE, settings.PRINCIPAL_CACHE_TTL)
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def invalidate_principal(mapper, connection, target: User):
+    # Deactivation or a role change takes effect at once in this worker; other
+    # workers drop their copy within PRINCIPAL_CACHE_TTL
+    principal_cache.invalidate(target.email)
+    for old_email in inspect(target).attrs.email.history.deleted:
+        principal_cache.invalidate(old_email)
@@ -0,0 +1,99 @@
+from array import array
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Sequence
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.rate import RoomRate
+from app.services.availability import HOTEL_TZ
+
+# Longest range one rate update may cover
+MAX_RATE_RANGE_NIGHTS = 731
+
+class RateCalendar:
+    """Nightly base rates per room type from `start` on, held as running totals.
+
+    Index i of a room type's array is the sum of its rates for the nights before
+    start + i, so the base amount of any stay is a difference of two entries.
+    Room types without overrides, and nights past the last override, are
+    charged the room type's base_price.
+    """
+
+    def __init__(
+        self, start: date, base_prices: Dict[int, float], overrides: Dict[int, Dict[date, float]]
+    ):
+        self.start = start
+        self._totals: Dict[int, array] = {}
+        if not any(overrides.values()):
+            return
+        days = (max(max(rates) for rates in overrides.values() if rates) - start).days + 1
+        for room_type_id, rates in overrides.items():
+            if not rates:
+                continue
+            base_price = base_prices[room_type_id]
+            totals = array("d", [0.0]) * (days + 1)
+            for offset in range(days):
+                rate = rates.get(start + timedelta(days=offset), base_price)
+                totals[offset + 1] = totals[offset] + rate
+            self._totals[room_type_id] = totals
+
+    def base_amount(self, room_type, first_night: date, nights: int) -> float:
+        """Sum of the nightly rates of `room_type` for `nights` nights from first_night."""
+        totals = self._totals.get(room_type.id)
+        if totals is None:
+            return room_type.base_price * nights
+        last = len(totals) - 1
+        lo = min(max((first_night - self.start).days, 0), last)
+        hi = min(max((first_night - self.start).days + nights, 0), last)
+        # Differences of large running totals carry float noise; amounts are in paise at most
+        return round(totals[hi] - totals[lo] + room_type.base_price * (nights - (hi - lo)), 2)
+
+async def load_rate_calendar(db: AsyncSession, room_types: Sequence) -> RateCalendar:
+    """Calendar of the overrides from today (hotel time) on; earlier nights can no longer be
+    booked."""
+    start = datetime.now(HOTEL_TZ).date()
+    overrides: Dict[int, Dict[date, float]] = {room_type.id: {} for room_type in room_types}
+    rows = await db.execute(
+        select(RoomRate.room_type_id, RoomRate.night, RoomRate.price).where(RoomRate.night >= start)
+    )
+    for room_type_id, night, price in rows:
+        overrides[room_type_id][night] = price
+    return RateCalendar(
+        start, {room_type.id: room_type.base_price for room_type in room_types}, overrides
+    )
+
+def rate_nights(date_from: date, date_to: date) -> List[date]:
+    """Nights of the inclusive range [date_from, date_to]."""
+    return [date_from + timedelta(days=offset) for offset in range((date_to - date_from).days + 1)]
+
+async def set_room_rates(
+    db: AsyncSession,
+    room_type_id: int,
+    date_from: date,
+    date_to: date,
+    price: float,
+    label: Optional[str],
+) -> List[RoomRate]:
+    """Upsert the rate of every night in [date_from, date_to].
+
+    Callers bump the catalog version in the same transaction so every worker reloads its calendar.
+    """
+    statement = insert(RoomRate).values([
+        {"room_type_id": room_type_id, "night": night, "price": price, "label": label}
+        for night in rate_nights(date_from, date_to)
+    ])
+    rows = await db.scalars(
+        statement.on_conflict_do_update(
+            index_elements=[RoomRate.room_type_id, RoomRate.night],
+            set_={"price": statement.excluded.price, "label": statement.excluded.label},
+        ).returning(RoomRate)
+    )
+    return rows.all()
+
+def clear_room_rates(room_type_id: int, date_from: date, date_to: date):
+    """Delete statement for the overrides of one room type in [date_from, date_to]."""
+    return delete(RoomRate).where(
+        RoomRate.room_type_id == room_type_id,
+        RoomRate.night >= date_from,
+        RoomRate.night <= date_to,
+    )
@@ -0,0 +1,140 @@
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from sqlalchemy import bindparam, select, text
+from sqlalchemy.sql import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.booking import BookingStatus
+from app.models.metrics import DailyMetric
+from app.schemas.stats import DashboardStats, RoomTypeStats
+from app.services.availability import HOTEL_TZ
+from app.services.catalog import CatalogSnapshot
+from app.services.metrics import REVENUE_COLUMNS, SOLD_BOOKING_STATUSES
+
+# Statuses expected to arrive or leave on their dates
+EXPECTED_BOOKING_STATUSES = (BookingStatus.PENDING,) + SOLD_BOOKING_STATUSES
+
+_CHECK_INS_BY_STATUS = text("""
+    SELECT status, count(*) AS bookings FROM bookings
+    WHERE check_in_date >= :start_at AND check_in_date < :end_at
+    GROUP BY status
+""")
+
+_TODAY_MOVEMENTS = text("""
+    SELECT count(*) FILTER (
+               WHERE check_in_date >= :today AND check_in_date < :tomorrow
+           ) AS arrivals,
+           count(*) FILTER (
+               WHERE check_out_date >= :today AND check_out_date < :tomorrow
+           ) AS departures
+    FROM bookings
+    WHERE status IN :expected
+      AND ((check_in_date >= :today AND check_in_date < :tomorrow)
+           OR (check_out_date >= :today AND check_out_date < :tomorrow))
+""").bindparams(bindparam("expected", expanding=True))
+
+def _rollup_totals(first: date, end: date):
+    # Revenue recognized per night: each booking's amount spread evenly over its nights
+    return (
+        select(
+            DailyMetric.room_type_id,
+            func.count().label("days"),
+            func.sum(DailyMetric.rooms_available).label("available"),
+            func.sum(DailyMetric.rooms_sold).label("sold"),
+            func.sum(DailyMetric.rooms_cancelled).label("cancelled"),
+            *(
+                func.sum(getattr(DailyMetric, column)).label(column)
+                for column in REVENUE_COLUMNS.values()
+            ),
+            func.sum(
+                DailyMetric.revenue_pending
+                + DailyMetric.revenue_paid
+                + DailyMetric.revenue_refunded
+            ).label("revenue"),
+        )
+        .where(DailyMetric.day >= first, DailyMetric.day < end)
+        .group_by(DailyMetric.room_type_id)
+    )
+
+def _hotel_midnight(day: date) -> datetime:
+    return datetime.combine(day, time(), HOTEL_TZ)
+
+def _rate(numerator: float, denominator: float, scale: float = 1) -> float:
+    return round(numerator * scale / denominator, 2) if denominator else 0.0
+
+async def dashboard_stats(
+    db: AsyncSession, catalog: CatalogSnapshot, date_from: date, date_to: date
+) -> DashboardStats:
+    """Occupancy, ADR, RevPAR and revenue for the inclusive hotel-local days [date_from, date_to].
+
+    Occupancy and revenue come from the daily_metrics rollup alone; only the
+    check-in and today's movement counts look at bookings.
+    """
+    end = date_to + timedelta(days=1)
+    today = datetime.now(HOTEL_TZ).date()
+    params = {
+        "start_at": _hotel_midnight(date_from),
+        "end_at": _hotel_midnight(end),
+        "today": _hotel_midnight(today),
+        "tomorrow": _hotel_midnight(today + timedelta(days=1)),
+        "expected": [status.name for status in EXPECTED_BOOKING_STATUSES],
+    }
+
+    totals = {
+        row.room_type_id: row
+        for row in await db.execute(_rollup_totals(date_from, end))
+    }
+    revenue_by_payment_status = {
+        payment_status: sum(getattr(row, column) for row in totals.values())
+        for payment_status, column in REVENUE_COLUMNS.items()
+    }
+
+    bookings_by_status = {booking_status: 0 for booking_status in BookingStatus}
+    for row in await db.execute(_CHECK_INS_BY_STATUS, params):
+        bookings_by_status[BookingStatus[row.status]] = row.bookings
+
+    movements = (await db.execute(_TODAY_MOVEMENTS, params)).one()
+
+    nights = (end - date_from).days
+    rooms_by_type = defaultdict(int)
+    for room in catalog.rooms:
+        rooms_by_type[room.room_type_id] += 1
+
+    by_room_type = []
+    for room_type in catalog.room_types:
+        row = totals.get(room_type.id)
+        # Days the rollup has no row for yet hold no bookings; count today's rooms for them
+        missing = nights - (row.days if row else 0)
+        available = (row.available if row else 0) + rooms_by_type[room_type.id] * missing
+        sold = row.sold if row else 0
+        by_room_type.append(RoomTypeStats(
+            room_type_id=room_type.id,
+            name=room_type.name,
+            room_nights_available=available,
+            room_nights_sold=sold,
+            room_nights_cancelled=row.cancelled if row else 0,
+            room_revenue=round(row.revenue if row else 0, 2),
+            occupancy_rate=_rate(sold, available, 100),
+        ))
+
+    available = sum(stats.room_nights_available for stats in by_room_type)
+    sold = sum(stats.room_nights_sold for stats in by_room_type)
+    revenue = sum(row.revenue for row in totals.values())
+    return DashboardStats(
+        date_from=date_from,
+        date_to=date_to,
+        room_nights_available=available,
+        room_nights_sold=sold,
+        room_nights_cancelled=sum(stats.room_nights_cancelled for stats in by_room_type),
+        occupancy_rate=_rate(sold, available, 100),
+        adr=_rate(revenue, sold),
+        revpar=_rate(revenue, available),
+        room_revenue=round(revenue, 2),
+        revenue_by_payment_status={
+            payment_status: round(amount, 2)
+            for payment_status, amount in revenue_by_payment_status.items()
+        },
+        bookings_by_status=bookings_by_status,
+        arrivals_today=movements.arrivals,
+        departures_today=movements.departures,
+        by_room_type=by_room_type,
+    )
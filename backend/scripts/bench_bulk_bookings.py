@@ -0,0 +1,112 @@
+"""
+Benchmark booking a group one POST /bookings at a time against one POST /bookings/bulk.
+
+Books --group stays of one room type for the same nights, in-process against
+the configured database, --repeat times each way on fresh dates, and reports
+statements and time per group. Bookings are made by a dedicated user and
+deleted afterwards.
+
+    python scripts/bench_bulk_bookings.py --group 20 --repeat 5
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+import httpx
+from sqlalchemy import delete, func, select
+from app.main import app
+from app.core.database import AsyncSessionLocal, count_statements
+from app.core.security import create_access_token
+from app.models import Booking, Room, User
+
+BENCH_EMAIL = "bench-bulk-bookings@example.com"
+
+async def get_bench_user() -> User:
+    async with AsyncSessionLocal() as db:
+        user = await db.scalar(select(User).where(User.email == BENCH_EMAIL))
+        if not user:
+            user = User(email=BENCH_EMAIL, hashed_password="x", full_name="Bulk Booking Bench")
+            db.add(user)
+            await db.commit()
+        return user
+
+def group_stays(room_type_id: int, size: int, check_in: datetime) -> list:
+    return [
+        {
+            "room_type_id": room_type_id,
+            "check_in_date": check_in.isoformat(),
+            "check_out_date": (check_in + timedelta(days=2)).isoformat(),
+            "number_of_guests": 2,
+            "guest_name": "Pilgrim Group",
+            "guest_email": BENCH_EMAIL,
+        }
+        for _ in range(size)
+    ]
+
+async def one_by_one(client: httpx.AsyncClient, headers: dict, stays: list) -> int:
+    for stay in stays:
+        (await client.post("/bookings", json=stay, headers=headers)).raise_for_status()
+    return len(stays)
+
+async def in_bulk(client: httpx.AsyncClient, headers: dict, stays: list) -> int:
+    response = await client.post("/bookings/bulk", json={"bookings": stays}, headers=headers)
+    response.raise_for_status()
+    return response.json()["created"]
+
+async def run(group: int, repeat: int) -> int:
+    async with AsyncSessionLocal() as db:
+        room_type_id, rooms = (await db.execute(
+            select(Room.room_type_id, func.count())
+            .where(Room.is_active == True)
+            .group_by(Room.room_type_id)
+            .order_by(func.count().desc())
+        )).first() or (None, 0)
+    if rooms < group:
+        print(f"Needs a room type with {group} active rooms; "
+              "run scripts/seed_data.py or lower --group")
+        return 1
+    user = await get_bench_user()
+    token = create_access_token(data={"sub": user.email, "role": user.role.value})
+    headers = {"Authorization": f"Bearer {token}"}
+    # Far enough out that real bookings do not get in the way
+    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    start = today + timedelta(days=900)
+
+    print(f"{group} stays of room type {room_type_id} ({rooms} rooms), {repeat} groups each way")
+    print(f"{'method':>11} {'queries':>8} {'p50 ms':>9} {'max ms':>9}")
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://test/api/v1") as client:
+            for offset, (label, book) in enumerate((("one by one", one_by_one), ("bulk", in_bulk))):
+                timings, statements = [], 0
+                for attempt in range(repeat):
+                    check_in = start + timedelta(days=(offset * repeat + attempt) * 3)
+                    stays = group_stays(room_type_id, group, check_in)
+                    with count_statements() as executed:
+                        started = time.perf_counter()
+                        created = await book(client, headers, stays)
+                        timings.append((time.perf_counter() - started) * 1000)
+                    statements += len(executed)
+                    if created != group:
+                        print(f"{label}: booked {created} of {group}; are the dates free?")
+                        return 1
+                print(f"{label:>11} {statements / repeat:>8.1f} "
+                      f"{statistics.median(timings):>9.1f} {max(timings):>9.1f}")
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(Booking).where(Booking.user_id == user.id))
+            await db.commit()
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--group", type=int, default=20, help="stays per group")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args.group, args.repeat)))
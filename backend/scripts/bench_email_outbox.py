@@ -0,0 +1,135 @@
+"""
+Benchmark the email outbox worker against a local SMTP stand-in.
+
+Starts an aiosmtpd server in-process (pip install aiosmtpd; the app does not
+need it), queues --emails outbox rows and delivers them with deliver_batch, as
+the worker does, once per SMTP pool size. --latency-ms slows every message down
+like a remote server would; --fail-rate answers that share of messages with a
+temporary 451, so retries and backoff are exercised too (retries are made due at
+once). Reports emails per second. The queued rows are deleted afterwards.
+
+    python scripts/bench_email_outbox.py --emails 1000 --pool-sizes 1,2,4 --latency-ms 20
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import argparse
+import asyncio
+import logging
+import random
+import time
+
+from sqlalchemy import delete, func, insert, select
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.outbox import EmailOutbox, EmailStatus
+from app.services.email_outbox import SmtpPool, deliver_batch, delivery_stats
+
+BENCH_FROM_EMAIL = "bench-email-outbox@shivashray.local"
+
+class StandInHandler:
+    """aiosmtpd handler accepting messages after a delay, refusing some with 451."""
+
+    def __init__(self, latency: float, fail_rate: float, seed: int):
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.rng = random.Random(seed)
+        self.received = 0
+
+    async def handle_DATA(self, server, session, envelope):
+        await asyncio.sleep(self.latency)
+        if self.rng.random() < self.fail_rate:
+            return "451 Try again later"
+        self.received += 1
+        return "250 OK"
+
+async def pending_emails() -> int:
+    async with AsyncSessionLocal() as db:
+        return await db.scalar(
+            select(func.count())
+            .select_from(EmailOutbox)
+            .where(EmailOutbox.status == EmailStatus.PENDING)
+        )
+
+async def run(emails: int, pool_sizes, batch_size: int, handler: StandInHandler) -> int:
+    if await pending_emails():
+        print("The outbox has pending emails; they would be sent to the stand-in. "
+              "Run against a dev database.")
+        return 1
+    print(f"{emails} emails, batches of {batch_size}, {handler.latency * 1000:.0f} ms per message, "
+          f"{handler.fail_rate:.0%} refused with 451")
+    print(f"{'pool':>5} {'sent':>6} {'retried':>8} {'failed':>7} {'seconds':>8} {'emails/s':>9}")
+    try:
+        for size in pool_sizes:
+            async with AsyncSessionLocal() as db:
+                await db.execute(insert(EmailOutbox), [
+                    {
+                        "to_email": f"guest{index}@example.com",
+                        "subject": "Your Shivashray Hotel booking",
+                        "body": "Thank you for booking with Shivashray Hotel, Varanasi.",
+                        "status": EmailStatus.PENDING,
+                        "attempts": 0,
+                    }
+                    for index in range(emails)
+                ])
+                await db.commit()
+            before = (delivery_stats.sent, delivery_stats.retried, delivery_stats.failed)
+            pool = SmtpPool(size)
+            started = time.perf_counter()
+            try:
+                while await deliver_batch(pool, batch_size):
+                    pass
+            finally:
+                await asyncio.to_thread(pool.close)
+            elapsed = time.perf_counter() - started
+            after = (delivery_stats.sent, delivery_stats.retried, delivery_stats.failed)
+            sent, retried, failed = (count - start for count, start in zip(after, before))
+            print(f"{size:>5} {sent:>6} {retried:>8} {failed:>7} "
+                  f"{elapsed:>8.2f} {sent / elapsed:>9.1f}")
+            if sent + failed != emails:
+                print(f"pool {size}: {emails - sent - failed} emails left undelivered")
+                return 1
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                delete(EmailOutbox).where(EmailOutbox.to_email.like("guest%@example.com"))
+            )
+            await db.commit()
+    print(f"stand-in accepted {handler.received} messages")
+    return 0
+
+def main(args) -> int:
+    try:
+        from aiosmtpd.controller import Controller
+    except ImportError:
+        print("Needs the aiosmtpd stand-in: pip install aiosmtpd")
+        return 1
+    # Retries are expected here; keep the per-batch warnings out of the table
+    logging.getLogger("app.services.email_outbox").setLevel(logging.ERROR)
+    handler = StandInHandler(args.latency_ms / 1000, args.fail_rate, args.seed)
+    controller = Controller(handler, hostname="127.0.0.1", port=args.smtp_port)
+    controller.start()
+    settings.SMTP_HOST, settings.SMTP_PORT = "127.0.0.1", args.smtp_port
+    settings.SMTP_USER, settings.FROM_EMAIL = "", BENCH_FROM_EMAIL
+    settings.EMAIL_RETRY_SECONDS = 0.0
+    try:
+        pool_sizes = [int(size) for size in args.pool_sizes.split(",")]
+        return asyncio.run(run(args.emails, pool_sizes, args.batch_size, handler))
+    finally:
+        controller.stop()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--emails", type=int, default=1000)
+    parser.add_argument(
+        "--pool-sizes", default="1,2,4", help="comma-separated SMTP connections per worker"
+    )
+    parser.add_argument("--batch-size", type=int, default=settings.EMAIL_BATCH_SIZE)
+    parser.add_argument("--latency-ms", type=float, default=10.0, help="stand-in delay per message")
+    parser.add_argument(
+        "--fail-rate", type=float, default=0.05, help="share of messages refused with 451"
+    )
+    parser.add_argument("--smtp-port", type=int, default=8025)
+    parser.add_argument("--seed", type=int, default=7)
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,64 @@
+"""
+Benchmark GET /bookings with and without the principal cache.
+
+Calls the endpoint in-process against the configured database, first clearing
+the cache before every request (a lookup per request, as before the cache) and
+then with it warm, and reports statements per request and latency.
+
+    python scripts/bench_principal_cache.py --requests 500
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+from sqlalchemy import select
+from app.main import app
+from app.core.database import AsyncSessionLocal, count_statements
+from app.core.security import create_access_token
+from app.models.user import User, UserRole
+from app.services.principals import principal_cache
+
+async def measure(client: httpx.AsyncClient, headers: dict, requests: int, cached: bool):
+    timings, statements = [], 0
+    for _ in range(requests):
+        if not cached:
+            principal_cache.clear()
+        with count_statements() as executed:
+            started = time.perf_counter()
+            response = await client.get("/bookings", headers=headers)
+            timings.append((time.perf_counter() - started) * 1000)
+        response.raise_for_status()
+        statements += len(executed)
+    timings.sort()
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    return statements / requests, statistics.median(timings), p95
+
+async def run(requests: int) -> int:
+    async with AsyncSessionLocal() as db:
+        admin = await db.scalar(select(User).where(User.role == UserRole.ADMIN))
+    if not admin:
+        print("Needs an admin user; run scripts/seed_data.py first")
+        return 1
+    token = create_access_token(data={"sub": admin.email, "role": admin.role.value})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test/api/v1") as client:
+        await client.get("/bookings", headers=headers)
+        print(f"{'principal':>10} {'queries':>8} {'p50 ms':>9} {'p95 ms':>9}")
+        for label, cached in (("uncached", False), ("cached", True)):
+            per_request, p50, p95 = await measure(client, headers, requests, cached)
+            print(f"{label:>10} {per_request:>8.1f} {p50:>9.2f} {p95:>9.2f}")
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args.requests)))
@@ -0,0 +1,122 @@
+"""
+Benchmark POST /quotes throughput against the configured database.
+
+First times the pricing pass alone (every catalog room type, no I/O), then
+sends quote requests in-process with random stays and party sizes, a batch of
+--concurrency at a time, and reports quotes per second, latency and
+statements per quote. Keep --concurrency within DB_POOL_SIZE, or overflow
+connections are opened and closed on every batch.
+
+Finally compares one POST /quotes/flexible over --flexible-days check-in days
+with the equivalent POST /quotes per window.
+
+    python scripts/bench_quotes.py --requests 5000 --concurrency 8
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+import httpx
+from app.main import app
+from app.core.database import count_statements
+from app.services.catalog import refresh_catalog
+from app.services.pricing import price_room_types
+
+def random_quote(rng: random.Random) -> dict:
+    today = datetime.now(timezone.utc).replace(hour=12, minute=0, second=0, microsecond=0)
+    check_in = today + timedelta(days=rng.randint(1, 180))
+    return {
+        "check_in_date": check_in.isoformat(),
+        "check_out_date": (check_in + timedelta(days=rng.randint(1, 7))).isoformat(),
+        "number_of_adults": rng.randint(1, 4),
+        "number_of_children": rng.randint(0, 2),
+    }
+
+def bench_pricing(catalog, passes: int):
+    check_in = datetime.now(timezone.utc) + timedelta(days=30)
+    stays = [(check_in + timedelta(days=i), check_in + timedelta(days=i + 1 + i % 7)) for i in range(180)]
+    started = time.perf_counter()
+    for i in range(passes):
+        stay_in, stay_out = stays[i % len(stays)]
+        price_room_types(catalog.room_types, catalog.rates, stay_in, stay_out, 1 + i % 4, i % 3)
+    elapsed = time.perf_counter() - started
+    print(f"pricing pass: {len(catalog.room_types)} room types, {passes / elapsed:,.0f} passes/s")
+
+async def bench_flexible(client: httpx.AsyncClient, days: int, nights: int):
+    earliest = datetime.now(timezone.utc).date() + timedelta(days=30)
+    timings = {}
+    with count_statements() as executed:
+        started = time.perf_counter()
+        response = await client.post("/quotes/flexible", json={
+            "earliest_check_in": earliest.isoformat(),
+            "latest_check_in": (earliest + timedelta(days=days - 1)).isoformat(),
+            "nights": nights,
+            "limit": 100,
+        })
+        response.raise_for_status()
+        timings["flexible"] = ((time.perf_counter() - started) * 1000, len(executed))
+    with count_statements() as executed:
+        started = time.perf_counter()
+        for day in range(days):
+            check_in = datetime.combine(earliest + timedelta(days=day), datetime.min.time(), timezone.utc)
+            response = await client.post("/quotes", json={
+                "check_in_date": check_in.isoformat(),
+                "check_out_date": (check_in + timedelta(days=nights)).isoformat(),
+            })
+            response.raise_for_status()
+        timings["per window"] = ((time.perf_counter() - started) * 1000, len(executed))
+    print(f"\n{days} check-in days, {nights} nights")
+    print(f"{'search':>10} {'ms':>8} {'queries':>8}")
+    for label, (elapsed, statements) in timings.items():
+        print(f"{label:>10} {elapsed:>8.1f} {statements:>8}")
+
+async def run(requests: int, concurrency: int, seed: int, flexible_days: int) -> int:
+    catalog = await refresh_catalog()
+    bench_pricing(catalog, 100000)
+
+    rng = random.Random(seed)
+    bodies = [random_quote(rng) for _ in range(requests)]
+    timings = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test/api/v1") as client:
+
+        async def quote(body):
+            started = time.perf_counter()
+            response = await client.post("/quotes", json=body)
+            timings.append((time.perf_counter() - started) * 1000)
+            response.raise_for_status()
+
+        await quote(bodies[0])
+        timings.clear()
+        with count_statements() as executed:
+            started = time.perf_counter()
+            for i in range(0, requests, concurrency):
+                await asyncio.gather(*(quote(body) for body in bodies[i:i + concurrency]))
+            elapsed = time.perf_counter() - started
+
+    timings.sort()
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    print(f"{'quotes':>8} {'quotes/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'queries':>8}")
+    print(
+        f"{requests:>8} {requests / elapsed:>9,.0f} {timings[len(timings) // 2]:>8.2f} "
+        f"{p95:>8.2f} {len(executed) / requests:>8.1f}"
+    )
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://test/api/v1") as client:
+        await bench_flexible(client, flexible_days, 3)
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--flexible-days", type=int, default=60)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args.requests, args.concurrency, args.seed, args.flexible_days)))
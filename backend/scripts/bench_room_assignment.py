@@ -0,0 +1,116 @@
+"""
+Benchmark room assignment policies on a synthetic year of type bookings.
+
+Requests for one room type arrive in booking order (random lead time, stay
+length and check-in over --days nights) and are placed in memory, without a
+database, by three policies:
+
+  first free   the lowest-numbered room the stay fits in (what guests picking
+               rooms amounts to)
+  best fit     assignment.best_room, as POST /bookings with room_type_id does
+  re-optimize  best fit, plus plan_assignments over stays not yet started
+               every --reoptimize-every days, as the batch job does
+
+and reports accepted and rejected requests, nights sold, short gaps left on the final
+calendars, and time spent.
+
+    python scripts/bench_room_assignment.py --rooms 30 --days 365
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import argparse
+import random
+import time
+from typing import Dict, List, NamedTuple, Optional
+
+from app.services.assignment import RoomCalendar, Stay, best_room, plan_assignments, short_gaps
+
+class Request(NamedTuple):
+    booked_on: int  # Day the request arrives
+    first: int
+    end: int
+
+def synthetic_requests(rooms: int, days: int, load: float, rng: random.Random) -> List[Request]:
+    """Requests whose nights add up to about `load` of the rooms x days capacity."""
+    requests, nights = [], 0
+    while nights < load * rooms * days:
+        length = rng.choice((1, 1, 2, 2, 2, 3, 3, 4, 5, 7, 10, 14))
+        first = rng.randrange(0, days - length + 1)
+        lead = min(first, int(rng.expovariate(1 / 30)))
+        requests.append(Request(first - lead, first, first + length))
+        nights += length
+    return sorted(requests)
+
+def first_free(calendars: Dict[int, RoomCalendar], first: int, end: int) -> Optional[int]:
+    for room_id, calendar in calendars.items():
+        if calendar.fit(first, end) is not None:
+            return room_id
+    return None
+
+def simulate(room_ids: List[int], requests: List[Request], choose, reoptimize_every: int = 0):
+    calendars = {room_id: RoomCalendar() for room_id in room_ids}
+    stays: List[Stay] = []
+    rejected = runs = 0
+    next_reoptimize = reoptimize_every
+    started = time.perf_counter()
+    for request in requests:
+        if reoptimize_every and request.booked_on >= next_reoptimize:
+            next_reoptimize = request.booked_on + reoptimize_every
+            today = request.booked_on
+            runs += 1
+            current = [stay._replace(movable=stay.first > today) for stay in stays]
+            plan = plan_assignments(room_ids, current)
+            if plan and plan.moves:
+                stays = [
+                    stay._replace(room_id=plan.moves.get(stay.booking_id, stay.room_id))
+                    for stay in stays
+                ]
+                calendars = {room_id: RoomCalendar() for room_id in room_ids}
+                for stay in stays:
+                    calendars[stay.room_id].add(stay.first, stay.end)
+        room_id = choose(calendars, request.first, request.end)
+        if room_id is None:
+            rejected += 1
+            continue
+        calendars[room_id].add(request.first, request.end)
+        stays.append(Stay(len(stays), room_id, request.first, request.end, False))
+    elapsed = time.perf_counter() - started
+    nights = sum(stay.end - stay.first for stay in stays)
+    return len(stays), rejected, short_gaps(room_ids, stays), nights, elapsed, runs
+
+def main(rooms: int, days: int, load: float, reoptimize_every: int, seed: int) -> int:
+    rng = random.Random(seed)
+    room_ids = list(range(1, rooms + 1))
+    requests = synthetic_requests(rooms, days, load, rng)
+    print(f"{rooms} rooms, {days} nights, {len(requests)} requests "
+          f"({load:.0%} of capacity asked for)")
+    print(f"{'policy':>12} {'accepted':>9} {'rejected':>9} {'occupancy':>10} "
+          f"{'short gaps':>11} {'ms':>8}")
+    policies = (
+        ("first free", first_free, 0),
+        ("best fit", best_room, 0),
+        ("re-optimize", best_room, reoptimize_every),
+    )
+    for label, choose, every in policies:
+        accepted, rejected, gaps, nights, elapsed, runs = simulate(
+            room_ids, requests, choose, every
+        )
+        print(
+            f"{label:>12} {accepted:>9} {rejected:>9} {nights / (rooms * days):>10.1%} "
+            f"{gaps:>11} {elapsed * 1000:>8.1f}"
+        )
+    print(f"re-optimize ran {runs} times, "
+          f"{elapsed * 1000 / max(runs, 1):.1f} ms per run including placements")
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rooms", type=int, default=30)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--load", type=float, default=0.95, help="requested nights / capacity")
+    parser.add_argument("--reoptimize-every", type=int, default=1, help="days between batch runs")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    sys.exit(main(args.rooms, args.days, args.load, args.reoptimize_every, args.seed))
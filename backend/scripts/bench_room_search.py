@@ -0,0 +1,112 @@
+"""
+Benchmark GET /rooms availability search latency against room count.
+
+Synthetic rooms and bookings are inserted inside a transaction that is rolled
+back at the end, so the script is safe to run against a development database.
+
+    python scripts/bench_room_search.py --sizes 25 100 500 2000
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+from fastapi import Response
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import async_engine
+from app.api.v1.rooms import get_rooms
+from app.models import User, Room, RoomType, Booking
+from app.models.booking import BookingStatus
+from app.schemas.room import RoomResponse
+from app.services.catalog import load_catalog
+from app.services.inventory import sync_room_nights
+
+async def seed_inventory(db: AsyncSession, room_count: int, check_in: datetime):
+    room_type = RoomType(name=f"Bench Room {room_count}", max_occupancy=2, base_price=4000.0)
+    user = User(email=f"bench-{room_count}@example.com", hashed_password="x", full_name="Bench")
+    db.add_all([room_type, user])
+    await db.flush()
+
+    rooms = [
+        Room(room_number=f"B{room_count}-{i}", room_type_id=room_type.id, floor=1)
+        for i in range(room_count)
+    ]
+    db.add_all(rooms)
+    await db.flush()
+
+    # Every other room is booked across the searched stay
+    bookings = [
+        Booking(
+            user_id=user.id,
+            room_id=room.id,
+            check_in_date=check_in - timedelta(days=1),
+            check_out_date=check_in + timedelta(days=1),
+            number_of_guests=2,
+            total_amount=8000.0,
+            status=BookingStatus.CONFIRMED,
+            guest_name="Bench Guest",
+            guest_email="guest@example.com",
+        )
+        for room in rooms[::2]
+    ]
+    db.add_all(bookings)
+    await db.flush()
+    for booking in bookings:
+        await sync_room_nights(db, booking, is_new=True)
+
+async def run(sizes, repeat: int):
+    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    check_in = today + timedelta(days=30)
+    check_out = check_in + timedelta(days=2)
+
+    statements = 0
+
+    def count_statement(*args):
+        nonlocal statements
+        statements += 1
+
+    print(f"{'rooms':>8} {'returned':>9} {'queries':>8} {'p50 ms':>9} {'p95 ms':>9}")
+    for size in sizes:
+        async with async_engine.connect() as connection:
+            transaction = await connection.begin()
+            db = AsyncSession(bind=connection, join_transaction_mode="create_savepoint")
+            raw_connection = connection.sync_connection
+            try:
+                await seed_inventory(db, size, check_in)
+                # Rooms come from the in-memory catalog; only the ledger lookup is timed
+                catalog = await load_catalog(db)
+                timings = []
+                for _ in range(repeat):
+                    db.expunge_all()
+                    statements = 0
+                    event.listen(raw_connection, "before_cursor_execute", count_statement)
+                    started = time.perf_counter()
+                    rooms = await get_rooms(
+                        request=None, response=Response(), room_type_id=None, available=True,
+                        check_in=check_in, check_out=check_out, catalog=catalog, db=db,
+                    )
+                    [RoomResponse.model_validate(room) for room in rooms]
+                    timings.append((time.perf_counter() - started) * 1000)
+                    event.remove(raw_connection, "before_cursor_execute", count_statement)
+                timings.sort()
+                p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+                print(
+                    f"{size:>8} {len(rooms):>9} {statements:>8} "
+                    f"{statistics.median(timings):>9.2f} {p95:>9.2f}"
+                )
+            finally:
+                await db.close()
+                await transaction.rollback()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[25, 100, 500, 2000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args.sizes, args.repeat))
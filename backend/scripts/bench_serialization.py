@@ -0,0 +1,94 @@
+"""
+Microbenchmark of booking list serialization: response_model validation vs the fast path.
+
+Builds synthetic bookings in memory (no database) and times turning them into a
+JSON body the way each path does:
+
+  validated+json    ORM objects validated through List[BookingResponse], stdlib json
+  validated+orjson  the same validation, rendered by ORJSONResponse
+  constructed       row mappings -> model_construct -> ModelListResponse (orjson)
+
+    python scripts/bench_serialization.py --bookings 10000
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import argparse
+import json
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+import orjson
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+from app.core.responses import ModelListResponse, construct_models
+from app.models.booking import Booking, BookingStatus, PaymentStatus
+from app.schemas.booking import BookingResponse
+
+def synthetic_rows(count: int) -> List[dict]:
+    created = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    return [
+        {
+            "room_id": 1 + i % 30,
+            "check_in_date": created + timedelta(days=i % 365),
+            "check_out_date": created + timedelta(days=i % 365 + 2),
+            "number_of_guests": 2,
+            "number_of_adults": 2,
+            "number_of_children": 0,
+            "guest_name": f"Guest {i}",
+            "guest_email": f"guest{i}@example.com",
+            "guest_phone": "+91-9000000000",
+            "special_requests": None,
+            "id": i + 1,
+            "user_id": 1 + i % 500,
+            "total_amount": 8000.0,
+            "status": BookingStatus.CONFIRMED,
+            "payment_status": PaymentStatus.PAID,
+            "room_pinned": True,
+            "created_at": created + timedelta(minutes=i),
+            "updated_at": None,
+            "version": 1,
+        }
+        for i in range(count)
+    ]
+
+def time_it(func, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), len(body)
+
+def run(count: int, repeat: int):
+    rows = synthetic_rows(count)
+    bookings = [Booking(**row) for row in rows]
+    adapter = TypeAdapter(List[BookingResponse])
+
+    def validated(render):
+        return lambda: render(adapter.dump_python(adapter.validate_python(bookings), mode="json"))
+
+    paths = [
+        ("validated+json", validated(lambda content: json.dumps(content).encode())),
+        ("validated+orjson", validated(ORJSONResponse(None).render)),
+        ("constructed", lambda: ModelListResponse(None).render(construct_models(BookingResponse, rows))),
+    ]
+
+    # Both paths must produce the same document
+    assert orjson.loads(paths[0][1]()) == orjson.loads(paths[2][1]())
+
+    print(f"{count} bookings, median of {repeat} runs")
+    print(f"{'path':>18} {'ms':>9} {'bytes':>10}")
+    for label, func in paths:
+        median, size = time_it(func, repeat)
+        print(f"{label:>18} {median:>9.1f} {size:>10}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--bookings", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.bookings, args.repeat)
@@ -0,0 +1,174 @@
+"""
+Check that the booking and ledger query shapes use their indexes on a large dataset.
+
+Seeds a synthetic history (default 200 rooms x 1000 nights = 200k bookings)
+inside a transaction, runs ANALYZE, EXPLAINs each query shape the API issues and
+fails if the plan does not touch one of the expected indexes. Everything is
+rolled back at the end.
+
+    python scripts/explain_indexes.py --rooms 200 --nights 1000
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import argparse
+import json
+from sqlalchemy import text
+from app.core.config import settings
+from app.core.database import engine
+
+ACTIVE = "('PENDING', 'CONFIRMED', 'CHECKED_IN')"
+
+# (name, SQL mirroring the API query, indexes any one of which must appear in the plan)
+QUERY_SHAPES = [
+    (
+        "my bookings, first page",
+        """SELECT * FROM bookings WHERE user_id = :user_id
+           ORDER BY created_at DESC, id DESC LIMIT 51""",
+        {"ix_bookings_user_id_created_at_id"},
+    ),
+    (
+        "my bookings, next page",
+        """SELECT * FROM bookings WHERE user_id = :user_id
+             AND (created_at, id) < (:created_at, :booking_id)
+           ORDER BY created_at DESC, id DESC LIMIT 51""",
+        {"ix_bookings_user_id_created_at_id"},
+    ),
+    (
+        "admin bookings, first page",
+        """SELECT * FROM bookings ORDER BY created_at DESC, id DESC LIMIT 51""",
+        {"ix_bookings_created_at_id"},
+    ),
+    (
+        "admin bookings by status",
+        """SELECT * FROM bookings WHERE status = 'CONFIRMED'
+           ORDER BY created_at DESC, id DESC LIMIT 51""",
+        {"ix_bookings_status_created_at_id"},
+    ),
+    (
+        "admin bookings by room",
+        """SELECT * FROM bookings WHERE room_id = :room_id
+           ORDER BY created_at DESC, id DESC LIMIT 51""",
+        {"ix_bookings_room_id_created_at_id"},
+    ),
+    (
+        "taken night for a room",
+        """SELECT night FROM room_nights WHERE room_id = :room_id
+             AND night >= CAST(:check_in AS date) AND night < CAST(:check_out AS date) LIMIT 1""",
+        {"room_nights_pkey"},
+    ),
+    (
+        "booked rooms for a stay",
+        """SELECT DISTINCT room_id FROM room_nights
+           WHERE night >= CAST(:check_in AS date) AND night < CAST(:check_out AS date)""",
+        {"room_nights_pkey", "ix_room_nights_night_room_id"},
+    ),
+    (
+        "sold stays in a reporting window",
+        """SELECT id FROM bookings WHERE status IN ('CONFIRMED', 'CHECKED_IN', 'CHECKED_OUT')
+             AND stay && tstzrange(:check_in, :check_out, '[)')""",
+        {"ix_bookings_sold_stay"},
+    ),
+    (
+        "ledger rows of a booking",
+        """SELECT room_id, night FROM room_nights WHERE booking_id = :booking_id""",
+        {"ix_room_nights_booking_id"},
+    ),
+]
+
+SEED = [
+    # Synthetic guests, rooms and one-night stays back to back in every room
+    """INSERT INTO users (email, hashed_password, full_name, is_active, role)
+       SELECT 'explain-' || g || '@example.com', 'x', 'Explain ' || g, true, 'GUEST'
+       FROM generate_series(1, :users) AS g""",
+    """INSERT INTO rooms (room_number, room_type_id, floor, is_active)
+       SELECT 'EX-' || g, (SELECT min(id) FROM room_types), 9, true
+       FROM generate_series(1, :rooms) AS g""",
+    """INSERT INTO bookings (user_id, room_id, check_in_date, check_out_date, number_of_guests,
+                             total_amount, status, payment_status, guest_name, guest_email,
+                             created_at)
+       SELECT u.id, r.id, s.day, s.day + interval '1 day', 2, 4000,
+              CASE WHEN s.day >= date_trunc('day', now()) THEN
+                       (CASE WHEN n % 3 = 0 THEN 'PENDING' ELSE 'CONFIRMED' END)::bookingstatus
+                   WHEN n % 10 = 0 THEN 'CANCELLED'::bookingstatus
+                   ELSE 'CHECKED_OUT'::bookingstatus END,
+              'PAID', 'Explain Guest', 'guest@example.com',
+              s.day - interval '30 days'
+       FROM (SELECT id, row_number() OVER (ORDER BY id) AS rn
+             FROM rooms WHERE room_number LIKE 'EX-%') r
+       CROSS JOIN generate_series(0, :nights - 1) AS n
+       CROSS JOIN LATERAL (
+           SELECT date_trunc('day', now()) - (:nights * 0.8 - n) * interval '1 day' AS day
+       ) s
+       JOIN LATERAL (SELECT id FROM users
+                     WHERE email = 'explain-' || (1 + (r.rn * 7919 + n) % :users)
+                                   || '@example.com') u ON true""",
+    f"""INSERT INTO room_nights (room_id, night, booking_id)
+        SELECT room_id, (check_in_date AT TIME ZONE :tz)::date, id FROM bookings
+        WHERE status IN {ACTIVE} AND guest_name = 'Explain Guest'
+        ON CONFLICT DO NOTHING""",
+    "ANALYZE users",
+    "ANALYZE rooms",
+    "ANALYZE bookings",
+    "ANALYZE room_nights",
+]
+
+def index_names(plan: dict) -> set:
+    names = {plan["Index Name"]} if "Index Name" in plan else set()
+    for child in plan.get("Plans", []):
+        names |= index_names(child)
+    return names
+
+def plan_outline(plan: dict, depth: int = 0) -> list:
+    label = plan["Node Type"] + (f" using {plan['Index Name']}" if "Index Name" in plan else "")
+    lines = ["    " * depth + label]
+    for child in plan.get("Plans", []):
+        lines += plan_outline(child, depth + 1)
+    return lines
+
+def run(rooms: int, nights: int, users: int) -> int:
+    failures = 0
+    with engine.connect() as conn:
+        transaction = conn.begin()
+        try:
+            for statement in SEED:
+                conn.execute(text(statement), {
+                    "rooms": rooms,
+                    "nights": nights,
+                    "users": users,
+                    "tz": settings.HOTEL_TIMEZONE,
+                })
+            sample = conn.execute(text("""
+                SELECT b.user_id, b.room_id, b.id AS booking_id, b.created_at,
+                       b.check_in_date AS check_in, b.check_out_date AS check_out
+                FROM bookings b WHERE b.guest_name = 'Explain Guest' AND b.status = 'CONFIRMED'
+                ORDER BY b.id LIMIT 1
+            """)).mappings().one()
+            total = conn.execute(text("SELECT count(*) FROM bookings")).scalar()
+            print(f"Seeded {rooms} rooms x {nights} nights; bookings table has {total} rows\n")
+
+            for name, sql, expected in QUERY_SHAPES:
+                plan = conn.execute(text("EXPLAIN (FORMAT JSON) " + sql), dict(sample)).scalar()
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                root = plan[0]["Plan"]
+                used = index_names(root)
+                ok = bool(used & expected)
+                failures += not ok
+                indexes = ", ".join(sorted(used)) or "no index"
+                print(f"{'ok' if ok else 'FAIL':>4}  {name:<32} {indexes}")
+                if not ok:
+                    print(f"      expected one of: {', '.join(sorted(expected))}")
+                    print("\n".join("      " + line for line in plan_outline(root)))
+        finally:
+            transaction.rollback()
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rooms", type=int, default=200)
+    parser.add_argument("--nights", type=int, default=1000)
+    parser.add_argument("--users", type=int, default=5000)
+    args = parser.parse_args()
+    sys.exit(run(args.rooms, args.nights, args.users))
@@ -0,0 +1,83 @@
+"""
+HTTP load test: requests per second and latency percentiles against a running API.
+
+Runs a fixed number of concurrent clients for a fixed duration over a mix of
+catalog, availability and authenticated booking-list requests. Run it once per
+build to compare, e.g. before and after a change:
+
+    uvicorn app.main:app --workers 1 &
+    python scripts/load_test.py --clients 200 --duration 30 --label async
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+import httpx
+
+def build_requests(token: str):
+    check_in = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    check_in += timedelta(days=45)
+    check_out = check_in + timedelta(days=2)
+    auth = {"Authorization": f"Bearer {token}"}
+    return [
+        ("GET", "/rooms/types", None, None),
+        ("GET", "/rooms", None, None),
+        ("GET", "/rooms", {"available": "true", "check_in": check_in.isoformat(),
+                           "check_out": check_out.isoformat()}, None),
+        ("GET", "/services", None, None),
+        ("GET", "/bookings", None, auth),
+    ]
+
+async def client_loop(client: httpx.AsyncClient, requests, deadline: float, latencies, errors):
+    while time.perf_counter() < deadline:
+        method, path, params, headers = random.choice(requests)
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, path, params=params, headers=headers)
+            if response.status_code >= 400:
+                errors.append(response.status_code)
+        except httpx.HTTPError as exc:
+            errors.append(type(exc).__name__)
+        latencies.append(time.perf_counter() - started)
+
+async def run(base_url: str, clients: int, duration: float, email: str, password: str, label: str):
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        response = await client.post("/auth/login", data={"username": email, "password": password})
+        response.raise_for_status()
+        requests = build_requests(response.json()["access_token"])
+
+        latencies, errors = [], []
+        deadline = time.perf_counter() + duration
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            client_loop(client, requests, deadline, latencies, errors) for _ in range(clients)
+        ))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+
+    def percentile(fraction: float) -> float:
+        return latencies[min(len(latencies) - 1, int(len(latencies) * fraction))] * 1000
+
+    print(
+        f"{label or base_url}: clients={clients} requests={len(latencies)} errors={len(errors)} "
+        f"rps={len(latencies) / elapsed:.1f} p50={statistics.median(latencies) * 1000:.1f}ms "
+        f"p99={percentile(0.99):.1f}ms max={latencies[-1] * 1000:.1f}ms"
+    )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000/api/v1")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds")
+    parser.add_argument("--email", default="admin@shivashrayhotel.com")
+    parser.add_argument("--password", default="admin123")
+    parser.add_argument("--label", default="")
+    args = parser.parse_args()
+    asyncio.run(run(
+        args.base_url, args.clients, args.duration, args.email, args.password, args.label
+    ))
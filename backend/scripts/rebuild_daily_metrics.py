@@ -0,0 +1,49 @@
+"""
+Rebuild or verify the daily_metrics reporting rollup from Booking rows.
+
+    python scripts/rebuild_daily_metrics.py                  # rebuild every booked day
+    python scripts/rebuild_daily_metrics.py --start 2026-01-01 --end 2026-04-01
+    python scripts/rebuild_daily_metrics.py --check          # report mismatches only
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import argparse
+from datetime import date
+from sqlalchemy.orm import Session
+from app.core.database import SessionLocal
+from app.services.metrics import rebuild_daily_metrics, check_daily_metrics
+
+def report(problems) -> int:
+    for problem in problems:
+        differences = ", ".join(
+            f"{column} {problem['actual'][column]} != {value}"
+            for column, value in problem["expected"].items()
+            if problem["actual"][column] != value
+        )
+        print(f"day={problem['day']}  room_type={problem['room_type_id']}  {differences}")
+    print(f"{len(problems)} mismatching rollup rows")
+    return 1 if problems else 0
+
+def main(start, end, check_only: bool) -> int:
+    db: Session = SessionLocal()
+    try:
+        if not check_only:
+            written = rebuild_daily_metrics(db, start, end)
+            db.commit()
+            print(f"Wrote {written} rollup rows")
+        return report(check_daily_metrics(db, start, end))
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--start", type=date.fromisoformat, help="first day (inclusive)")
+    parser.add_argument("--end", type=date.fromisoformat, help="last day (exclusive)")
+    parser.add_argument("--check", action="store_true", help="only run the consistency check")
+    args = parser.parse_args()
+    sys.exit(main(args.start, args.end, args.check))
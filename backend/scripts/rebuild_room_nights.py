@@ -0,0 +1,47 @@
+"""
+Rebuild or verify the room_nights inventory ledger from Booking rows.
+
+    python scripts/rebuild_room_nights.py                  # rebuild every night
+    python scripts/rebuild_room_nights.py --start 2026-01-01 --end 2026-04-01
+    python scripts/rebuild_room_nights.py --check          # report mismatches only
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import argparse
+from datetime import date
+from sqlalchemy.orm import Session
+from app.core.database import SessionLocal
+from app.services.inventory import rebuild_room_nights, check_room_nights
+
+def report(problems) -> int:
+    for problem in problems:
+        print(
+            f"{problem['problem']:>8}  room={problem['room_id']}  "
+            f"night={problem['night']}  booking={problem['booking_id']}"
+        )
+    print(f"{len(problems)} mismatching room-nights")
+    return 1 if problems else 0
+
+def main(start, end, check_only: bool) -> int:
+    db: Session = SessionLocal()
+    try:
+        if not check_only:
+            written = rebuild_room_nights(db, start, end)
+            db.commit()
+            print(f"Wrote {written} room-nights")
+        return report(check_room_nights(db, start, end))
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--start", type=date.fromisoformat, help="first night (inclusive)")
+    parser.add_argument("--end", type=date.fromisoformat, help="last night (exclusive)")
+    parser.add_argument("--check", action="store_true", help="only run the consistency check")
+    args = parser.parse_args()
+    sys.exit(main(args.start, args.end, args.check))
@@ -0,0 +1,77 @@
+"""
+Reshuffle future type bookings across the rooms of their room type to leave fewer unsellable gaps.
+
+Only bookings made by room type (room_pinned false) that are pending or
+confirmed and have not started yet move; everything else stays put. A room
+type is only changed when the new assignment leaves fewer short gaps.
+
+    python scripts/reoptimize_room_assignments.py                 # every room type
+    python scripts/reoptimize_room_assignments.py --room-type 2 --dry-run
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import argparse
+from datetime import datetime
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+from app.core.database import SessionLocal
+from app.models.room import RoomType
+from app.services.assignment import reoptimize_room_type
+from app.services.availability import HOTEL_TZ, is_overbooking
+
+def main(room_type_id, dry_run: bool) -> int:
+    db: Session = SessionLocal()
+    today = datetime.now(HOTEL_TZ).date()
+    try:
+        query = select(RoomType.id, RoomType.name).order_by(RoomType.id)
+        if room_type_id is not None:
+            query = query.where(RoomType.id == room_type_id)
+        for type_id, name in db.execute(query).all():
+            try:
+                plan = reoptimize_room_type(db, type_id, today, apply=not dry_run)
+                # One transaction per room type keeps its locks short
+                if dry_run:
+                    db.rollback()
+                else:
+                    db.commit()
+            except StaleDataError:
+                # A booking was edited (e.g. cancelled at the front desk) after the plan read it
+                db.rollback()
+                print(f"room_type={type_id} ({name}): a booking changed during the run, "
+                      "left as is; run again")
+                continue
+            except IntegrityError as exc:
+                # bookings_no_overlap is checked at commit; only writers that skip the room
+                # locks (e.g. an admin reactivating a booking) can collide with the moves
+                db.rollback()
+                if not is_overbooking(exc):
+                    raise
+                print(f"room_type={type_id} ({name}): a room was taken during the run, "
+                      "left as is; run again")
+                continue
+            if plan is None:
+                print(f"room_type={type_id} ({name}): movable stays no longer fit, left as is")
+            else:
+                print(
+                    f"room_type={type_id} ({name}): {len(plan.moves)} moves, "
+                    f"short gaps {plan.short_gaps_before} -> {plan.short_gaps_after}"
+                )
+        return 0
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--room-type", type=int, help="only this room type id")
+    parser.add_argument(
+        "--dry-run", action="store_true", help="report the plan without moving bookings"
+    )
+    args = parser.parse_args()
+    sys.exit(main(args.room_type, args.dry_run))
@@ -10,6 +10,7 @@ from app.core.database import SessionLocal, engine
 from app.models import User, Room, RoomType, RoomAmenity, Service
 from app.core.security import get_password_hash
 from app.models.user import UserRole
+from app.services.catalog import catalog_version_bump
 
 def seed_data():
     db: Session = SessionLocal()
@@ -152,6 +153,8 @@ def seed_data():
                 db.add(service)
         print("Created services")
         
+        # Running API workers pick the new catalog up on their next version check
+        db.execute(catalog_version_bump())
         db.commit()
         print("\nSeed data created successfully!")
         
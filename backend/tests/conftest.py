@@ -0,0 +1,88 @@
+"""
+Shared fixtures.
+
+Tests marked ``db`` run against the database in DATABASE_URL (or .env) and write to it, so
+they only run with ``--db``; point it at a migrated, seeded development database:
+
+    pytest --db
+"""
+import os
+
+import pytest
+
+def pytest_addoption(parser):
+    parser.addoption("--db", action="store_true", help="run tests marked db against DATABASE_URL")
+
+def pytest_configure(config):
+    if not config.getoption("--db"):
+        # Settings are read on import; unit tests never connect, so any URL will do
+        os.environ.setdefault("DATABASE_URL", "postgresql://localhost/unused")
+        os.environ.setdefault("SECRET_KEY", "unit-tests-only")
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--db"):
+        return
+    skip = pytest.mark.skip(reason="needs --db")
+    for item in items:
+        if "db" in item.keywords:
+            item.add_marker(skip)
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+@pytest.fixture
+async def db_engine():
+    """The API's async engine, disposed afterwards so no connection outlives the test's loop."""
+    from app.core.database import async_engine
+
+    yield async_engine
+    await async_engine.dispose()
+
+@pytest.fixture
+async def admin_token(db_engine):
+    from sqlalchemy import select
+    from app.core.database import AsyncSessionLocal
+    from app.core.security import create_access_token
+    from app.models.user import User, UserRole
+
+    async with AsyncSessionLocal() as db:
+        admin = await db.scalar(select(User).where(User.role == UserRole.ADMIN))
+    if not admin:
+        pytest.skip("needs an admin user; run scripts/seed_data.py first")
+    return create_access_token(data={"sub": admin.email, "role": admin.role.value})
+
+@pytest.fixture
+async def room_id(db_engine):
+    """The first active room."""
+    from sqlalchemy import select
+    from app.core.database import AsyncSessionLocal
+    from app.models.room import Room
+
+    async with AsyncSessionLocal() as db:
+        room_id = await db.scalar(
+            select(Room.id).where(Room.is_active == True).order_by(Room.id)
+        )
+    if not room_id:
+        pytest.skip("needs at least one room; run scripts/seed_data.py first")
+    return room_id
+
+@pytest.fixture
+async def client(db_engine):
+    """An HTTP client calling the app in-process, with the catalog loaded."""
+    import httpx
+    from app.main import app
+    from app.services.catalog import refresh_catalog
+
+    await refresh_catalog()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test/api/v1") as client:
+        yield client
+
+@pytest.fixture
+def statements(client, admin_token):
+    """SQL statements the API runs from here to the end of the test (setup is not counted)."""
+    from app.core.database import count_statements
+
+    with count_statements() as executed:
+        yield executed
@@ -0,0 +1,30 @@
+import enum
+from datetime import datetime, timezone
+
+import pytest
+
+from app.services.exports import _csv_value
+
+class Colour(enum.Enum):
+    RED = "red"
+
+@pytest.mark.parametrize(
+    "value", ["=HYPERLINK(\"http://x\")", "+1+2", "-1+2", "@SUM(A1)", "\tname", "\rname"]
+)
+def test_formula_like_text_is_quoted(value):
+    assert _csv_value(value) == "'" + value
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        ("Asha Rao", "Asha Rao"),
+        ("a=b", "a=b"),
+        ("", ""),
+        (None, ""),
+        (-12.5, -12.5),
+        (Colour.RED, "red"),
+        (datetime(2026, 1, 2, tzinfo=timezone.utc), "2026-01-02T00:00:00+00:00"),
+    ],
+)
+def test_other_values_are_written_as_is(value, expected):
+    assert _csv_value(value) == expected
@@ -0,0 +1,130 @@
+"""
+No room is double booked under concurrency.
+
+Many simultaneous create_booking calls ask for the same room on overlapping dates; exactly one
+may succeed and the rest must be rejected with 409. In the holds variant every other call is a
+second guest placing a checkout hold on the room instead, and exactly one booking or hold may
+end up on it (a guest's repeated holds replace each other, so several hold calls may succeed).
+"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import delete, func, select
+
+from app.api.v1.bookings import create_booking
+from app.api.v1.holds import create_hold
+from app.core.database import AsyncSessionLocal
+from app.models import Booking, BookingHold, User
+from app.schemas.booking import BookingCreate
+from app.schemas.hold import HoldCreate
+from app.services.availability import holds_overlapping
+from app.services.catalog import get_catalog
+from app.services.dynamic_pricing import get_price_grid
+from app.services.metrics import register_booking_listeners
+
+pytestmark = [pytest.mark.db, pytest.mark.anyio]
+
+WORKERS = 40
+ROUNDS = 3
+STRESS_EMAIL = "stress-overbooking@example.com"
+STRESS_HOLD_EMAIL = "stress-holds@example.com"
+
+async def get_stress_user(email: str) -> User:
+    async with AsyncSessionLocal() as db:
+        user = await db.scalar(select(User).where(User.email == email))
+        if not user:
+            user = User(email=email, hashed_password="x", full_name="Stress Test")
+            db.add(user)
+            await db.commit()
+    return user
+
+@pytest.fixture
+async def stress_users(db_engine):
+    """A booking guest and a holding guest; what they leave behind is deleted afterwards."""
+    # The endpoints are called without the app, so register what app.main would
+    register_booking_listeners()
+    user = await get_stress_user(STRESS_EMAIL)
+    hold_user = await get_stress_user(STRESS_HOLD_EMAIL)
+    yield user, hold_user
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(Booking).where(Booking.user_id == user.id))
+        await db.execute(delete(BookingHold).where(BookingHold.user_id == hold_user.id))
+        await db.commit()
+
+async def attempt(user: User, booking_data: BookingCreate) -> int:
+    # Each request gets its own session and connection, as it would in the API
+    grid = await get_price_grid(await get_catalog())
+    async with AsyncSessionLocal() as db:
+        try:
+            await create_booking(
+                booking_data, db=db, current_user=user, grid=grid, idempotency_key=None
+            )
+            return 201
+        except HTTPException as exc:
+            return exc.status_code
+
+async def attempt_hold(user: User, hold_data: HoldCreate) -> int:
+    async with AsyncSessionLocal() as db:
+        try:
+            await create_hold(hold_data, db=db, current_user=user)
+            return 201
+        except HTTPException as exc:
+            return exc.status_code
+
+async def count_holders(user: User, hold_user: User, start: datetime, end: datetime) -> int:
+    """Bookings and live holds left on the room between start and end."""
+    async with AsyncSessionLocal() as db:
+        booked = await db.scalar(
+            select(func.count()).select_from(Booking).where(
+                Booking.user_id == user.id,
+                Booking.check_in_date < end,
+                Booking.check_out_date > start,
+            )
+        )
+        held = await db.scalar(
+            select(func.count()).select_from(BookingHold).where(
+                BookingHold.user_id == hold_user.id, holds_overlapping(start, end)
+            )
+        )
+    return booked + held
+
+@pytest.mark.parametrize("holds", [False, True], ids=["bookings", "bookings-and-holds"])
+async def test_no_double_booking_under_concurrency(room_id, stress_users, holds):
+    user, hold_user = stress_users
+    start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    start += timedelta(days=3000)
+    for round_number in range(ROUNDS):
+        check_in = start + timedelta(days=round_number * 10)
+        # Every worker asks for a slightly different, but overlapping, stay
+        stays = [
+            (check_in + timedelta(days=i % 2), check_in + timedelta(days=i % 2 + 2))
+            for i in range(WORKERS)
+        ]
+        attempts = [
+            attempt_hold(
+                hold_user,
+                HoldCreate(room_id=room_id, check_in_date=check_in_date, check_out_date=check_out),
+            )
+            if holds and i % 2
+            else attempt(
+                user,
+                BookingCreate(
+                    room_id=room_id,
+                    check_in_date=check_in_date,
+                    check_out_date=check_out,
+                    number_of_guests=2,
+                    guest_name="Stress Test",
+                    guest_email=STRESS_EMAIL,
+                ),
+            )
+            for i, (check_in_date, check_out) in enumerate(stays)
+        ]
+        results = await asyncio.gather(*attempts)
+
+        assert set(results) <= {201, 409}, f"round {round_number + 1}: {sorted(results)}"
+        holders = await count_holders(user, hold_user, check_in, check_in + timedelta(days=3))
+        assert holders == 1, f"round {round_number + 1}: {holders} stays on the room"
+        if not holds:
+            assert results.count(201) == 1
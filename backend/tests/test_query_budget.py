@@ -0,0 +1,44 @@
+"""
+List endpoints must not issue more SQL statements than their budget.
+
+Budgets are fixed, so a lazy load per row (an N+1) fails as soon as more than one row is
+returned. Catalog reads are served from the in-memory snapshot; availability adds one ledger
+lookup.
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytestmark = [pytest.mark.db, pytest.mark.anyio]
+
+CHECK_IN = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+CHECK_IN += timedelta(days=30)
+DATES = {"check_in": CHECK_IN.isoformat(), "check_out": (CHECK_IN + timedelta(days=2)).isoformat()}
+
+# (path, query params, needs admin token, max statements)
+BUDGETS = [
+    ("/rooms/types", None, False, 0),
+    ("/rooms", None, False, 0),
+    ("/rooms", {"available": "true", **DATES}, False, 1),
+    ("/rooms", {"available": "false", **DATES}, False, 1),
+    ("/rooms/{room_id}", None, False, 0),
+    ("/services", None, False, 0),
+    ("/bookings", None, True, 2),
+    ("/admin/rooms", None, True, 2),
+    ("/admin/bookings", None, True, 2),
+]
+
+@pytest.mark.parametrize(
+    "path,params,needs_auth,budget",
+    BUDGETS,
+    ids=[f"{path}{'?' + params['available'] if params else ''}" for path, params, _, _ in BUDGETS],
+)
+async def test_statement_budget(
+    room_id, admin_token, client, statements, path, params, needs_auth, budget
+):
+    headers = {"Authorization": f"Bearer {admin_token}"} if needs_auth else None
+    response = await client.get(path.format(room_id=room_id), params=params, headers=headers)
+
+    assert response.status_code == 200, response.text
+    executed = "\n".join(" ".join(statement.split())[:160] for statement in statements)
+    assert len(statements) <= budget, executed
@@ -3,7 +3,7 @@
 import { useEffect, useState } from 'react';
 import { useRouter } from 'next/navigation';
 import api from '@/lib/api';
-import { Booking } from '@/types';
+import { Booking, DashboardStats } from '@/types';
 import { useAuthStore } from '@/lib/store';
 import Link from 'next/link';
 
@@ -12,6 +12,8 @@ export default function AdminDashboard() {
   const { user, isAuthenticated } = useAuthStore();
   const [bookings, setBookings] = useState<Booking[]>([]);
   const [loading, setLoading] = useState(true);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [mounted, setMounted] = useState(false);
   const [stats, setStats] = useState({
     total: 0,
@@ -31,18 +33,22 @@ export default function AdminDashboard() {
 
   const fetchBookings = async () => {
     try {
-      const response = await api.get('/admin/bookings');
+      const [response, statsResponse] = await Promise.all([
+        api.get<Booking[]>('/admin/bookings'),
+        api.get<DashboardStats>('/admin/stats'),
+      ]);
       setBookings(response.data);
+      setNextCursor(response.headers['x-next-cursor'] ?? null);
       
-      // Calculate stats
-      const total = response.data.length;
-      const confirmed = response.data.filter((b: Booking) => b.status === 'confirmed').length;
-      const pending = response.data.filter((b: Booking) => b.status === 'pending').length;
-      const revenue = response.data
-        .filter((b: Booking) => b.payment_status === 'paid')
-        .reduce((sum: number, b: Booking) => sum + b.total_amount, 0);
-      
-      setStats({ total, confirmed, pending, revenue });
+      // Stats are aggregated server-side (last 30 days by default)
+      const { bookings_by_status, revenue_by_payment_status } = statsResponse.data;
+      const total = Object.values(bookings_by_status).reduce((sum, count) => sum + count, 0);
+      setStats({
+        total,
+        confirmed: bookings_by_status.confirmed,
+        pending: bookings_by_status.pending,
+        revenue: revenue_by_payment_status.paid,
+      });
     } catch (error) {
       console.error('Error fetching bookings:', error);
     } finally {
@@ -50,6 +56,21 @@ export default function AdminDashboard() {
     }
   };
 
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const response = await api.get<Booking[]>('/admin/bookings', { params: { cursor: nextCursor } });
+      setBookings((prev) => [...prev, ...response.data]);
+      // The API pages by creation time; the header is absent on the last page
+      setNextCursor(response.headers['x-next-cursor'] ?? null);
+    } catch (error) {
+      console.error('Error fetching bookings:', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const getStatusColor = (status: string) => {
     switch (status) {
       case 'confirmed':
@@ -197,7 +218,7 @@ export default function AdminDashboard() {
                 </div>
               ) : (
                 <div className="space-y-3">
-                  {bookings.slice(0, 10).map((booking, index) => (
+                  {bookings.map((booking, index) => (
                     <Link
                       key={booking.id}
                       href={`/admin/bookings/${booking.id}`}
@@ -268,6 +289,17 @@ export default function AdminDashboard() {
                       </div>
                     </Link>
                   ))}
+                  {nextCursor && (
+                    <div className="flex justify-center pt-3">
+                      <button
+                        onClick={loadMore}
+                        disabled={loadingMore}
+                        className="px-6 py-3 bg-white/50 backdrop-blur-sm text-gray-900 text-[15px] font-medium rounded-2xl border border-gray-100/60 hover:border-gray-200/80 hover:bg-white/70 active:scale-[0.98] transition-all duration-300 ease-out disabled:opacity-50"
+                      >
+                        {loadingMore ? 'Loading...' : 'Load more'}
+                      </button>
+                    </div>
+                  )}
                 </div>
               )}
             </div>
@@ -27,7 +27,7 @@ export default function AdminRoomsPage() {
 
   const fetchRooms = async () => {
     try {
-      const response = await api.get('/rooms');
+      const response = await api.get('/admin/rooms');
       setRooms(response.data);
     } catch (error) {
       console.error('Error fetching rooms:', error);
@@ -13,6 +13,8 @@ export default function BookingsPage() {
   const router = useRouter();
   const [bookings, setBookings] = useState<Booking[]>([]);
   const [loading, setLoading] = useState(true);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [mounted, setMounted] = useState(false);
   const [visibleBookings, setVisibleBookings] = useState<Set<number>>(new Set());
   const bookingRefs = useRef<(HTMLDivElement | null)[]>([]);
@@ -50,10 +52,12 @@ export default function BookingsPage() {
     };
   }, [bookings]);
 
-  const fetchBookings = async () => {
+  const fetchBookings = async (cursor?: string) => {
     try {
-      const response = await api.get('/bookings');
-      setBookings(response.data);
+      const response = await api.get<Booking[]>('/bookings', { params: cursor ? { cursor } : undefined });
+      setBookings((prev) => (cursor ? [...prev, ...response.data] : response.data));
+      // The API pages by creation time; the header is absent on the last page
+      setNextCursor(response.headers['x-next-cursor'] ?? null);
     } catch (error) {
       console.error('Error fetching bookings:', error);
     } finally {
@@ -61,6 +65,13 @@ export default function BookingsPage() {
     }
   };
 
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    await fetchBookings(nextCursor);
+    setLoadingMore(false);
+  };
+
   const handleCancel = async (bookingId: number) => {
     if (!confirm('Are you sure you want to cancel this booking?')) {
       return;
@@ -227,6 +238,17 @@ export default function BookingsPage() {
                   </Link>
                 );
               })}
+              {nextCursor && (
+                <div className="flex justify-center pt-4">
+                  <button
+                    onClick={loadMore}
+                    disabled={loadingMore}
+                    className="px-6 py-3 bg-white/70 backdrop-blur-sm text-gray-900 text-[15px] font-medium rounded-2xl border border-gray-100/60 hover:border-gray-200/80 hover:bg-white/90 active:scale-[0.98] transition-all duration-300 ease-out disabled:opacity-50"
+                  >
+                    {loadingMore ? 'Loading...' : 'Load more'}
+                  </button>
+                </div>
+              )}
             </div>
           )}
         </div>
@@ -267,7 +267,28 @@ const handleMockRequest = (method: string, url: string, data?: any, params?: any
         response = booking;
       }
       // Admin endpoints
-      else if (url.includes('/admin/bookings')) {
+      else if (url.includes('/admin/stats')) {
+        const countStatus = (status: Booking['status']) =>
+          mockBookings.filter((b) => b.status === status).length;
+        const revenueFor = (paymentStatus: Booking['payment_status']) =>
+          mockBookings
+            .filter((b) => b.payment_status === paymentStatus)
+            .reduce((sum, b) => sum + b.total_amount, 0);
+        response = {
+          bookings_by_status: {
+            pending: countStatus('pending'),
+            confirmed: countStatus('confirmed'),
+            checked_in: countStatus('checked_in'),
+            checked_out: countStatus('checked_out'),
+            cancelled: countStatus('cancelled'),
+          },
+          revenue_by_payment_status: {
+            pending: revenueFor('pending'),
+            paid: revenueFor('paid'),
+            refunded: revenueFor('refunded'),
+          },
+        };
+      } else if (url.includes('/admin/bookings')) {
         response = mockBookings;
       }
       // Default
@@ -310,6 +331,11 @@ api.interceptors.request.use(async (config) => {
       config.headers.Authorization = `Bearer ${token}`;
     }
   }
+
+  // One key per booking attempt; retries of this request config resend it and get the first response
+  if (config.method === 'post' && config.url === '/bookings' && !config.headers['Idempotency-Key']) {
+    config.headers['Idempotency-Key'] = crypto.randomUUID();
+  }
   return config;
 });
 
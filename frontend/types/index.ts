@@ -42,6 +42,7 @@ export interface Booking {
   id: number;
   user_id?: number;
   room_id: number;
+  room_pinned?: boolean;
   check_in_date: string;
   check_out_date: string;
   number_of_guests: number;
@@ -56,6 +57,94 @@ export interface Booking {
   special_requests?: string;
   created_at: string;
   updated_at?: string;
+  version?: number;
+}
+
+export interface BookingHold {
+  id: number;
+  room_id: number;
+  room_pinned: boolean;
+  check_in_date: string;
+  check_out_date: string;
+  expires_at: string;
+}
+
+export interface BulkBookingResult {
+  index: number;
+  status_code: number;
+  detail?: string;
+  booking?: Booking;
+}
+
+export interface BulkBookingResponse {
+  created: number;
+  results: BulkBookingResult[];
+}
+
+export interface RoomTypeStats {
+  room_type_id: number;
+  name: string;
+  room_nights_available: number;
+  room_nights_sold: number;
+  room_nights_cancelled: number;
+  room_revenue: number;
+  occupancy_rate: number;
+}
+
+export interface DashboardStats {
+  date_from: string;
+  date_to: string;
+  room_nights_available: number;
+  room_nights_sold: number;
+  room_nights_cancelled: number;
+  occupancy_rate: number;
+  adr: number;
+  revpar: number;
+  room_revenue: number;
+  revenue_by_payment_status: Record<Booking['payment_status'], number>;
+  bookings_by_status: Record<Booking['status'], number>;
+  arrivals_today: number;
+  departures_today: number;
+  by_room_type: RoomTypeStats[];
+}
+
+export interface RoomTypeQuote {
+  room_type_id: number;
+  name: string;
+  max_occupancy: number;
+  base_amount: number;
+  extra_amount: number;
+  total_amount: number;
+  available_rooms: number;
+  available_room_ids: number[];
+}
+
+export interface StayQuote {
+  check_in_date: string;
+  check_out_date: string;
+  nights: number;
+  number_of_adults: number;
+  number_of_children: number;
+  quotes: RoomTypeQuote[];
+}
+
+export interface StayWindowQuote {
+  check_in_date: string;
+  check_out_date: string;
+  room_type_id: number;
+  name: string;
+  base_amount: number;
+  extra_amount: number;
+  total_amount: number;
+  available_rooms: number;
+  available_room_ids: number[];
+}
+
+export interface FlexibleQuote {
+  nights: number;
+  number_of_adults: number;
+  number_of_children: number;
+  windows: StayWindowQuote[];
 }
 
 export interface Service {